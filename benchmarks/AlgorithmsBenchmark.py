@@ -0,0 +1,94 @@
+"""Compare the array-based graph algorithms with loops over an adjacency list.
+
+Run from the repository root: python3 benchmarks/AlgorithmsBenchmark.py [vertices] [edges]"""
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+
+import GraphAlgorithms
+from CSRAdjacency import CSRAdjacency
+from GraphRepresentation import GraphRepresentation
+from RandomGraphGenerator import random_graph_edges
+
+
+def loop_degrees(adjacency_list) -> list:
+    return sorted((len(neighbors) for neighbors in adjacency_list), reverse=True)
+
+
+def loop_bfs(adjacency_list, source) -> list:
+    distances = [-1] * len(adjacency_list)
+    distances[source] = 0
+    queue = deque([source])
+    while queue:
+        vertex = queue.popleft()
+        for neighbor in adjacency_list[vertex]:
+            if distances[neighbor - 1] == -1:
+                distances[neighbor - 1] = distances[vertex] + 1
+                queue.append(neighbor - 1)
+    return distances
+
+
+def loop_components(adjacency_list) -> list:
+    components = [-1] * len(adjacency_list)
+    component = 0
+    for start in range(len(adjacency_list)):
+        if components[start] != -1:
+            continue
+        components[start] = component
+        stack = [start]
+        while stack:
+            vertex = stack.pop()
+            for neighbor in adjacency_list[vertex]:
+                if components[neighbor - 1] == -1:
+                    components[neighbor - 1] = component
+                    stack.append(neighbor - 1)
+        component += 1
+    return components
+
+
+def loop_largest_component(adjacency_list) -> list:
+    components = loop_components(adjacency_list)
+    sizes = [0] * (max(components) + 1)
+    for component in components:
+        sizes[component] += 1
+    largest = sizes.index(max(sizes))
+    return [vertex for vertex, component in enumerate(components) if component == largest]
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(vertices, edges) -> None:
+    edge_list, _ = random_graph_edges(vertices, edges, GraphRepresentation.EDGE_LIST, seed=1)
+    csr = CSRAdjacency.from_edges(vertices, edge_list[:, 0] - 1, edge_list[:, 1] - 1)
+    adjacency_list = csr.to_adjacency_list()
+    print("{} vertices, {} edges".format(vertices, csr.edges_number))
+    print("{:<20}{:>12}{:>12}{:>10}".format("algorithm", "loops [s]", "arrays [s]", "speedup"))
+    cases = [
+        ("degree sequence", loop_degrees, (adjacency_list,), GraphAlgorithms.degree_sequence, (csr,)),
+        ("bfs distances", loop_bfs, (adjacency_list, 0), GraphAlgorithms.bfs_distances, (csr, 0)),
+        ("components", loop_components, (adjacency_list,), GraphAlgorithms.connected_components, (csr,)),
+        ("largest component", loop_largest_component, (adjacency_list,), GraphAlgorithms.largest_component, (csr,)),
+    ]
+    for name, loop_function, loop_args, array_function, array_args in cases:
+        expected, loop_seconds = measure(loop_function, *loop_args)
+        result, array_seconds = measure(array_function, *array_args)
+        if not np.array_equal(expected, result):
+            raise AssertionError(name + " results differ")
+        print("{:<20}{:>12.3f}{:>12.3f}{:>9.1f}x".format(name, loop_seconds, array_seconds,
+                                                        loop_seconds / array_seconds))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        main(int(sys.argv[1]), int(sys.argv[2]))
+    else:
+        main(200000, 1000000)
@@ -0,0 +1,270 @@
+"""Time and memory benchmarks of reading, converting, generating, analysing, writing and drawing graphs.
+
+Seeded random graphs are generated for every combination of numbers of vertices and mean degrees. Every stage is
+timed (best of the repeats) and run once more for its peak memory. Results are written as JSON
+and can be compared with a baseline run, the exit code is 1 if any stage got slower or bigger than the tolerance.
+
+Run from anywhere:
+    python3 benchmarks/BenchmarkSuite.py --output results.json
+    python3 benchmarks/BenchmarkSuite.py --baseline results.json --tolerance 0.25"""
+import argparse
+import ctypes
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np
+
+import GraphAlgorithms
+from Graph import Graph
+from GraphConverter import convert_from_csr
+from GraphConverter import convert_graph
+from GraphReader import GraphReader
+from GraphRepresentation import GraphRepresentation
+from RandomGraphGenerator import random_graph_edges
+from RandomGraphGenerator import random_graph_probability
+
+STAGES = ("generator", "converter", "reader", "writer", "algorithms", "renderer")
+DEFAULT_VERTICES = (100, 1000, 10000)
+DEFAULT_DEGREES = (4, 32)
+# cases building dense matrices with more cells are skipped
+DENSE_CELLS_LIMIT = 1 << 25
+# graphs with more vertices are not drawn
+RENDER_VERTICES_LIMIT = 2000
+# differences smaller than these are noise and never regressions
+MIN_SECONDS_DIFFERENCE = 0.002
+MIN_BYTES_DIFFERENCE = 1 << 20
+# work files are written in the data folder, because Graph and GraphReader read and write there
+WORK_FOLDER = ".benchmark_{}".format(os.getpid())
+
+
+def fits(vertices, edges, *representations) -> bool:
+    """Check if dense forms of the representations are small enough to benchmark"""
+    cells = {GraphRepresentation.ADJACENCY_MATRIX: vertices * vertices,
+             GraphRepresentation.INCIDENCE_MATRIX: vertices * edges}
+    return all(cells.get(representation, 0) <= DENSE_CELLS_LIMIT for representation in representations)
+
+
+# every stage yields (case name, function to measure, False if the case is too big to run)
+def generator_cases(vertices, edges, seed):
+    probability = 2 * edges / max(vertices * (vertices - 1), 1)
+    yield "edges incidence matrix", lambda: random_graph_edges(vertices, edges, seed=seed), \
+        fits(vertices, edges, GraphRepresentation.INCIDENCE_MATRIX)
+    yield "edges edge list", lambda: random_graph_edges(vertices, edges, GraphRepresentation.EDGE_LIST, seed), True
+    yield "edges sparse", lambda: random_graph_edges(vertices, edges, seed=seed, sparse=True), True
+    yield "probability dense", lambda: random_graph_probability(vertices, probability, "dense", seed), \
+        fits(vertices, edges, GraphRepresentation.ADJACENCY_MATRIX)
+    yield "probability geometric", lambda: random_graph_probability(vertices, probability, "geometric", seed), True
+    yield "probability dense parallel", lambda: random_graph_probability(vertices, probability, "dense", seed, None), \
+        fits(vertices, edges, GraphRepresentation.ADJACENCY_MATRIX)
+    yield "edges sparse parallel", lambda: random_graph_edges(vertices, edges, seed=seed, sparse=True, workers=None), \
+        True
+
+
+def converter_cases(csr):
+    vertices, edges = csr.vertices_number, csr.edges_number
+    for input_representation in GraphRepresentation:
+        graph = None
+        if fits(vertices, edges, input_representation):
+            graph = convert_from_csr(csr, input_representation)
+        for output_representation in GraphRepresentation:
+            if input_representation == output_representation:
+                continue
+            yield "{} to {}".format(input_representation.name.lower(), output_representation.name.lower()), \
+                lambda graph=graph, i=input_representation, o=output_representation: convert_graph(graph, i, o), \
+                fits(vertices, edges, input_representation, output_representation)
+
+
+def reader_cases(graph):
+    vertices, edges = graph.csr.vertices_number, graph.csr.edges_number
+    for representation in GraphRepresentation:
+        filename = "{}/read_{}.txt".format(WORK_FOLDER, representation.value)
+        runnable = fits(vertices, edges, representation)
+        if runnable:
+            graph.save_to_file(representation, filename)
+        yield representation.name.lower(), lambda r=representation, f=filename: GraphReader().read_csr(r, f), runnable
+    filename = WORK_FOLDER + "/read_binary.bin"
+    graph.save_to_file(GraphRepresentation.ADJACENCY_LIST, filename, binary=True)
+    yield "binary", lambda: GraphReader().read_csr(GraphRepresentation.ADJACENCY_LIST, filename).indices.sum(), True
+
+
+def writer_cases(graph):
+    vertices, edges = graph.csr.vertices_number, graph.csr.edges_number
+    for representation in GraphRepresentation:
+        filename = "{}/write_{}.txt".format(WORK_FOLDER, representation.value)
+        yield representation.name.lower(), lambda r=representation, f=filename: write_uncached(graph, r, f), \
+            fits(vertices, edges, representation)
+    yield "binary", lambda: graph.save_to_file(GraphRepresentation.ADJACENCY_LIST, WORK_FOLDER + "/write.bin",
+                                               binary=True), True
+    yield "gzip", lambda: graph.save_to_file(GraphRepresentation.ADJACENCY_LIST, WORK_FOLDER + "/write.txt.gz"), True
+
+
+def write_uncached(graph, representation, filename) -> None:
+    """Write the graph converting it again, as for the first write after reading"""
+    graph.cache.clear()
+    graph.save_to_file(representation, filename)
+
+
+def algorithms_cases(csr):
+    yield "degree sequence", lambda: GraphAlgorithms.degree_sequence(csr), True
+    yield "bfs distances", lambda: GraphAlgorithms.bfs_distances(csr, 0), True
+    yield "connected components", lambda: GraphAlgorithms.connected_components(csr), True
+    yield "largest component", lambda: GraphAlgorithms.largest_component(csr), True
+
+
+def renderer_cases(graph):
+    yield "circle", lambda: graph.visualise_graph_on_circle(True, WORK_FOLDER + "/circle"), \
+        graph.csr.vertices_number <= RENDER_VERTICES_LIMIT
+    yield "density", lambda: graph.render_density(WORK_FOLDER + "/density.png"), True
+
+
+def memory_status() -> dict:
+    """Return the resident memory (VmRSS) and its peak (VmHWM) of the process in bytes, Linux only"""
+    status = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in ("VmRSS", "VmHWM"):
+                status[name] = int(value.split()[0]) * 1024
+    return status
+
+
+def peak_memory(function) -> int:
+    """Run the function and return how much memory it took at its peak in bytes.
+    On Linux the peak resident memory of the process is reset before the run; elsewhere allocations are traced
+    with tracemalloc, which slows down code making many Python objects, like np.savetxt, a hundred times"""
+    try:
+        # return memory freed by earlier cases to the system, or it is reused without growing the resident memory
+        gc.collect()
+        ctypes.CDLL(None).malloc_trim(0)
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        before = memory_status()["VmRSS"]
+    except (OSError, KeyError, AttributeError):
+        tracemalloc.start()
+        try:
+            function()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    function()
+    return max(0, memory_status()["VmHWM"] - before)
+
+
+def measure(function, repeats) -> (float, int):
+    """Return the best time of the repeats in seconds and the peak memory of one more run in bytes"""
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds), peak_memory(function)
+
+
+def run_suite(vertices_grid, degrees_grid, seed, repeats, stages) -> list:
+    """Run the chosen stages for every graph of the grid and return a list of results"""
+    results = []
+    for vertices in vertices_grid:
+        for degree in degrees_grid:
+            edges = min(vertices * degree // 2, vertices * (vertices - 1) // 2)
+            incidence_matrix, _ = random_graph_edges(vertices, edges, seed=seed, sparse=True)
+            graph = Graph()
+            graph.set_graph((incidence_matrix, GraphRepresentation.INCIDENCE_MATRIX))
+            stage_cases = {
+                "generator": lambda: generator_cases(vertices, edges, seed),
+                "converter": lambda: converter_cases(graph.csr),
+                "reader": lambda: reader_cases(graph),
+                "writer": lambda: writer_cases(graph),
+                "algorithms": lambda: algorithms_cases(graph.csr),
+                "renderer": lambda: renderer_cases(graph),
+            }
+            for stage in stages:
+                for name, function, runnable in stage_cases[stage]():
+                    if not runnable:
+                        continue
+                    seconds, peak = measure(function, repeats)
+                    results.append({"stage": stage, "case": name, "vertices": vertices, "degree": degree,
+                                    "edges": edges, "seconds": seconds, "peak_bytes": peak})
+                    print("{:<11}{:<37}{:>7} vertices {:>4} degree {:>10.4f} s {:>10.1f} MB".format(
+                        stage, name, vertices, degree, seconds, peak / (1 << 20)), flush=True)
+    return results
+
+
+def result_key(result) -> tuple:
+    return result["stage"], result["case"], result["vertices"], result["degree"]
+
+
+def compare(results, baseline, tolerance) -> list:
+    """Return descriptions of results slower or using more memory than the baseline by more than the tolerance"""
+    baseline_results = {result_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline_results.get(result_key(result))
+        if previous is None:
+            continue
+        for field, unit, min_difference in (("seconds", "s", MIN_SECONDS_DIFFERENCE),
+                                            ("peak_bytes", "B", MIN_BYTES_DIFFERENCE)):
+            if result[field] > previous[field] * (1 + tolerance) and \
+                    result[field] - previous[field] > min_difference:
+                regressions.append("{} {} ({} vertices, degree {}): {} {:.4g} {} -> {:.4g} {} ({:+.0%})".format(
+                    result["stage"], result["case"], result["vertices"], result["degree"], field,
+                    previous[field], unit, result[field], unit, result[field] / previous[field] - 1))
+    return regressions
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+            "system": platform.system(), "processor": platform.processor(), "cpus": os.cpu_count()}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark reading, converting, generating, analysing, writing "
+                                                 "and drawing of seeded random graphs")
+    parser.add_argument("--vertices", type=int, nargs="+", default=DEFAULT_VERTICES, help="numbers of vertices")
+    parser.add_argument("--degrees", type=int, nargs="+", default=DEFAULT_DEGREES, help="mean vertex degrees")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="stages to run")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the generated graphs")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs of every case, the best one counts")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative growth of time and memory compared with the baseline")
+    return parser
+
+
+def main(argv) -> int:
+    args = build_parser().parse_args(argv)
+    output = None if args.output is None else os.path.abspath(args.output)
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    os.chdir(ROOT)
+    os.makedirs(os.path.join("data", WORK_FOLDER), exist_ok=True)
+    try:
+        results = run_suite(args.vertices, args.degrees, args.seed, args.repeats, args.stages)
+    finally:
+        shutil.rmtree(os.path.join("data", WORK_FOLDER))
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump({"environment": environment(), "seed": args.seed, "repeats": args.repeats,
+                       "results": results}, f, indent=1)
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    print("{} regressions in {} results compared with {}".format(len(regressions), len(results), args.baseline))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,127 @@
+"""Time the cold start of the command line tool, as paid by every short-lived job.
+
+Every case runs a fresh interpreter (best of the repeats), then once more with a probe reporting its peak resident
+memory and imported modules at exit. The run fails if a command that does not draw imports matplotlib or another
+module meant to be loaded lazily. Results are written as JSON and can be compared with
+a baseline run as in BenchmarkSuite.
+
+Run from anywhere:
+    python3 benchmarks/StartupBenchmark.py --output startup.json
+    python3 benchmarks/StartupBenchmark.py --baseline startup.json --tolerance 0.25"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from BenchmarkSuite import compare
+from BenchmarkSuite import environment
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(ROOT, "src")
+MAIN = os.path.join(SRC, "main.py")
+
+# modules that only the cases allowed to load them may import
+LAZY_MODULES = ("matplotlib", "multiprocessing", "asyncio")
+
+# run by the probe run of a case: executes the arguments of python given after it and writes the peak resident
+# memory and the imported modules as JSON to the file in STARTUP_PROBE; unlike the rusage of a child process,
+# VmHWM does not include the memory of the benchmark process it was forked from
+PROBE = """
+import atexit, json, os, runpy, sys
+def report():
+    peak = 0
+    try:
+        with open("/proc/self/status") as f:
+            peak = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    with open(os.environ["STARTUP_PROBE"], "w") as f:
+        json.dump({"peak_bytes": peak, "modules": sorted(sys.modules)}, f)
+atexit.register(report)
+sys.argv = sys.argv[1:]
+if sys.argv[0] == "-c":
+    exec(sys.argv[1])
+else:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+# case name, arguments of python and lazy modules the case needs
+CASES = (
+    ("interpreter", ["-c", "pass"], ()),
+    ("import numpy", ["-c", "import numpy"], ()),
+    ("import CommandLine", ["-c", "import CommandLine"], ()),
+    ("help", [MAIN, "--help"], ()),
+    ("generate", [MAIN, "generate", "startup.txt", "-n", "100", "-p", "0.05", "--seed", "1", "-o", "edge-list"], ()),
+    ("read", [MAIN, "read", "startup.txt", "-r", "edge-list"], ()),
+    ("convert", [MAIN, "convert", "startup.txt", "-r", "edge-list", "-o", "adjacency-list"], ()),
+    ("stats", [MAIN, "stats", "startup.txt", "-r", "edge-list"], ()),
+    ("render", [MAIN, "render", "startup.txt", "-r", "edge-list"], ("matplotlib",)),
+)
+
+
+def run_process(arguments, directory, env=None) -> float:
+    """Run python with the arguments and return its wall time in seconds"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + arguments, cwd=directory, env=dict(os.environ, PYTHONPATH=SRC, **(env or {})),
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def probe_process(arguments, directory) -> (int, set):
+    """Run python with the arguments under the probe and return its peak resident memory in bytes
+    and the top level packages it imported"""
+    report = os.path.join(directory, "probe.json")
+    run_process(["-c", PROBE] + arguments, directory, {"STARTUP_PROBE": report})
+    with open(report) as f:
+        probe = json.load(f)
+    return probe["peak_bytes"], {module.split(".")[0] for module in probe["modules"]}
+
+
+def run_startup(repeats) -> (list, list):
+    """Run every case and return the results and descriptions of lazy modules imported too early"""
+    results, violations = [], []
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, "data"))
+        for name, arguments, allowed in CASES:
+            seconds = min(run_process(arguments, directory) for _ in range(repeats))
+            peak, modules = probe_process(arguments, directory)
+            loaded = sorted(modules & set(LAZY_MODULES) - set(allowed))
+            violations.extend("{} imports {}".format(name, module) for module in loaded)
+            results.append({"stage": "startup", "case": name, "vertices": 0, "degree": 0, "edges": 0,
+                            "seconds": seconds, "peak_bytes": peak})
+            print("{:<20}{:>10.4f} s {:>10.1f} MB {}".format(name, seconds, peak / (1 << 20),
+                                                             " ".join(loaded)), flush=True)
+    return results, violations
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the start of the command line tool")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs of every case, the best one counts")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative growth of time and memory compared with the baseline")
+    return parser
+
+
+def main(argv) -> int:
+    args = build_parser().parse_args(argv)
+    results, violations = run_startup(args.repeats)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "repeats": args.repeats, "results": results}, f, indent=1)
+    regressions = ["lazy import: " + violation for violation in violations]
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            regressions.extend(compare(results, json.load(f), args.tolerance))
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
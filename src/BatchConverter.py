@@ -0,0 +1,68 @@
+import time
+from typing import NamedTuple, Optional
+
+from Graph import Graph
+from GraphConverter import IncorrectInputException
+from ParseCache import DEFAULT_CACHE_SIZE
+from ParseCache import ParseCache
+
+
+class ConversionResult(NamedTuple):
+    """Outcome of the conversion of one file"""
+    filename: str
+    output: str
+    seconds: float
+    error: Optional[str] = None
+
+
+class BatchReport:
+    """Summary of a batch conversion, failed files are collected instead of stopping the batch"""
+
+    def __init__(self):
+        self.converted = []
+        self.failures = []
+
+    def add(self, result) -> None:
+        if result.error is None:
+            self.converted.append(result)
+        else:
+            self.failures.append(result)
+
+    def __str__(self) -> str:
+        lines = ["converted {} of {} files".format(len(self.converted), len(self.converted) + len(self.failures))]
+        lines.extend("failed {}: {}".format(result.filename, result.error) for result in self.failures)
+        return "\n".join(lines)
+
+
+def convert_file(task) -> ConversionResult:
+    """Convert one file, run in a worker process"""
+    filename, input_representation, output, output_representation, binary, cache_directory, cache_size = task
+    start = time.perf_counter()
+    try:
+        graph = Graph(parse_cache=None if cache_directory is None else ParseCache(cache_directory, cache_size))
+        graph.read_data(input_representation, filename)
+        graph.save_to_file(output_representation, output, binary=binary)
+    except Exception as e:
+        # any failure of one file is reported and the batch goes on, unexpected errors are named by their type
+        error = str(e) if isinstance(e, (IncorrectInputException, OSError)) else type(e).__name__ + ": " + str(e)
+        return ConversionResult(filename, output, time.perf_counter() - start, error.replace("\n", " "))
+    return ConversionResult(filename, output, time.perf_counter() - start)
+
+
+def convert_files(filenames, input_representation, outputs, output_representation, binary=False, workers=None,
+                  chunk_size=4, cache_directory=None, cache_size=DEFAULT_CACHE_SIZE):
+    """Convert files in a pool of worker processes and yield a ConversionResult for every file as soon as it is
+    done, in completion order.
+    :param outputs: output file name for every input file
+    :param workers: number of worker processes, all CPUs by default; 1 converts in the calling process
+    :param chunk_size: number of files sent to a worker at once
+    :param cache_directory: folder of the persistent cache of parsed files shared by the workers, not used if None"""
+    tasks = [(filename, input_representation, output, output_representation, binary, cache_directory, cache_size)
+             for filename, output in zip(filenames, outputs)]
+    if workers == 1 or len(tasks) <= 1:
+        yield from map(convert_file, tasks)
+        return
+    # loaded only for a pool, single file conversions start faster without it
+    import multiprocessing
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(convert_file, tasks, chunk_size)
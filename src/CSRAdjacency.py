@@ -0,0 +1,155 @@
+import numpy as np
+
+from StoragePolicy import index_dtype
+from StoragePolicy import matrix_dtype
+
+
+def sorted_unique(keys, in_place=False) -> np.ndarray:
+    """Return sorted distinct values of an integer array, faster than np.unique for large arrays
+    :param in_place: if True, the array is sorted in place instead of copied"""
+    # equal integers are indistinguishable, so the unstable sort, much faster than the stable one, is enough
+    if in_place:
+        keys.sort()
+    else:
+        keys = np.sort(keys)
+    if len(keys) == 0:
+        return keys
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+
+class CSRAdjacency:
+    """Adjacency structure of an undirected graph stored in compressed sparse row form.
+
+    Neighbors of vertex i are indices[indptr[i]:indptr[i + 1]], sorted ascending.
+    Every edge is stored twice, once in the row of each of its endpoints.
+    indptr is int64, indices use the index type of the storage policy."""
+
+    def __init__(self, indptr, indices):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices).astype(index_dtype(len(self.indptr) - 1), copy=False)
+
+    @classmethod
+    def from_edges(cls, vertices_number, first, second) -> "CSRAdjacency":
+        """Build the structure from endpoint arrays of undirected edges, duplicates are merged"""
+        first = np.asarray(first, dtype=np.int64)
+        second = np.asarray(second, dtype=np.int64)
+        rows = np.concatenate((first, second))
+        cols = np.concatenate((second, first))
+        keys = sorted_unique(rows * vertices_number + cols)
+        rows, cols = np.divmod(keys, vertices_number)
+        indptr = np.zeros(vertices_number + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=vertices_number), out=indptr[1:])
+        return cls(indptr, cols)
+
+    @classmethod
+    def from_dense(cls, matrix) -> "CSRAdjacency":
+        """Build the structure from a symmetric adjacency matrix, only cells equal to 1 are edges"""
+        matrix = np.atleast_2d(matrix)
+        rows, cols = np.nonzero(matrix == 1)
+        return cls.from_entries(len(matrix), rows, cols)
+
+    @classmethod
+    def from_entries(cls, vertices_number, rows, cols) -> "CSRAdjacency":
+        """Build the structure from rows and columns of the ones of a symmetric matrix in row-major order"""
+        indptr = np.zeros(vertices_number + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=vertices_number), out=indptr[1:])
+        return cls(indptr, cols)
+
+    @classmethod
+    def from_arrays(cls, indptr, indices) -> "CSRAdjacency":
+        """Wrap indptr and indices arrays as they are, without converting or copying them"""
+        csr = cls.__new__(cls)
+        csr.indptr = indptr
+        csr.indices = indices
+        return csr
+
+    @property
+    def vertices_number(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def edges_number(self) -> int:
+        return len(self.indices) // 2
+
+    @property
+    def shape(self) -> (int, int):
+        return self.vertices_number, self.vertices_number
+
+    def degrees(self) -> np.ndarray:
+        """Return the degree of every vertex"""
+        return np.diff(self.indptr)
+
+    def neighbors(self, vertex) -> np.ndarray:
+        """Return sorted neighbors of the given vertex"""
+        return self.indices[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def row_ids(self) -> np.ndarray:
+        """Return the row of every stored entry"""
+        return np.repeat(np.arange(self.vertices_number), self.degrees())
+
+    def edges(self) -> (np.ndarray, np.ndarray):
+        """Return endpoints of every edge once, with first < second, ordered by first then second"""
+        rows = self.row_ids()
+        upper = rows < self.indices
+        return rows[upper], self.indices[upper]
+
+    def edge_blocks(self, entries):
+        """Yield endpoints of the edges as edges() returns them, for blocks of rows holding at most the given
+        number of stored entries, or one row if it holds more"""
+        starts = np.searchsorted(self.indptr, np.arange(0, len(self.indices), max(entries, 1)), side="right") - 1
+        bounds = np.append(np.unique(starts), self.vertices_number)
+        for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            rows = np.repeat(np.arange(start, stop), np.diff(self.indptr[start:stop + 1]))
+            cols = self.indices[self.indptr[start]:self.indptr[stop]]
+            upper = rows < cols
+            yield rows[upper], cols[upper]
+
+    def edge_array(self) -> np.ndarray:
+        """Return an (m x 2) array of edges ordered as in edges()"""
+        first, second = self.edges()
+        edges = np.empty((len(first), 2), dtype=index_dtype(self.vertices_number))
+        edges[:, 0], edges[:, 1] = first, second
+        return edges
+
+    def with_edges(self, first, second) -> "CSRAdjacency":
+        """Return the graph with the given edges added, existing edges are kept once"""
+        old_first, old_second = self.edges()
+        return CSRAdjacency.from_edges(self.vertices_number, np.concatenate((old_first, first)),
+                                       np.concatenate((old_second, second)))
+
+    def without_edges(self, first, second) -> "CSRAdjacency":
+        """Return the graph with the given edges removed, edges that do not exist are ignored"""
+        old_first, old_second = self.edges()
+        first, second = np.minimum(first, second), np.maximum(first, second)
+        kept = ~np.isin(old_first * self.vertices_number + old_second, first * self.vertices_number + second)
+        return CSRAdjacency.from_edges(self.vertices_number, old_first[kept], old_second[kept])
+
+    def with_vertices(self, count) -> "CSRAdjacency":
+        """Return the graph with isolated vertices added after the existing ones"""
+        return CSRAdjacency(np.concatenate((self.indptr, np.full(count, self.indptr[-1]))), self.indices)
+
+    def dense_row(self, vertex) -> np.ndarray:
+        """Return one row of the adjacency matrix"""
+        row = np.zeros(self.vertices_number, dtype=matrix_dtype())
+        row[self.neighbors(vertex)] = 1
+        return row
+
+    def dense_rows(self, start, stop) -> np.ndarray:
+        """Build rows start..stop-1 of the adjacency matrix"""
+        begin, end = self.indptr[start], self.indptr[stop]
+        block = np.zeros((stop - start, self.vertices_number), dtype=matrix_dtype())
+        block[np.repeat(np.arange(stop - start), np.diff(self.indptr[start:stop + 1])), self.indices[begin:end]] = 1
+        return block
+
+    def to_dense(self) -> np.ndarray:
+        """Build the full adjacency matrix"""
+        return self.dense_rows(0, self.vertices_number)
+
+    def to_adjacency_list(self) -> list:
+        """Build an adjacency list with vertices numbered from 1"""
+        return [row.tolist() for row in np.split(self.indices + 1, self.indptr[1:-1])]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CSRAdjacency):
+            return NotImplemented
+        return np.array_equal(self.indptr, other.indptr) and np.array_equal(self.indices, other.indices)
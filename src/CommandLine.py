@@ -0,0 +1,279 @@
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+
+from BatchConverter import BatchReport
+from BatchConverter import convert_files
+from DensityRenderer import DEFAULT_IMAGE_SIZE
+from DensityRenderer import TONE_MAPPINGS
+from Graph import Graph
+from GraphConverter import IncorrectInputException
+from GraphRepresentation import GraphRepresentation
+from GraphWriter import COMPRESSION_EXTENSIONS
+from GraphWriter import COMPRESSORS
+from ParseCache import DEFAULT_CACHE_SIZE
+from ParseCache import ParseCache
+from RandomGraphGenerator import BadNumberOfEdges
+from RandomGraphGenerator import BadNumberOfVertices
+from RandomGraphGenerator import BadProbability
+from RandomGraphGenerator import random_graph_edges
+from RandomGraphGenerator import random_graph_probability
+
+DATA_FOLDER = "data/"
+# memory for the graphs of the service in bytes
+DEFAULT_MEMORY_CAP = 4 << 30
+# graphs with more edges are rasterized by render, matplotlib takes too long to draw them
+RASTER_EDGES_LIMIT = 20000
+
+# names of the representations on the command line, e.g. "adjacency-list"
+REPRESENTATIONS = {representation.name.lower().replace("_", "-"): representation
+                   for representation in GraphRepresentation}
+
+# short names used in the names of converted files
+FILE_SUFFIXES = {
+    GraphRepresentation.ADJACENCY_MATRIX: "adj_mat",
+    GraphRepresentation.ADJACENCY_LIST: "adj_list",
+    GraphRepresentation.INCIDENCE_MATRIX: "inc_mat",
+    GraphRepresentation.EDGE_LIST: "edge_list",
+}
+
+# extension added to the names of compressed files, e.g. "gzip" -> ".gz"
+COMPRESSED_SUFFIXES = {compression: extension for extension, compression in COMPRESSION_EXTENSIONS.items()}
+
+# errors of incorrect input or arguments, reported with exit code 1; other errors are bugs and show a traceback
+COMMAND_ERRORS = (IncorrectInputException, BadNumberOfEdges, BadNumberOfVertices, BadProbability, OSError, ValueError)
+
+
+def representation_argument(value) -> GraphRepresentation:
+    """Parse a representation name given on the command line"""
+    try:
+        return REPRESENTATIONS[value]
+    except KeyError:
+        raise argparse.ArgumentTypeError("unknown representation " + value + ", choose from: " +
+                                         ", ".join(REPRESENTATIONS))
+
+
+def expand_files(patterns) -> list:
+    """Expand glob patterns relative to the data folder to file names relative to it"""
+    filenames = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(DATA_FOLDER + pattern, recursive=True))
+        if not matches:
+            print(pattern + ": no matching files in folder data")
+        filenames.extend(os.path.relpath(match, DATA_FOLDER) for match in matches if os.path.isfile(match))
+    return filenames
+
+
+def output_name(filename, suffix, output_dir) -> str:
+    """Name of an output file made from an input file, e.g. graph.txt -> graph_adj_list.txt.
+    The output folder is created in the data folder if needed"""
+    directory, name = os.path.split(filename)
+    if output_dir is not None:
+        directory = output_dir
+    os.makedirs(os.path.join(DATA_FOLDER, directory), exist_ok=True)
+    return os.path.join(directory, os.path.splitext(name)[0] + suffix)
+
+
+def cache_directory(args) -> str:
+    """Folder of the parse cache in the data folder, None if the cache is not used"""
+    if args.cache_dir is None:
+        return None
+    return os.path.join(DATA_FOLDER, args.cache_dir)
+
+
+def read_command(graph, filename, args) -> str:
+    graph.read_data(args.representation, filename)
+    return "{} vertices, {} edges".format(graph.csr.vertices_number, graph.csr.edges_number)
+
+
+def render_graph(graph, output, raster=False, size=DEFAULT_IMAGE_SIZE, tone="log") -> None:
+    """Draw the graph with matplotlib, or rasterize it if asked or if it has too many edges"""
+    if raster or graph.csr.edges_number > RASTER_EDGES_LIMIT:
+        graph.render_density(output, size, tone)
+    else:
+        graph.visualise_graph_on_circle(True, output)
+
+
+def render_command(graph, filename, args) -> str:
+    graph.read_data(args.representation, filename)
+    output = output_name(filename, ".png", args.output_dir)
+    render_graph(graph, output, args.raster, args.size, args.tone)
+    return "saved to " + output
+
+
+def graph_statistics(graph) -> dict:
+    """Return the numbers of vertices and edges and, for a graph with vertices, degree and component statistics"""
+    degrees = graph.csr.degrees()
+    statistics = {"vertices": graph.csr.vertices_number, "edges": graph.csr.edges_number}
+    if len(degrees):
+        components = graph.connected_components()
+        statistics.update(degree_min=int(degrees.min()), degree_max=int(degrees.max()),
+                          degree_mean=float(degrees.mean()), isolated=int((degrees == 0).sum()),
+                          components=int(components.max() + 1), largest_component=int(np.bincount(components).max()))
+    return statistics
+
+
+def stats_command(graph, filename, args) -> str:
+    graph.read_data(args.representation, filename)
+    statistics = graph_statistics(graph)
+    if statistics["vertices"] == 0:
+        return "0 vertices"
+    return "{vertices} vertices, {edges} edges, degree min {degree_min} max {degree_max} mean {degree_mean:.3f}, " \
+           "{isolated} isolated vertices, {components} components, " \
+           "largest component {largest_component} vertices".format(**statistics)
+
+
+def run_for_files(command, args) -> int:
+    """Run a command for every input file in one process, reporting the time of each file"""
+    filenames = expand_files(args.files)
+    failures = 0
+    directory = cache_directory(args)
+    graph = Graph(parse_cache=None if directory is None else ParseCache(directory, args.cache_size << 20))
+    for filename in filenames:
+        start = time.perf_counter()
+        try:
+            result = command(graph, filename, args)
+        except (IncorrectInputException, OSError) as e:
+            failures += 1
+            result = "error: " + str(e).replace("\n", " ")
+        print("{}: {} ({:.1f} ms)".format(filename, result, (time.perf_counter() - start) * 1000))
+    return 1 if failures or not filenames else 0
+
+
+def convert_command(args) -> int:
+    """Convert all input files in a pool of worker processes"""
+    filenames = expand_files(args.files)
+    suffix = "_" + FILE_SUFFIXES[args.output_representation] + (".bin" if args.binary else ".txt")
+    if args.compress is not None:
+        suffix += COMPRESSED_SUFFIXES[args.compress]
+    outputs = [output_name(filename, suffix, args.output_dir) for filename in filenames]
+    report = BatchReport()
+    for result in convert_files(filenames, args.representation, outputs, args.output_representation, args.binary,
+                                args.workers or None, cache_directory=cache_directory(args),
+                                cache_size=args.cache_size << 20):
+        report.add(result)
+        outcome = "saved to " + result.output if result.error is None else "error: " + result.error
+        print("{}: {} ({:.1f} ms)".format(result.filename, outcome, result.seconds * 1000))
+    print(report)
+    return 1 if report.failures or not filenames else 0
+
+
+def generate_command(args) -> int:
+    start = time.perf_counter()
+    graph = Graph()
+    if args.edges is not None:
+        graph.set_graph(random_graph_edges(args.vertices, args.edges, seed=args.seed, sparse=True,
+                                           workers=args.workers or None))
+    else:
+        graph.set_graph(random_graph_probability(args.vertices, args.probability, args.method, args.seed,
+                                                 args.workers or None))
+    os.makedirs(os.path.join(DATA_FOLDER, os.path.dirname(args.output)), exist_ok=True)
+    graph.save_to_file(args.output_representation, args.output, binary=args.binary, compression=args.compress)
+    print("{}: {} vertices, {} edges ({:.1f} ms)".format(args.output, graph.csr.vertices_number,
+                                                         graph.csr.edges_number,
+                                                         (time.perf_counter() - start) * 1000))
+    return 0
+
+
+def serve_command(args) -> int:
+    """Keep graphs in memory and serve requests until the shutdown request"""
+    # imported here, only the service uses asyncio
+    import asyncio
+    import GraphService
+    service = GraphService.GraphService(args.memory_cap << 20, args.workers or None)
+    address = args.socket if args.socket is not None else "127.0.0.1:{}".format(args.port)
+    print("serving on " + address, flush=True)
+    asyncio.run(service.serve(args.socket, port=args.port))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="Read, convert, generate and draw graphs. "
+                                                                 "File names are relative to the data folder.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    representation_names = ", ".join(REPRESENTATIONS)
+
+    def add_input_arguments(command_parser):
+        command_parser.add_argument("files", nargs="+", help="input files or glob patterns")
+        command_parser.add_argument("-r", "--representation", type=representation_argument, required=True,
+                                    help="representation of the input files: " + representation_names)
+        command_parser.add_argument("--cache-dir", help="folder of a persistent cache of parsed input files, "
+                                                        "unchanged files are not parsed again")
+        command_parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE >> 20,
+                                    help="size limit of the cache in MB")
+
+    def add_output_arguments(command_parser):
+        command_parser.add_argument("-o", "--output-representation", type=representation_argument, required=True,
+                                    help="representation of the output: " + representation_names)
+        output_format = command_parser.add_mutually_exclusive_group()
+        output_format.add_argument("--binary", action="store_true", help="write the binary format")
+        output_format.add_argument("--compress", choices=list(COMPRESSORS),
+                                   help="compress the text output, files named *.gz, *.bz2 and *.xz "
+                                        "are compressed anyway")
+
+    read_parser = commands.add_parser("read", help="read and validate graph files")
+    add_input_arguments(read_parser)
+    read_parser.set_defaults(handler=lambda args: run_for_files(read_command, args))
+
+    convert_parser = commands.add_parser("convert", help="convert graph files to another representation")
+    add_input_arguments(convert_parser)
+    add_output_arguments(convert_parser)
+    convert_parser.add_argument("--output-dir", help="folder of the converted files, the input folder by default")
+    convert_parser.add_argument("-j", "--workers", type=int, default=1,
+                                help="number of worker processes, 0 for one per CPU")
+    convert_parser.set_defaults(handler=convert_command)
+
+    render_parser = commands.add_parser("render", help="draw graph files on a circle to png images")
+    add_input_arguments(render_parser)
+    render_parser.add_argument("--output-dir", help="folder of the images, the input folder by default")
+    render_parser.add_argument("--raster", action="store_true",
+                               help="rasterize edges to a density image instead of drawing them with matplotlib, "
+                                    "always done for graphs with more than {} edges".format(RASTER_EDGES_LIMIT))
+    render_parser.add_argument("--size", type=int, default=DEFAULT_IMAGE_SIZE, help="size of raster images in pixels")
+    render_parser.add_argument("--tone", choices=TONE_MAPPINGS, default="log",
+                               help="mapping of the number of edges crossing a pixel to its color in raster images")
+    render_parser.set_defaults(handler=lambda args: run_for_files(render_command, args))
+
+    stats_parser = commands.add_parser("stats", help="print vertex, edge and degree statistics of graph files")
+    add_input_arguments(stats_parser)
+    stats_parser.set_defaults(handler=lambda args: run_for_files(stats_command, args))
+
+    generate_parser = commands.add_parser("generate", help="generate a random graph")
+    generate_parser.add_argument("output", help="output file")
+    generate_parser.add_argument("-n", "--vertices", type=int, required=True, help="number of vertices")
+    model = generate_parser.add_mutually_exclusive_group(required=True)
+    model.add_argument("-l", "--edges", type=int, help="number of edges of a G(n,l) graph")
+    model.add_argument("-p", "--probability", type=float, help="edge probability of a G(n,p) graph")
+    generate_parser.add_argument("--method", choices=["dense", "geometric"], default="geometric",
+                                 help="G(n,p) generation method")
+    generate_parser.add_argument("--seed", type=int, help="seed of the random generator")
+    generate_parser.add_argument("-j", "--workers", type=int, default=1,
+                                 help="number of threads drawing vertex pairs, 0 for one per CPU; "
+                                      "the graph does not depend on it")
+    add_output_arguments(generate_parser)
+    generate_parser.set_defaults(handler=generate_command)
+
+    serve_parser = commands.add_parser("serve", help="keep named graphs in memory and serve requests as lines of "
+                                                     "JSON on a local socket")
+    address = serve_parser.add_mutually_exclusive_group(required=True)
+    address.add_argument("--socket", help="path of a Unix socket")
+    address.add_argument("--port", type=int, help="TCP port on 127.0.0.1")
+    serve_parser.add_argument("--memory-cap", type=int, default=DEFAULT_MEMORY_CAP >> 20,
+                              help="memory for the graphs in MB, idle graphs are evicted above it")
+    serve_parser.add_argument("-j", "--workers", type=int, default=0,
+                              help="number of threads running requests, 0 for one per CPU")
+    serve_parser.set_defaults(handler=serve_command)
+    return parser
+
+
+def run(argv) -> int:
+    """Run the command line interface, return the exit code"""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except COMMAND_ERRORS as e:
+        print("Error: " + str(e))
+        return 1
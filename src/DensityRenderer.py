@@ -0,0 +1,147 @@
+import struct
+import zlib
+
+import numpy as np
+
+from CSRAdjacency import CSRAdjacency
+
+DEFAULT_IMAGE_SIZE = 1024
+# number of points sampled on the chords at once, the memory taken besides the image does not depend on the graph
+SAMPLE_CHUNK = 1 << 22
+# colors of the drawing on a circle: white background, red edges, green vertices with black borders
+BACKGROUND = (255, 255, 255)
+EDGE_COLOR = (255, 0, 0)
+VERTEX_COLOR = (0, 128, 0)
+BORDER_COLOR = (0, 0, 0)
+# the vertex radius in pixels is limited to this part of the image
+MAX_VERTEX_RADIUS = 1 / 100
+TONE_MAPPINGS = ("log", "alpha")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def circle_layout(vertices_number, size) -> np.ndarray:
+    """Return (x, y) pixel coordinates of vertices spread evenly on a circle filling the image, first vertex on
+    the right and the next ones counterclockwise as on the matplotlib drawing"""
+    angles = 2 * np.pi / max(vertices_number, 1) * np.arange(vertices_number)
+    radius = (size - 1) / 2 * (1 - 4 * MAX_VERTEX_RADIUS)
+    center = (size - 1) / 2
+    return np.column_stack((center + radius * np.cos(angles), center - radius * np.sin(angles)))
+
+
+def vertex_radius(vertices_number, size) -> float:
+    """Radius of the vertices in pixels, so that neighbours on the circle do not overlap; vertices smaller than
+    a pixel are not drawn"""
+    circumference = np.pi * size * (1 - 4 * MAX_VERTEX_RADIUS)
+    return min(size * MAX_VERTEX_RADIUS, 0.4 * circumference / max(vertices_number, 1))
+
+
+def chords_per_chunk(size) -> int:
+    """Number of chords sampled at once, so that a chunk has at most SAMPLE_CHUNK samples"""
+    # a chord has at most size + 1 samples
+    return max(1, SAMPLE_CHUNK // (size + 1))
+
+
+def accumulate_chords(nodes, first, second, size, density=None) -> np.ndarray:
+    """Count how many chords between vertices pass through every pixel. Every chord is sampled once per pixel of
+    its longer side; the coordinates of the endpoints are gathered for chunks of chords, so memory does not grow
+    with their number
+    :param nodes: (x, y) pixel coordinates of every vertex
+    :param first, second: vertices joined by the chords
+    :param density: (size x size) counts the chords are added to, a new array if None
+    :return: (size x size) array of counts"""
+    if density is None:
+        density = np.zeros((size, size), dtype=np.int64)
+    counts = density.reshape(-1)
+    chunk = chords_per_chunk(size)
+    for start in range(0, len(first), chunk):
+        counts += np.bincount(chord_pixels(nodes[first[start:start + chunk]], nodes[second[start:start + chunk]],
+                                           size), minlength=size * size)
+    return density
+
+
+def chord_pixels(first_points, second_points, size) -> np.ndarray:
+    """Return the linear index of the pixel of every sample of the chords"""
+    deltas = second_points - first_points
+    samples = np.ceil(np.abs(deltas).max(axis=1, initial=0)).astype(np.int64) + 1
+    steps = deltas / np.maximum(samples - 1, 1)[:, np.newaxis]
+    # consecutive samples of a chord are one step apart and the first sample of a chord jumps from the end of
+    # the previous one, so the coordinates are cumulative sums; half a pixel is added to round by truncation
+    jumps = first_points - np.concatenate(([[-0.5, -0.5]], second_points[:-1]))
+    firsts = np.cumsum(samples) - samples
+    pixels = None
+    for axis, scale in ((1, size), (0, 1)):
+        coordinates = np.repeat(steps[:, axis], samples)
+        coordinates[firsts] = jumps[:, axis]
+        np.cumsum(coordinates, out=coordinates)
+        if pixels is None:
+            pixels = coordinates.astype(np.int64)
+            pixels *= scale
+        else:
+            pixels += coordinates.astype(np.int64)
+    return pixels
+
+
+def tone_map(density, tone="log", alpha=0.05) -> np.ndarray:
+    """Map chord counts to opacities from 0 to 1
+    :param tone: "log" scales log(1 + count) to the densest pixel, "alpha" stacks chords of the given opacity"""
+    if tone == "alpha":
+        return 1 - (1 - alpha) ** density
+    peak = density.max()
+    if peak == 0:
+        return np.zeros_like(density)
+    return np.log1p(density) / np.log1p(peak)
+
+
+def blend(image, opacity, color) -> None:
+    """Paint the color over the RGB image with the given opacity of every pixel"""
+    image += opacity[..., np.newaxis] * (np.asarray(color, dtype=np.float64) - image)
+
+
+def paint_disks(image, centers, radius, color) -> None:
+    """Paint filled disks of the given radius in pixels around the centers"""
+    size = image.shape[0]
+    reach = int(np.ceil(radius))
+    offsets = np.arange(-reach, reach + 1)
+    dx, dy = np.meshgrid(offsets, offsets)
+    inside = dx * dx + dy * dy <= radius * radius
+    pixels = np.rint(centers).astype(np.int64)
+    xs = (pixels[:, 0, np.newaxis] + dx[inside]).ravel()
+    ys = (pixels[:, 1, np.newaxis] + dy[inside]).ravel()
+    visible = (xs >= 0) & (xs < size) & (ys >= 0) & (ys < size)
+    image[ys[visible], xs[visible]] = color
+
+
+def render_density(csr: CSRAdjacency, size=DEFAULT_IMAGE_SIZE, tone="log", alpha=0.05) -> np.ndarray:
+    """Rasterize the graph drawn on a circle to a (size x size x 3) uint8 RGB image. Edges are chords whose
+    overlaps are tone mapped; time grows linearly with the number of edges and memory with the image size, the
+    edges are taken from the sparse form block by block"""
+    nodes = circle_layout(csr.vertices_number, size)
+    density = np.zeros((size, size), dtype=np.int64)
+    # every edge is stored in the rows of both endpoints, so a block of rows holds about two chunks of chords
+    for first, second in csr.edge_blocks(2 * chords_per_chunk(size)):
+        accumulate_chords(nodes, first, second, size, density)
+    image = np.empty((size, size, 3), dtype=np.float64)
+    image[:] = BACKGROUND
+    blend(image, tone_map(density, tone, alpha), EDGE_COLOR)
+    radius = vertex_radius(csr.vertices_number, size)
+    if radius >= 1:
+        paint_disks(image, nodes, radius, BORDER_COLOR)
+        paint_disks(image, nodes, radius * 6 / 7, VERTEX_COLOR)
+    return np.rint(image).astype(np.uint8)
+
+
+def png_chunk(kind, data) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def write_png(filename, image) -> None:
+    """Write an (height x width x 3) uint8 RGB image as PNG, rows unfiltered"""
+    height, width, _ = image.shape
+    rows = np.zeros((height, 1 + 3 * width), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, 3 * width)
+    with open(filename, "wb") as f:
+        f.write(PNG_SIGNATURE)
+        f.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)))
+        f.write(png_chunk(b"IEND", b""))
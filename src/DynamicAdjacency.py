@@ -0,0 +1,65 @@
+import itertools
+
+import numpy as np
+
+from CSRAdjacency import CSRAdjacency
+from GraphConverter import IncorrectInputException
+
+
+class DynamicAdjacency:
+    """Adjacency sets of an undirected graph, edges are added and removed in O(1) time.
+    Vertices are numbered from 0, the set of vertex i holds its neighbors"""
+
+    def __init__(self, neighbors=None):
+        self.neighbors = [] if neighbors is None else neighbors
+        self.edges_number = sum(len(vertex_neighbors) for vertex_neighbors in self.neighbors) // 2
+
+    @classmethod
+    def from_csr(cls, csr) -> "DynamicAdjacency":
+        indices = csr.indices.tolist()
+        indptr = csr.indptr.tolist()
+        return cls([set(indices[start:stop]) for start, stop in zip(indptr, indptr[1:])])
+
+    @property
+    def vertices_number(self) -> int:
+        return len(self.neighbors)
+
+    def check_edge(self, first, second) -> None:
+        if not (0 <= first < self.vertices_number and 0 <= second < self.vertices_number):
+            raise IncorrectInputException("Vertex of the edge is out of graph bounds")
+        if first == second:
+            raise IncorrectInputException("The edge should connect two different vertices")
+
+    def add_edge(self, first, second) -> bool:
+        """Add an edge, return False if it already exists"""
+        self.check_edge(first, second)
+        if second in self.neighbors[first]:
+            return False
+        self.neighbors[first].add(second)
+        self.neighbors[second].add(first)
+        self.edges_number += 1
+        return True
+
+    def remove_edge(self, first, second) -> bool:
+        """Remove an edge, return False if it does not exist"""
+        self.check_edge(first, second)
+        if second not in self.neighbors[first]:
+            return False
+        self.neighbors[first].remove(second)
+        self.neighbors[second].remove(first)
+        self.edges_number -= 1
+        return True
+
+    def add_vertices(self, count) -> None:
+        """Add isolated vertices numbered after the existing ones"""
+        self.neighbors.extend(set() for _ in range(count))
+
+    def to_csr(self) -> CSRAdjacency:
+        """Build the sparse form, neighbors of every vertex are sorted"""
+        degrees = np.fromiter(map(len, self.neighbors), dtype=np.int64, count=self.vertices_number)
+        indptr = np.zeros(self.vertices_number + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        indices = np.fromiter(itertools.chain.from_iterable(self.neighbors), dtype=np.int64, count=indptr[-1])
+        # sets are not ordered, sort the neighbors within every row
+        offsets = np.repeat(np.arange(self.vertices_number) * self.vertices_number, degrees)
+        return CSRAdjacency(indptr, np.sort(indices + offsets) - offsets)
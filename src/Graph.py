@@ -1,105 +1,285 @@
-import math
+import os
 from typing import Union
 
-import matplotlib.pyplot as plt
 import numpy as np
 
+import DensityRenderer
+import GraphAlgorithms
 import GraphConverter
+from GraphBinaryFormat import save_binary
+from CSRAdjacency import CSRAdjacency
+from DynamicAdjacency import DynamicAdjacency
+from GraphConverter import IncorrectInputException
 from GraphReader import GraphReader
 from GraphRepresentation import GraphRepresentation
+from GraphWriter import GraphWriter
+from GraphValidation import are_edges_valid
+from GraphValidation import are_indices_in_bounds
+from Instrumentation import Instrumentation
+from Instrumentation import data_size
+from PackedAdjacencyMatrix import PackedAdjacencyMatrix
+from ParseCache import ParseCache
+from RepresentationCache import DEFAULT_CACHE_BUDGET
+from RepresentationCache import RepresentationCache
+from SparseIncidenceMatrix import SparseIncidenceMatrix
 
 
 class Graph:
-    def __init__(self):
-        self.reader = GraphReader()
-        self.adjacency_matrix = None
-
-    def read_data(self, representation, filename) -> bool:
-        """Read a graph from a file using given representation"""
-        self.adjacency_matrix = self.reader.read_data(representation, filename)
-        if self.adjacency_matrix is None:
+    # vertices are not numbered on drawings of bigger graphs
+    LABELS_LIMIT = 100
+
+    def __init__(self, cache_budget=DEFAULT_CACHE_BUDGET, parse_cache: ParseCache = None,
+                 instrumentation: Instrumentation = None):
+        """:param cache_budget: memory in bytes for representations returned by get_graph
+        :param parse_cache: persistent cache of parsed input files, not used if None
+        :param instrumentation: records of the stages run by the graph, disabled unless given enabled"""
+        self.reader = GraphReader(cache=parse_cache)
+        self.writer = GraphWriter()
+        self.instrumentation = Instrumentation() if instrumentation is None else instrumentation
+        self.cache = RepresentationCache(cache_budget)
+        self._csr = None
+        # adjacency sets of a graph changed by single edge updates, the sparse form is rebuilt from them on demand
+        self._dynamic = None
+
+    @property
+    def csr(self) -> Union[CSRAdjacency, None]:
+        """Sparse form of the graph, replacing it invalidates the cached representations"""
+        if self._csr is None and self._dynamic is not None:
+            self._csr = self._dynamic.to_csr()
+        return self._csr
+
+    @csr.setter
+    def csr(self, csr) -> None:
+        self._csr = csr
+        self._dynamic = None
+        self.cache.clear()
+
+    @property
+    def adjacency_matrix(self) -> Union[np.ndarray, None]:
+        """Dense adjacency matrix, built from the sparse form on first access. It is read-only: change the graph
+        with add_edge, remove_edge and the other update methods, or assign a whole new matrix"""
+        if self.csr is None:
+            return None
+        return self.get_graph(GraphRepresentation.ADJACENCY_MATRIX)
+
+    @adjacency_matrix.setter
+    def adjacency_matrix(self, matrix) -> None:
+        self.csr = None if matrix is None else GraphConverter.convert_to_csr(
+            matrix, GraphRepresentation.ADJACENCY_MATRIX)
+
+    @property
+    def vertices_number(self) -> int:
+        if self._dynamic is not None:
+            return self._dynamic.vertices_number
+        return 0 if self._csr is None else self._csr.vertices_number
+
+    def memory_size(self) -> int:
+        """Estimate the memory taken by the sparse form and the cached representations in bytes"""
+        return (data_size(self.csr) or 0) + self.cache.size
+
+    def current_csr(self) -> CSRAdjacency:
+        """Return the sparse form, an empty graph if no graph is set"""
+        return CSRAdjacency.from_edges(0, [], []) if self.csr is None else self.csr
+
+    def read_data(self, representation, filename, use_cache=True) -> bool:
+        """Read a graph from a file using given representation
+        :param use_cache: if False, the file is parsed even if it is in the parse cache"""
+        with self.instrumentation.stage("Graph.read_data") as record:
+            self.csr = self.reader.read_csr(representation, filename, use_cache)
+            if record.active:
+                record.input_size = os.path.getsize("data/" + filename)
+                record.output_size = data_size(self.csr)
+        if self.csr is None:
             return False
         return True
 
-    def get_graph(self, output_representation) -> Union[np.ndarray, list, None]:
-        """Return a graph in the given output representation"""
-        return GraphConverter.convert_graph(self.adjacency_matrix, GraphRepresentation.ADJACENCY_MATRIX,
-                                            output_representation)
+    def get_graph(self, output_representation,
+                  sparse=False) -> Union[np.ndarray, list, SparseIncidenceMatrix, PackedAdjacencyMatrix, None]:
+        """Return a graph in the given output representation. Results are cached until the graph changes,
+        so arrays are shared between calls and read-only, adjacency lists are copies
+        :param sparse: if True, an incidence matrix is returned as a SparseIncidenceMatrix"""
+        with self.instrumentation.stage("Graph.get_graph") as record:
+            # sparse only changes incidence matrices, the other representations share one entry
+            sparse = sparse and output_representation == GraphRepresentation.INCIDENCE_MATRIX
+            graph = self.cache.get((output_representation, sparse),
+                                   lambda: GraphConverter.convert_from_csr(self.csr, output_representation, sparse))
+            if record.active:
+                record.input_size = data_size(self.csr)
+                record.output_size = data_size(graph)
+        return graph
 
-    def save_to_file(self, representation, filename) -> bool:
-        """Save a graph with given representation to the file with given name"""
+    def save_to_file(self, representation, filename, binary=False, compression=None) -> bool:
+        """Save a graph with given representation to the file with given name
+        :param binary: if True, the graph is saved in the binary format, as an edge list for EDGE_LIST
+                       and as CSR arrays for the other representations
+        :param compression: "gzip", "bz2" or "xz" compresses a text file, by default files named *.gz, *.bz2
+                            and *.xz are compressed"""
         filename = "data/" + filename
-        output_matrix = self.get_graph(representation)
-        if isinstance(output_matrix, list):
-            with open(filename, "w+") as f:
-                for row in output_matrix:
-                    f.write(" ".join(str(item) for item in row))
-                    f.write("\n")
-            return True
-        elif isinstance(output_matrix, np.ndarray):
-            with open(filename, "w+") as f:
-                np.savetxt(f, output_matrix, fmt="%i")
+        with self.instrumentation.stage("Graph.save_to_file") as record:
+            saved = self.write_file(representation, filename, binary, compression)
+            if record.active:
+                record.input_size = data_size(self.csr)
+                record.output_size = os.path.getsize(filename) if saved else None
+        return saved
+
+    def write_file(self, representation, filename, binary, compression=None) -> bool:
+        """Write the graph to a file with a path relative to the working directory
+        :param compression: "gzip", "bz2" or "xz" compresses a text file, by default it is chosen by the extension"""
+        if binary:
+            save_binary(filename, self.csr, representation)
             return True
+        if representation == GraphRepresentation.ADJACENCY_LIST:
+            return self.writer.write_adjacency_list(filename, self.csr, compression)
+        if representation == GraphRepresentation.EDGE_LIST:
+            return self.writer.write_edge_list(filename, self.vertices_number, self.get_graph(representation),
+                                               compression)
+        if representation == GraphRepresentation.ADJACENCY_MATRIX:
+            # rows are built from the sparse form block by block unless the matrix is already cached
+            output_matrix = self.cache.peek((representation, False), self.csr)
         else:
-            return False
+            output_matrix = self.get_graph(representation, sparse=True)
+        return self.writer.write(filename, output_matrix, compression)
 
     def visualise_graph_on_circle(self, save_to_file, file_name) -> None:
         """Visualize graph on a circle. Return visualization or save to file.
         :param save_to_file: if True, the graph will be saved to file_name file
         :param file_name file name for the graph"""
-        nodes_number = len(self.adjacency_matrix)
-        phi = 2 * math.pi / nodes_number
-        # estimate graph radius
-        graph_radius = nodes_number * 1.5
-
-        nodes = []
-
-        for node in range(nodes_number):
-            nodes.insert(node, (math.cos(phi * node) * graph_radius, math.sin(phi * node) * graph_radius))
-
-        plt.close()
-        figure, axes = plt.subplots()
-        axes.set_aspect(1)
-        figure.set_size_inches(8, 8)
-
-        for i in range(len(self.adjacency_matrix)):
-            for j in range(len(self.adjacency_matrix[0])):
-                if self.adjacency_matrix[i][j] == 1:
-                    (x, y) = nodes[i]
-                    (x2, y2) = nodes[j]
-                    plt.plot([x / 15 + 0.5, x2 / 15 + 0.5], [y / 15 + 0.5, y2 / 15 + 0.5], 'r-', linewidth=2, zorder=1)
-
-        i = 0
-        for node in nodes:
-            (x, y) = node
-            i += 1
-            circle_border = plt.Circle((x / 15 + 0.5, y / 15 + 0.5), radius=0.07 * nodes_number / 10, color='black',
-                                       zorder=2)
-            circle = plt.Circle((x / 15 + 0.5, y / 15 + 0.5), radius=0.06 * nodes_number / 10, color='green', zorder=3)
-            axes.add_patch(circle_border)
-            axes.add_patch(circle)
-            if nodes_number <= 20:
-                font_size = 16
-            else:
-                font_size = 20
-            axes.annotate(i, xy=(x / 15 + 0.5, y / 15 + 0.5), fontsize=font_size, color='white',
-                          verticalalignment='center', horizontalalignment='center')
-
-        plt.axis("off")
-        axes.set_aspect('equal')
-
-        if save_to_file:
-            plt.rcParams['savefig.format'] = 'png'
-            plt.savefig("data/" + file_name)
-        else:
-            plt.show()
+        with self.instrumentation.stage("Graph.visualise_graph_on_circle") as record:
+            if record.active:
+                record.input_size = data_size(self.csr)
+            self.draw_on_circle(save_to_file, file_name)
+
+    def render_density(self, file_name, size=DensityRenderer.DEFAULT_IMAGE_SIZE, tone="log") -> None:
+        """Rasterize the graph drawn on a circle to a PNG file without matplotlib, for graphs too big to draw with it.
+        Overlapping edges are tone mapped, time grows linearly with the number of edges
+        :param size: width and height of the image in pixels
+        :param tone: "log" or "alpha" mapping of the number of edges crossing a pixel to its color"""
+        with self.instrumentation.stage("Graph.render_density") as record:
+            if record.active:
+                record.input_size = data_size(self.csr)
+            DensityRenderer.write_png("data/" + file_name, DensityRenderer.render_density(self.csr, size, tone))
+
+    def draw_on_circle(self, save_to_file, file_name) -> None:
+        """Draw the graph with vertices on a circle"""
+        # matplotlib is imported on the first drawing, reading, converting and generating graphs do not load it
+        import GraphDrawing
+        GraphDrawing.draw_on_circle(self.csr, save_to_file, file_name, self.LABELS_LIMIT)
+
+    def share(self, matrix=None):
+        """Publish the graph in shared memory for worker processes, see SharedGraph
+        :param matrix: if True, the adjacency matrix is published too; if None, only if it is cached
+        :return: SharedGraph owning the segment, its handle attaches read-only views without copying"""
+        # multiprocessing is loaded only for shared graphs
+        from SharedGraph import SharedGraph
+        return SharedGraph(self, matrix)
 
     def set_graph(self, data) -> None:
-        """Sets the adjacency matrix"""
-        graph, representation = data
-        self.adjacency_matrix = GraphConverter.convert_graph(graph, representation,
-                                                             GraphRepresentation.ADJACENCY_MATRIX)
+        """Sets the graph from a (graph, representation) pair, or from a (graph, representation, vertices number)
+        triple for an EDGE_LIST graph with isolated vertices numbered above its highest vertex"""
+        graph, representation = data[:2]
+        with self.instrumentation.stage("Graph.set_graph") as record:
+            self.csr = GraphConverter.convert_to_csr(graph, representation, *data[2:])
+            if record.active:
+                record.input_size = data_size(graph)
+                record.output_size = data_size(self.csr)
+
+    def dynamic(self) -> DynamicAdjacency:
+        """Return the adjacency sets for single updates, made from the sparse form on the first update"""
+        if self._dynamic is None:
+            self._dynamic = DynamicAdjacency() if self._csr is None else DynamicAdjacency.from_csr(self._csr)
+        return self._dynamic
+
+    def changed(self) -> None:
+        """Mark the sparse form and the cached representations as out of date after an update of the sets"""
+        self._csr = None
+        self.cache.clear()
+
+    def add_edge(self, first, second) -> bool:
+        """Add an edge between vertices numbered from 0, return False if it already exists"""
+        added = self.dynamic().add_edge(first, second)
+        if added:
+            self.changed()
+        return added
+
+    def remove_edge(self, first, second) -> bool:
+        """Remove an edge between vertices numbered from 0, return False if it does not exist"""
+        removed = self.dynamic().remove_edge(first, second)
+        if removed:
+            self.changed()
+        return removed
+
+    def add_vertex(self) -> int:
+        """Add an isolated vertex and return its number"""
+        return self.add_vertices(1)[0]
+
+    def remove_vertex(self, vertex) -> None:
+        """Remove a vertex with its edges, vertices after it are renumbered one lower"""
+        self.remove_vertices([vertex])
+
+    def batch_edges(self, edges) -> np.ndarray:
+        """Return a batch of edges as an (m x 2) array, checking that they fit in the graph"""
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if not are_edges_valid(edges, self.vertices_number):
+            raise IncorrectInputException("Edges should connect two different vertices of the graph")
+        return edges
+
+    def add_edges(self, edges) -> None:
+        """Add a batch of edges given as pairs of vertices numbered from 0, existing edges are skipped"""
+        edges = self.batch_edges(edges)
+        if self._dynamic is None:
+            self.csr = self.current_csr().with_edges(edges[:, 0], edges[:, 1])
+        else:
+            for first, second in edges.tolist():
+                self._dynamic.add_edge(first, second)
+            self.changed()
+
+    def remove_edges(self, edges) -> None:
+        """Remove a batch of edges given as pairs of vertices numbered from 0, missing edges are skipped"""
+        edges = self.batch_edges(edges)
+        if self._dynamic is None:
+            self.csr = self.current_csr().without_edges(edges[:, 0], edges[:, 1])
+        else:
+            for first, second in edges.tolist():
+                self._dynamic.remove_edge(first, second)
+            self.changed()
+
+    def add_vertices(self, count) -> range:
+        """Add isolated vertices and return their numbers"""
+        vertices = range(self.vertices_number, self.vertices_number + count)
+        if self._dynamic is None:
+            self.csr = self.current_csr().with_vertices(count)
+        else:
+            self._dynamic.add_vertices(count)
+            self.changed()
+        return vertices
+
+    def remove_vertices(self, vertices) -> None:
+        """Remove vertices numbered from 0 with their edges, the remaining vertices are renumbered in their order.
+        Renumbering touches the whole graph, so the sparse form is rebuilt at once"""
+        vertices = np.asarray(vertices, dtype=np.int64).reshape(-1)
+        if not are_indices_in_bounds(vertices, 0, self.vertices_number - 1):
+            raise IncorrectInputException("Vertex is out of graph bounds")
+        kept = np.ones(self.vertices_number, dtype=bool)
+        kept[vertices] = False
+        self.csr = GraphAlgorithms.induced_subgraph(self.current_csr(), np.flatnonzero(kept))
+
+    def degree_sequence(self) -> np.ndarray:
+        """Return degrees of all vertices in non increasing order"""
+        return GraphAlgorithms.degree_sequence(self.csr)
+
+    def bfs_distances(self, source) -> np.ndarray:
+        """Return distances from the source to all vertices, -1 for unreachable ones; vertices are numbered from 0"""
+        return GraphAlgorithms.bfs_distances(self.csr, source)
+
+    def connected_components(self) -> np.ndarray:
+        """Return the number of the connected component of every vertex, components are numbered from 0"""
+        return GraphAlgorithms.connected_components(self.csr)
+
+    def largest_component(self) -> np.ndarray:
+        """Return vertices of the largest connected component, numbered from 0"""
+        return GraphAlgorithms.largest_component(self.csr)
 
     def __str__(self) -> str:
         """Returns the adjacency matrix"""
-        return '\n'.join([' '.join([str(u) for u in row]) for row in self.adjacency_matrix])
+        return '\n'.join([' '.join(map(str, self.csr.dense_row(i).astype(int).tolist()))
+                          for i in range(self.csr.vertices_number)])
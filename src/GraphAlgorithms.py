@@ -0,0 +1,83 @@
+import numpy as np
+
+from CSRAdjacency import CSRAdjacency
+from CSRAdjacency import sorted_unique
+
+UNREACHABLE = -1
+
+
+def degree_sequence(csr) -> np.ndarray:
+    """Return degrees of all vertices in non increasing order"""
+    return np.sort(csr.degrees())[::-1]
+
+
+def frontier_neighbors(csr, frontier) -> np.ndarray:
+    """Return neighbors of all vertices of the frontier, with repetitions, gathered with one index array"""
+    starts = csr.indptr[frontier]
+    counts = csr.indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    # position of every gathered neighbor: start of its row plus its offset in the row
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return csr.indices[offsets + np.arange(total)]
+
+
+def bfs_distances(csr, source) -> np.ndarray:
+    """Return the number of edges on the shortest path from the source to every vertex, UNREACHABLE (-1) if there
+    is no path. The whole frontier is expanded at once on every level"""
+    if not 0 <= source < csr.vertices_number:
+        raise IndexError("vertex {} is out of bounds".format(source))
+    distances = np.full(csr.vertices_number, UNREACHABLE, dtype=np.int64)
+    distances[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    level = 0
+    while len(frontier):
+        level += 1
+        candidates = frontier_neighbors(csr, frontier)
+        frontier = sorted_unique(candidates[distances[candidates] == UNREACHABLE])
+        distances[frontier] = level
+    return distances
+
+
+def compress_paths(parent) -> None:
+    """Point every vertex of a union-find forest directly at its root"""
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            return
+        parent[:] = grandparent
+
+
+def connected_components(csr) -> np.ndarray:
+    """Return the component of every vertex, components are numbered from 0 in the order of their smallest vertices.
+    Union-find over all edges at once: the larger root of every edge joining two trees is hooked under the smaller
+    one, then paths are compressed, until no edge joins two trees"""
+    parent = np.arange(csr.vertices_number)
+    first, second = csr.edges()
+    while len(first):
+        roots_first, roots_second = parent[first], parent[second]
+        joining = roots_first != roots_second
+        first, second = first[joining], second[joining]
+        roots_first, roots_second = roots_first[joining], roots_second[joining]
+        np.minimum.at(parent, np.maximum(roots_first, roots_second), np.minimum(roots_first, roots_second))
+        compress_paths(parent)
+    # every root is the smallest vertex of its tree
+    is_root = parent == np.arange(csr.vertices_number)
+    return (np.cumsum(is_root) - 1)[parent]
+
+
+def largest_component(csr) -> np.ndarray:
+    """Return sorted vertices of the largest connected component, the first one if there are more"""
+    if csr.vertices_number == 0:
+        return np.zeros(0, dtype=np.int64)
+    components = connected_components(csr)
+    return np.flatnonzero(components == np.argmax(np.bincount(components)))
+
+
+def induced_subgraph(csr, vertices) -> CSRAdjacency:
+    """Return the subgraph on the given sorted vertices, renumbered from 0 in their order"""
+    new_numbers = np.full(csr.vertices_number, -1, dtype=np.int64)
+    new_numbers[vertices] = np.arange(len(vertices))
+    first, second = csr.edges()
+    first, second = new_numbers[first], new_numbers[second]
+    kept = (first >= 0) & (second >= 0)
+    return CSRAdjacency.from_edges(len(vertices), first[kept], second[kept])
@@ -0,0 +1,87 @@
+import os
+import struct
+
+import numpy as np
+
+from CSRAdjacency import CSRAdjacency
+from GraphConverter import IncorrectInputException
+from GraphRepresentation import GraphRepresentation
+from GraphValidation import are_edges_valid
+from GraphValidation import is_csr_valid
+from Instrumentation import instrumented
+
+# magic, version, stored representation, vertices number, edges number, dtype of the edge or indices array;
+# the header is padded to HEADER_SIZE bytes and followed by the int64 indptr array and the indices array
+# (ADJACENCY_LIST) or by the (m x 2) edge array (EDGE_LIST)
+HEADER = struct.Struct("<8sIIQQ8s")
+HEADER_SIZE = 64
+MAGIC = b"GRAFYBIN"
+VERSION = 1
+# types of the stored vertex numbers, as written by save_binary with the index types of the storage policy
+INDEX_DTYPES = ("|i1", "<i2", "<i4", "<i8")
+
+
+def is_binary_file(filename) -> bool:
+    """Check if the file starts with the binary format header"""
+    try:
+        with open(filename, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+@instrumented
+def save_binary(filename, csr, representation=GraphRepresentation.ADJACENCY_LIST) -> None:
+    """Save a graph as a header followed by raw arrays.
+    :param representation: EDGE_LIST stores the (m x 2) edge array, anything else stores the CSR arrays"""
+    if representation == GraphRepresentation.EDGE_LIST:
+        arrays = [np.ascontiguousarray(csr.edge_array())]
+    else:
+        representation = GraphRepresentation.ADJACENCY_LIST
+        arrays = [np.ascontiguousarray(csr.indptr), np.ascontiguousarray(csr.indices)]
+    dtype = arrays[-1].dtype.str.encode()
+    header = HEADER.pack(MAGIC, VERSION, representation.value, csr.vertices_number, csr.edges_number, dtype)
+    with open(filename, "wb") as f:
+        f.writelines([header.ljust(HEADER_SIZE, b"\0")] + [array.reshape(-1).view(np.uint8) for array in arrays])
+
+
+@instrumented
+def load_binary(filename, validate=False) -> CSRAdjacency:
+    """Load a graph saved by save_binary. Only the header is checked against the size of the file, and the CSR
+    arrays are memory-mapped and read lazily, so loading takes constant time. An edge array is not zero-copy:
+    it is checked and converted to the sparse form, which reads all of it
+    :param validate: if True, the CSR arrays are checked too, see is_csr_valid, which reads all of them"""
+    try:
+        with open(filename, "rb") as f:
+            magic, version, representation, vertices_number, edges_number, dtype = HEADER.unpack(
+                f.read(HEADER.size))
+            file_size = os.fstat(f.fileno()).st_size
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("unsupported binary format")
+        dtype = dtype.rstrip(b"\0").decode("ascii", "replace")
+        if dtype not in INDEX_DTYPES:
+            raise ValueError("unsupported type of vertex numbers " + dtype)
+        dtype = np.dtype(dtype)
+        if vertices_number > np.iinfo(dtype).max + 1:
+            raise ValueError("vertex numbers do not fit in " + dtype.name)
+        if representation == GraphRepresentation.EDGE_LIST.value:
+            payload_size = 2 * edges_number * dtype.itemsize
+        elif representation == GraphRepresentation.ADJACENCY_LIST.value:
+            payload_size = 8 * (vertices_number + 1) + 2 * edges_number * dtype.itemsize
+        else:
+            raise ValueError("unsupported stored representation")
+        if file_size != HEADER_SIZE + payload_size:
+            raise ValueError("file size does not match the header, the file is truncated or corrupted")
+        if representation == GraphRepresentation.EDGE_LIST.value:
+            edges = np.memmap(filename, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(edges_number, 2))
+            if not are_edges_valid(edges, vertices_number):
+                raise ValueError("edge array contains loops or vertices out of bounds")
+            return CSRAdjacency.from_edges(vertices_number, edges[:, 0], edges[:, 1])
+        indptr = np.memmap(filename, dtype=np.int64, mode="r", offset=HEADER_SIZE, shape=(vertices_number + 1,))
+        indices = np.memmap(filename, dtype=dtype, mode="r", offset=HEADER_SIZE + indptr.nbytes,
+                            shape=(2 * edges_number,))
+        if validate and not is_csr_valid(indptr, indices, vertices_number):
+            raise ValueError("CSR arrays do not hold a valid graph")
+        return CSRAdjacency.from_arrays(indptr, indices)
+    except (OSError, ValueError, struct.error) as e:
+        raise IncorrectInputException("an error occurred while reading the file:\n" + str(e))
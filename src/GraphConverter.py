@@ -2,7 +2,22 @@ from typing import Union
 
 import numpy as np
 
+from CSRAdjacency import CSRAdjacency
+from CSRAdjacency import sorted_unique
 from GraphRepresentation import GraphRepresentation
+from GraphValidation import are_entries_off_diagonal
+from GraphValidation import are_entries_symmetrical
+from GraphValidation import are_indices_in_bounds
+from GraphValidation import are_sorted_entries_symmetrical
+from GraphValidation import has_zeros_on_diagonal
+from GraphValidation import is_square
+from GraphValidation import is_symmetrical
+from Instrumentation import instrumented
+from PackedAdjacencyMatrix import PackedAdjacencyMatrix
+from SparseIncidenceMatrix import SparseIncidenceMatrix
+from StoragePolicy import get_policy
+from StoragePolicy import index_dtype
+from StoragePolicy import matrix_dtype
 
 
 class IncorrectInputException(Exception):
@@ -15,152 +30,245 @@ class IncorrectInputException(Exception):
         return "Incorrect input - " + self.message
 
 
-def is_square(matrix) -> bool:
-    """Check if a matrix is square"""
-    if matrix.ndim == 0:
-        return True
-    elif matrix.ndim == 2:
-        return matrix.shape[0] == matrix.shape[1]
-    return False
-
-
-def is_symmetrical(matrix) -> bool:
-    """Check if the matrix is symmetrical"""
-    transpose_matrix = matrix.transpose()
-    comparision = transpose_matrix == matrix
-    return comparision.all()
-
-
-def has_zeros_on_diagonal(matrix) -> bool:
-    """Check if the matrix has zeros on diagonal"""
-    if matrix.ndim == 0:
-        if matrix == 0:
-            return True
-        return False
-    elif matrix.ndim == 2:
-        for i, row in enumerate(matrix):
-            if row[i] != 0:
-                return False
-        return True
-    return False
-
-
-def convert_graph(graph, input_representation, output_representation) -> Union[np.ndarray, list]:
-    """Convert a graph from and to the given representations"""
+@instrumented
+def convert_graph(graph, input_representation, output_representation,
+                  vertices_number=None) -> Union[np.ndarray, list]:
+    """Convert a graph from and to the given representations through its edge list
+    :param vertices_number: number of vertices of an EDGE_LIST graph, the highest vertex number if None"""
+    if input_representation == output_representation:
+        return graph
+    converted = convert_to_edges(graph, input_representation, vertices_number)
+    if converted is None:
+        return None
+    vertices_number, edges = converted
+    return convert_from_edges(vertices_number, edges, output_representation)
+
+
+@instrumented
+def convert_to_edges(graph, input_representation, vertices_number=None) -> (int, np.ndarray):
+    """Convert a graph to its vertex count and an (m x 2) array of zero-based edges (first < second),
+    sorted by first and then by second vertex
+    :param vertices_number: number of vertices of an EDGE_LIST graph, the highest vertex number if None"""
     if input_representation == GraphRepresentation.ADJACENCY_MATRIX:
-        return convert_from_adjacency_matrix(graph, output_representation)
+        return adjacency_matrix_to_edges(graph)
     elif input_representation == GraphRepresentation.ADJACENCY_LIST:
-        return convert_from_adjacency_list(graph, output_representation)
+        return adjacency_list_to_edges(graph)
     elif input_representation == GraphRepresentation.INCIDENCE_MATRIX:
-        return convert_from_incidence_matrix(graph, output_representation)
+        return incidence_matrix_to_edges(graph)
+    elif input_representation == GraphRepresentation.EDGE_LIST:
+        return edge_list_to_edges(graph, vertices_number)
 
 
-def convert_from_adjacency_matrix(graph, output_representation) -> Union[np.ndarray, list]:
-    """Convert an adjacency matrix to the given representation"""
+@instrumented
+def convert_from_edges(vertices_number, edges, output_representation,
+                       sparse=False) -> Union[np.ndarray, list, SparseIncidenceMatrix]:
+    """Convert a vertex count and sorted zero-based edges to the given representation.
+    :param sparse: if True, an incidence matrix is returned as a SparseIncidenceMatrix"""
     if output_representation == GraphRepresentation.ADJACENCY_MATRIX:
-        return graph
+        return edges_to_adjacency_matrix(vertices_number, edges)
     elif output_representation == GraphRepresentation.ADJACENCY_LIST:
-        return convert_adj_mat_to_adj_list(graph)
+        return edges_to_adjacency_list(vertices_number, edges)
     elif output_representation == GraphRepresentation.INCIDENCE_MATRIX:
-        return convert_adj_mat_to_inc_mat(graph)
+        if sparse:
+            return edges_to_sparse_incidence_matrix(vertices_number, edges)
+        return edges_to_incidence_matrix(vertices_number, edges)
+    elif output_representation == GraphRepresentation.EDGE_LIST:
+        return edges_to_edge_list(edges)
+
+
+def unique_edges(vertices_number, first, second) -> np.ndarray:
+    """Return sorted (m x 2) edges with merged duplicates from endpoint arrays of undirected edges"""
+    low = np.minimum(first, second).astype(np.int64)
+    high = np.maximum(first, second).astype(np.int64)
+    keys = sorted_unique(low * vertices_number + high)
+    edges = np.empty((len(keys), 2), dtype=index_dtype(vertices_number))
+    edges[:, 0], edges[:, 1] = np.divmod(keys, vertices_number)
+    return edges
+
+
+def adjacency_list_entries(adjacency_list) -> (np.ndarray, np.ndarray):
+    """Return row and item of every item of an adjacency list"""
+    vertices_number = len(adjacency_list)
+    try:
+        lengths = np.fromiter((len(row) for row in adjacency_list), dtype=np.int64, count=vertices_number)
+        items = np.fromiter((item for row in adjacency_list for item in row), dtype=np.int64, count=lengths.sum())
+    except (TypeError, ValueError):
+        raise IncorrectInputException("Index of list is out of matrix bounds")
+    return np.repeat(np.arange(vertices_number), lengths), items
 
 
-def convert_from_adjacency_list(adjacency_list, output_representation) -> Union[np.ndarray, list]:
-    """Convert an adjacency list to the given representation"""
-    if output_representation == GraphRepresentation.ADJACENCY_MATRIX:
-        return convert_adj_list_to_adj_mat(adjacency_list)
-    elif output_representation == GraphRepresentation.ADJACENCY_LIST:
-        return adjacency_list
-    elif output_representation == GraphRepresentation.INCIDENCE_MATRIX:
-        return convert_adj_list_to_inc_mat(adjacency_list)
+def incidence_matrix_endpoints(incidence_matrix) -> (np.ndarray, np.ndarray):
+    """Return both endpoints of every column of an incidence matrix"""
+    ones = np.asarray(incidence_matrix) == 1
+    if np.any(ones.sum(axis=0) != 2):
+        raise IncorrectInputException("The edge should connect two different vertices")
+    _, vertices = np.nonzero(ones.transpose())
+    return vertices[0::2], vertices[1::2]
 
 
-def convert_from_incidence_matrix(graph, output_representation) -> Union[np.ndarray, list]:
-    """Convert an incidence matrix to the given representation"""
-    if output_representation == GraphRepresentation.ADJACENCY_MATRIX:
-        return convert_inc_mat_to_adj_mat(graph)
-    elif output_representation == GraphRepresentation.ADJACENCY_LIST:
-        return convert_inc_mat_to_adj_list(graph)
-    elif output_representation == GraphRepresentation.INCIDENCE_MATRIX:
-        return graph
+def adjacency_matrix_to_edges(graph) -> (int, np.ndarray):
+    """Convert a dense or packed adjacency matrix to edges, only cells equal to 1 are edges"""
+    if isinstance(graph, PackedAdjacencyMatrix):
+        vertices_number = graph.vertices_number
+        first, second = graph.nonzero(upper=True)
+    else:
+        graph = np.atleast_2d(graph)
+        vertices_number = len(graph)
+        first, second = np.nonzero(np.triu(graph == 1, 1))
+    edges = np.empty((len(first), 2), dtype=index_dtype(vertices_number))
+    edges[:, 0], edges[:, 1] = first, second
+    return vertices_number, edges
 
 
-def convert_adj_list_to_adj_mat(adjacency_list) -> np.ndarray:
-    """Convert an adjacency list to an adjacency matrix"""
-    matrix_size = len(adjacency_list)
-    matrix = np.zeros((matrix_size, matrix_size), dtype=int)
-    try:
-        for i, row in enumerate(adjacency_list):
-            for item in row:
-                matrix[i][item - 1] = 1
+def adjacency_list_to_edges(adjacency_list) -> (int, np.ndarray):
+    """Convert an adjacency list to edges"""
+    rows, items = adjacency_list_entries(adjacency_list)
+    return adjacency_entries_to_edges(len(adjacency_list), rows, items)
 
-    except Exception:
+
+def adjacency_entries_to_edges(vertices_number, rows, items) -> (int, np.ndarray):
+    """Convert rows and items (vertices numbered from 1) of an adjacency list to edges"""
+    return vertices_number, adjacency_entries_to_csr(vertices_number, rows, items).edge_array()
+
+
+def adjacency_entries_to_csr(vertices_number, rows, items) -> CSRAdjacency:
+    """Convert rows and items (vertices numbered from 1) of an adjacency list to the sparse form. The cells are
+    sorted once, the sorted cells are both checked for symmetry and the rows of the sparse form"""
+    cols = items - 1
+    if not are_indices_in_bounds(cols, -vertices_number, vertices_number - 1):
         raise IncorrectInputException("Index of list is out of matrix bounds")
-    if not is_symmetrical(matrix):
+    cols %= max(vertices_number, 1)
+    keys = rows.astype(np.int64)
+    keys *= vertices_number
+    keys += cols
+    del rows, cols
+    keys = sorted_unique(keys, in_place=True)
+    rows, cols = np.divmod(keys, max(vertices_number, 1))
+    if not are_sorted_entries_symmetrical(vertices_number, keys, rows, cols):
         raise IncorrectInputException("Matrix built from adjacency list is not symmetrical")
-    if not has_zeros_on_diagonal(matrix):
+    del keys
+    if not are_entries_off_diagonal(rows, cols):
         raise IncorrectInputException("Matrix built from adjacency list has non zero value on diagonal")
+    return CSRAdjacency.from_entries(vertices_number, rows, cols)
+
+
+def incidence_matrix_to_edges(incidence_matrix) -> (int, np.ndarray):
+    """Convert a dense or sparse incidence matrix to edges"""
+    if isinstance(incidence_matrix, SparseIncidenceMatrix):
+        vertices_number = incidence_matrix.vertices_number
+        return vertices_number, unique_edges(vertices_number, incidence_matrix.first, incidence_matrix.second)
+    first, second = incidence_matrix_endpoints(incidence_matrix)
+    return len(incidence_matrix), unique_edges(len(incidence_matrix), first, second)
+
+
+def edge_list_to_edges(edge_list, vertices_number=None) -> (int, np.ndarray):
+    """Convert an edge list with vertices numbered from 1 to edges
+    :param vertices_number: number of vertices, the highest vertex number if None, so that isolated vertices
+                            numbered above it are lost"""
+    edge_list = np.asarray(edge_list)
+    if vertices_number is not None and vertices_number < 0:
+        raise IncorrectInputException("Number of vertices of edge list is negative")
+    if edge_list.size == 0:
+        vertices_number = vertices_number or 0
+        return vertices_number, np.empty((0, 2), dtype=index_dtype(vertices_number))
+    if edge_list.ndim == 1 and edge_list.size == 2:
+        edge_list = edge_list.reshape(1, 2)
+    if edge_list.ndim != 2 or edge_list.shape[1] != 2:
+        raise IncorrectInputException("Every edge of edge list should have two vertices")
+    if vertices_number is None:
+        vertices_number = int(edge_list.max())
+    if not are_indices_in_bounds(edge_list.reshape(-1), 1, vertices_number):
+        raise IncorrectInputException("Index of edge list is out of matrix bounds")
+    if not are_entries_off_diagonal(edge_list[:, 0], edge_list[:, 1]):
+        raise IncorrectInputException("Matrix built from edge list has non zero value on diagonal")
+    return vertices_number, unique_edges(vertices_number, edge_list[:, 0] - 1, edge_list[:, 1] - 1)
+
+
+def edges_to_adjacency_matrix(vertices_number, edges) -> Union[np.ndarray, PackedAdjacencyMatrix]:
+    """Convert edges to an adjacency matrix, packed if the storage policy says so"""
+    if get_policy().packed_adjacency:
+        return PackedAdjacencyMatrix.from_edges(vertices_number, edges[:, 0], edges[:, 1])
+    matrix = np.zeros((vertices_number, vertices_number), dtype=matrix_dtype())
+    matrix[edges[:, 0], edges[:, 1]] = 1
+    matrix[edges[:, 1], edges[:, 0]] = 1
     return matrix
 
 
+def edges_to_adjacency_list(vertices_number, edges) -> list:
+    """Convert edges to an adjacency list"""
+    return CSRAdjacency.from_edges(vertices_number, edges[:, 0], edges[:, 1]).to_adjacency_list()
+
+
+def edges_to_sparse_incidence_matrix(vertices_number, edges) -> SparseIncidenceMatrix:
+    """Convert edges to a sparse incidence matrix, columns are ordered by the higher and then by the lower vertex"""
+    order = np.lexsort((edges[:, 0], edges[:, 1]))
+    return SparseIncidenceMatrix(vertices_number, edges[order, 0], edges[order, 1])
+
+
+def edges_to_incidence_matrix(vertices_number, edges) -> np.ndarray:
+    """Convert edges to an incidence matrix, columns are ordered by the higher and then by the lower vertex"""
+    return edges_to_sparse_incidence_matrix(vertices_number, edges).to_dense()
+
+
+def edges_to_edge_list(edges) -> np.ndarray:
+    """Convert edges to an edge list with vertices numbered from 1"""
+    return edges + 1
+
+
+def convert_adj_list_to_adj_mat(adjacency_list) -> np.ndarray:
+    """Convert an adjacency list to an adjacency matrix"""
+    return convert_graph(adjacency_list, GraphRepresentation.ADJACENCY_LIST, GraphRepresentation.ADJACENCY_MATRIX)
+
+
 def convert_inc_mat_to_adj_mat(incidence_matrix) -> np.ndarray:
     """Convert an incidence matrix to an adjacency matrix"""
-    matrix_size = len(incidence_matrix)
-    matrix = np.zeros((matrix_size, matrix_size), dtype=int)
-    for column in incidence_matrix.transpose():
-        edge = []
-        for i, item in enumerate(column):
-            if item == 1:
-                edge.append(i)
-        if len(edge) != 2:
-            raise IncorrectInputException("The edge should connect two different vertices")
-        matrix[edge[0]][edge[1]] = 1
-        matrix[edge[1]][edge[0]] = 1
-    if not is_symmetrical(matrix):
-        raise IncorrectInputException("Matrix built from incidence matrix is not symmetrical")
-    if not has_zeros_on_diagonal(matrix):
-        raise IncorrectInputException("Matrix built from incidence matrix has non zero value on diagonal")
-    return matrix
+    return convert_graph(incidence_matrix, GraphRepresentation.INCIDENCE_MATRIX,
+                         GraphRepresentation.ADJACENCY_MATRIX)
 
 
 def convert_adj_mat_to_adj_list(graph) -> list:
     """Convert an adjacency matrix to an adjacency list"""
-    adjacency_list = []
-    for row in graph:
-        neighbors = []
-        for i, item in enumerate(row):
-            if item == 1:
-                neighbors.append(i + 1)
-        adjacency_list.append(neighbors)
-    return adjacency_list
+    return convert_graph(graph, GraphRepresentation.ADJACENCY_MATRIX, GraphRepresentation.ADJACENCY_LIST)
 
 
 def convert_adj_mat_to_inc_mat(graph) -> np.ndarray:
     """Convert an adjacency matrix to an incidence matrix"""
-    incidence_matrix = []
-    row_length = graph[0].size
-    for i, row in enumerate(graph):
-        for j in range(i):
-            if row[j] == 1:
-                edge = np.zeros(row_length, dtype=int)
-                edge[i] = 1
-                edge[j] = 1
-                incidence_matrix.append(edge)
-    incidence_matrix = np.array(incidence_matrix).transpose()
-    return incidence_matrix
+    return convert_graph(graph, GraphRepresentation.ADJACENCY_MATRIX, GraphRepresentation.INCIDENCE_MATRIX)
 
 
 def convert_adj_list_to_inc_mat(adjacency_list) -> np.ndarray:
     """Convert an adjacency list to an incidence matrix"""
-
-    adjacency_list = convert_adj_list_to_adj_mat(adjacency_list)
-
-    return convert_adj_mat_to_inc_mat(adjacency_list)
+    return convert_graph(adjacency_list, GraphRepresentation.ADJACENCY_LIST, GraphRepresentation.INCIDENCE_MATRIX)
 
 
 def convert_inc_mat_to_adj_list(graph) -> list:
     """Convert an incidence matrix to an adjacency list"""
+    return convert_graph(graph, GraphRepresentation.INCIDENCE_MATRIX, GraphRepresentation.ADJACENCY_LIST)
 
-    graph = convert_inc_mat_to_adj_mat(graph)
 
-    return convert_adj_mat_to_adj_list(graph)
+@instrumented
+def convert_to_csr(graph, input_representation, vertices_number=None) -> CSRAdjacency:
+    """Convert a graph from the given representation to the sparse internal form
+    :param vertices_number: number of vertices of an EDGE_LIST graph, the highest vertex number if None"""
+    if isinstance(graph, PackedAdjacencyMatrix):
+        return CSRAdjacency.from_entries(graph.vertices_number, *graph.nonzero())
+    if input_representation == GraphRepresentation.ADJACENCY_MATRIX:
+        return CSRAdjacency.from_dense(graph)
+    converted = convert_to_edges(graph, input_representation, vertices_number)
+    if converted is None:
+        return None
+    vertices_number, edges = converted
+    return CSRAdjacency.from_edges(vertices_number, edges[:, 0], edges[:, 1])
+
+
+@instrumented
+def convert_from_csr(csr, output_representation,
+                     sparse=False) -> Union[np.ndarray, list, SparseIncidenceMatrix, PackedAdjacencyMatrix]:
+    """Convert a graph from the sparse internal form to the given representation.
+    Adjacency matrices are packed if the storage policy says so
+    :param sparse: if True, an incidence matrix is returned as a SparseIncidenceMatrix"""
+    if output_representation == GraphRepresentation.ADJACENCY_MATRIX and not get_policy().packed_adjacency:
+        return csr.to_dense()
+    elif output_representation == GraphRepresentation.ADJACENCY_LIST:
+        return csr.to_adjacency_list()
+    return convert_from_edges(csr.vertices_number, csr.edge_array(), output_representation, sparse)
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import EllipseCollection
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from CSRAdjacency import CSRAdjacency
+
+
+def has_display() -> bool:
+    """Check if a window can be shown, on Linux and other Unix systems it needs an X11 or Wayland display"""
+    if sys.platform in ("win32", "darwin"):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def pyplot():
+    """Import pyplot on first use. Without a display the headless Agg backend is chosen, unless MPLBACKEND
+    says otherwise, instead of pyplot trying the GUI backends one by one"""
+    if "matplotlib.pyplot" not in sys.modules and "MPLBACKEND" not in os.environ and not has_display():
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def draw_on_circle(csr: CSRAdjacency, save_to_file, file_name, labels_limit) -> None:
+    """Draw the graph with vertices on a circle. Return visualization or save to file.
+    :param save_to_file: if True, the graph will be saved to file_name file in the data folder
+    :param labels_limit: vertices are numbered if there are at most this many of them"""
+    nodes_number = csr.vertices_number
+    angles = 2 * np.pi / nodes_number * np.arange(nodes_number)
+    # estimate graph radius
+    graph_radius = nodes_number * 1.5
+    nodes = np.column_stack((np.cos(angles), np.sin(angles))) * graph_radius / 15 + 0.5
+
+    if save_to_file:
+        # render off-screen with Agg, without pyplot and its GUI backend
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot(111)
+    else:
+        plt = pyplot()
+        plt.close()
+        figure, axes = plt.subplots()
+    axes.set_aspect(1)
+    figure.set_size_inches(8, 8)
+
+    first, second = csr.edges()
+    axes.add_collection(LineCollection(np.stack((nodes[first], nodes[second]), axis=1), colors='r',
+                                       linewidths=2, zorder=1))
+
+    border_radius = 0.07 * nodes_number / 10
+    for radius, color, zorder in ((border_radius, 'black', 2), (0.06 * nodes_number / 10, 'green', 3)):
+        # transOffset is the keyword of matplotlib 3.3 and an alias of offset_transform in later versions
+        axes.add_collection(EllipseCollection(2 * radius, 2 * radius, 0, units='xy', offsets=nodes,
+                                              transOffset=axes.transData, facecolors=color,
+                                              edgecolors=color, zorder=zorder))
+    axes.update_datalim([nodes.min(axis=0) - border_radius, nodes.max(axis=0) + border_radius])
+    axes.autoscale_view()
+
+    if nodes_number <= labels_limit:
+        if nodes_number <= 20:
+            font_size = 16
+        else:
+            font_size = 20
+        for i, (x, y) in enumerate(nodes, 1):
+            axes.annotate(i, xy=(x, y), fontsize=font_size, color='white',
+                          verticalalignment='center', horizontalalignment='center')
+
+    axes.axis("off")
+    axes.set_aspect('equal')
+
+    if save_to_file:
+        matplotlib.rcParams['savefig.format'] = 'png'
+        figure.savefig("data/" + file_name)
+    else:
+        plt.show()
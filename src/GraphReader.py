@@ -1,69 +1,163 @@
-import warnings
-
 import numpy as np
 
 import GraphConverter
+from CSRAdjacency import CSRAdjacency
 from GraphConverter import IncorrectInputException
-from GraphConverter import has_zeros_on_diagonal
-from GraphConverter import is_symmetrical
-from GraphConverter import is_square
+from GraphBinaryFormat import is_binary_file
+from GraphBinaryFormat import load_binary
 from GraphRepresentation import GraphRepresentation
+from GraphValidation import are_entries_off_diagonal
+from GraphValidation import are_entries_symmetrical
+from GraphValidation import is_binary
+from Instrumentation import instrumented
+from ParseCache import ParseCache
+from SparseIncidenceMatrix import SparseIncidenceMatrix
+from StoragePolicy import index_dtype
+from TextChunkParser import DEFAULT_CHUNK_SIZE
+from TextChunkParser import parse_integers
+from TextChunkParser import read_chunks
 
 
 class GraphReader:
-    def __init__(self):
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, cache: ParseCache = None, validate_binary=False):
+        """:param cache: persistent cache of parsed files, files are always parsed if it is None
+        :param validate_binary: if True, the arrays of binary files are validated, which reads all of them"""
         self.filename = None
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.validate_binary = validate_binary
+
+    def read_data(self, representation, filename, use_cache=True) -> np.ndarray:
+        """Read a graph from a file using given representation and return its adjacency matrix"""
+        csr = self.read_csr(representation, filename, use_cache)
+        if csr is None:
+            return None
+        return csr.to_dense()
 
-    def read_data(self, representation, filename) -> np.ndarray:
-        """Read a graph from a file using given representation"""
+    @instrumented
+    def read_csr(self, representation, filename, use_cache=True) -> CSRAdjacency:
+        """Read a graph from a file using given representation and return its sparse form.
+        Files in the binary format are memory-mapped whatever the representation is
+        :param use_cache: if False, the file is parsed even if it is in the cache, and the cache is not updated"""
         self.filename = "data/" + filename
+        if is_binary_file(self.filename):
+            return load_binary(self.filename, self.validate_binary)
+        if self.cache is None or not use_cache:
+            return self.parse_csr(representation)
+        try:
+            csr = self.cache.load(self.filename, representation)
+        except OSError as e:
+            raise IncorrectInputException("an error occurred while reading the file:\n" + str(e))
+        if csr is None:
+            csr = self.parse_csr(representation)
+            if csr is not None:
+                self.cache.store(self.filename, representation, csr)
+        return csr
+
+    @instrumented
+    def parse_csr(self, representation) -> CSRAdjacency:
+        """Parse and validate the text file using given representation"""
         if representation == GraphRepresentation.ADJACENCY_MATRIX:
             return self.read_adjacency_matrix()
         if representation == GraphRepresentation.ADJACENCY_LIST:
             return self.read_adjacency_list()
         if representation == GraphRepresentation.INCIDENCE_MATRIX:
             return self.read_incidence_matrix()
+        if representation == GraphRepresentation.EDGE_LIST:
+            return self.read_edge_list()
 
-    def read_from_file(self) -> np.ndarray:
-        """Read a matrix from a file"""
-        warnings.filterwarnings("error")
+    def read_tokens(self):
+        """Yield integers of consecutive chunks of the file with the global line of every integer
+        and the number of lines in the chunk"""
+        first_line = 0
         try:
-            matrix = np.loadtxt(self.filename, dtype=int)
-        except Exception as e:
+            chunks = read_chunks(self.filename, self.chunk_size)
+            for chunk in chunks:
+                values, lines, lines_number = parse_integers(chunk)
+                yield values, lines + first_line, lines_number
+                first_line += lines_number
+        except OSError as e:
             raise IncorrectInputException("an error occurred while reading the file:\n" + str(e))
-        return matrix
 
-    def read_adjacency_matrix(self) -> np.ndarray:
+    def read_matrix(self, keep_zeros=False) -> (int, int, np.ndarray, np.ndarray, np.ndarray):
+        """Read a matrix chunk by chunk, empty lines are skipped.
+        :return: number of rows and columns with rows, columns and values of the non zero cells
+                 (or of all cells if keep_zeros is True)"""
+        rows_number = 0
+        columns_number = None
+        rows, cols, values = [], [], []
+        for chunk_values, lines, _ in self.read_tokens():
+            _, counts = np.unique(lines, return_counts=True)
+            if columns_number is None and len(counts):
+                columns_number = int(counts[0])
+            if np.any(counts != columns_number):
+                raise IncorrectInputException("an error occurred while reading the file:\n"
+                                              "rows have different numbers of values")
+            positions = np.arange(len(chunk_values)) if keep_zeros else np.flatnonzero(chunk_values)
+            chunk_rows, chunk_cols = np.divmod(positions, columns_number or 1)
+            rows.append(chunk_rows + rows_number)
+            cols.append(chunk_cols)
+            values.append(chunk_values[positions])
+            rows_number += len(counts)
+        if columns_number is None:
+            raise IncorrectInputException("an error occurred while reading the file:\nfile is empty")
+        return rows_number, columns_number, np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
+
+    def read_adjacency_matrix(self) -> CSRAdjacency:
         """Read an adjacency matrix from a file"""
-        matrix = self.read_from_file()
-        if not is_square(matrix):
+        rows_number, columns_number, rows, cols, values = self.read_matrix()
+        if rows_number != columns_number:
             raise IncorrectInputException("Adjacency matrix built from input is not square")
-        if not is_symmetrical(matrix):
+        if not is_binary(values):
+            raise IncorrectInputException("Adjacency matrix built from input has values other than 0 and 1")
+        if not are_entries_symmetrical(rows_number, rows, cols):
             raise IncorrectInputException("Adjacency matrix built from input is not symmetrical")
-        if not has_zeros_on_diagonal(matrix):
+        if not are_entries_off_diagonal(rows, cols):
             raise IncorrectInputException("Adjacency matrix built from input has non zero value on diagonal")
-        return matrix
+        edges = rows < cols
+        return CSRAdjacency.from_edges(rows_number, rows[edges], cols[edges])
 
-    def read_incidence_matrix(self) -> np.ndarray:
+    def read_incidence_matrix(self) -> CSRAdjacency:
         """Read an incidence matrix from a file"""
-        incidence_matrix = self.read_from_file()
-        matrix = GraphConverter.convert_graph(incidence_matrix, GraphRepresentation.INCIDENCE_MATRIX,
-                                              GraphRepresentation.ADJACENCY_MATRIX)
-        return matrix
+        rows_number, columns_number, rows, cols, values = self.read_matrix()
+        if not is_binary(values):
+            raise IncorrectInputException("Incidence matrix built from input has values other than 0 and 1")
+        if np.any(np.bincount(cols, minlength=columns_number) != 2):
+            raise IncorrectInputException("The edge should connect two different vertices")
+        endpoints = rows[np.argsort(cols, kind="stable")]
+        incidence_matrix = SparseIncidenceMatrix(rows_number, endpoints[0::2], endpoints[1::2])
+        return GraphConverter.convert_to_csr(incidence_matrix, GraphRepresentation.INCIDENCE_MATRIX)
 
-    def read_adjacency_list(self) -> np.ndarray:
-        """Read an adjacency list from a file"""
-        adjacency_list = []
-        try:
-            with open(self.filename) as f:
-                for line in f:
-                    row = [int(item.strip()) for item in line.split(" ") if line.strip()]
-                    adjacency_list.append(row)
-            if len(adjacency_list) == 0:
-                raise Exception("file is empty")
-        except Exception as e:
-            raise IncorrectInputException("an error occurred while reading the file:\n" + str(e))
-        matrix = GraphConverter.convert_graph(adjacency_list, GraphRepresentation.ADJACENCY_LIST,
-                                              GraphRepresentation.ADJACENCY_MATRIX)
-        return matrix
+    def read_edge_list(self) -> CSRAdjacency:
+        """Read an edge list from a file: an optional first line with the number of vertices, then one pair of
+        vertices numbered from 1 per line. Without the first line the highest vertex number is the vertex count"""
+        values, lines = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+        for chunk_values, chunk_lines, _ in self.read_tokens():
+            values.append(chunk_values)
+            lines.append(chunk_lines)
+        values, lines = np.concatenate(values), np.concatenate(lines)
+        if len(values) == 0:
+            raise IncorrectInputException("an error occurred while reading the file:\nfile is empty")
+        vertices_number = None
+        if len(values) == 1 or lines[1] != lines[0]:
+            vertices_number = int(values[0])
+            values, lines = values[1:], lines[1:]
+        # values come in pairs, both values of a pair on one line and every pair on its own line
+        if len(values) % 2 or np.any(lines[0::2] != lines[1::2]) or np.any(lines[2::2] == lines[1:-1:2]):
+            raise IncorrectInputException("Every edge of edge list should have two vertices")
+        return GraphConverter.convert_to_csr(values.reshape(-1, 2), GraphRepresentation.EDGE_LIST, vertices_number)
 
+    def read_adjacency_list(self) -> CSRAdjacency:
+        """Read an adjacency list from a file, line i holds the neighbors of vertex i"""
+        vertices_number = 0
+        rows, items = [], []
+        for values, lines, lines_number in self.read_tokens():
+            vertices_number += lines_number
+            # kept in the smallest types holding them until all chunks are read
+            rows.append(lines.astype(index_dtype(vertices_number)))
+            items.append(values.astype(index_dtype(np.abs(values).max(initial=0))))
+            del values, lines
+        if vertices_number == 0:
+            raise IncorrectInputException("an error occurred while reading the file:\nfile is empty")
+        rows, items = np.concatenate(rows), np.concatenate(items)
+        return GraphConverter.adjacency_entries_to_csr(vertices_number, rows, items)
@@ -5,3 +5,4 @@ class GraphRepresentation(Enum):
     ADJACENCY_MATRIX = 1
     ADJACENCY_LIST = 2
     INCIDENCE_MATRIX = 3
+    EDGE_LIST = 4
@@ -0,0 +1,364 @@
+"""Long-running local service keeping named graphs in memory.
+
+Clients connect to a Unix socket or to a TCP port on localhost and send requests as lines of JSON, e.g.
+{"id": 1, "command": "load", "name": "g", "file": "graph.txt", "representation": "adjacency-list"}.
+Every request gets one JSON line back, with the same id, "ok" and either "result" or "error". Requests of one
+connection run concurrently and their responses come back in completion order."""
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import CommandLine
+from CommandLine import DATA_FOLDER
+from CommandLine import DEFAULT_MEMORY_CAP
+from CommandLine import REPRESENTATIONS
+from DensityRenderer import DEFAULT_IMAGE_SIZE
+from Graph import Graph
+from GraphRepresentation import GraphRepresentation
+from RandomGraphGenerator import random_graph_edges
+from RandomGraphGenerator import random_graph_probability
+
+# number of the latest requests of every command kept for the latency percentiles
+LATENCY_WINDOW = 1000
+# the longest request line in bytes
+REQUEST_LIMIT = 1 << 20
+
+
+class GraphEntry:
+    """A graph of the registry with the lock serializing the requests using it"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+    @property
+    def idle(self) -> bool:
+        return self.users == 0
+
+
+class GraphRegistry:
+    """Named graphs kept in memory. When they take more than the memory cap, idle graphs are evicted,
+    least recently used first"""
+
+    def __init__(self, memory_cap=DEFAULT_MEMORY_CAP):
+        self.memory_cap = memory_cap
+        self.entries = OrderedDict()
+        self.evicted = 0
+
+    def put(self, name, graph) -> None:
+        """Register the graph under the name, replacing the previous one"""
+        self.entries[name] = GraphEntry(graph)
+        self.entries.move_to_end(name)
+
+    def remove(self, name) -> None:
+        self.entry(name)
+        del self.entries[name]
+
+    def entry(self, name) -> GraphEntry:
+        try:
+            return self.entries[name]
+        except KeyError:
+            raise ValueError("unknown graph " + str(name))
+
+    @contextlib.asynccontextmanager
+    async def using(self, name):
+        """Lock the named graph for one request and mark it as recently used"""
+        entry = self.entry(name)
+        entry.users += 1
+        try:
+            async with entry.lock:
+                yield entry.graph
+        finally:
+            entry.users -= 1
+            if self.entries.get(name) is entry:
+                self.entries.move_to_end(name)
+
+    def memory(self) -> int:
+        return sum(entry.graph.memory_size() for entry in self.entries.values())
+
+    def evict(self) -> list:
+        """Evict idle graphs until the rest fits in the memory cap, the most recently used graph is kept.
+        :return: names of the evicted graphs"""
+        evicted = []
+        memory = self.memory()
+        for name in list(self.entries)[:-1]:
+            if memory <= self.memory_cap:
+                break
+            entry = self.entries[name]
+            if entry.idle:
+                memory -= entry.graph.memory_size()
+                del self.entries[name]
+                evicted.append(name)
+        self.evicted += len(evicted)
+        return evicted
+
+    def describe(self) -> dict:
+        return {name: {"vertices": entry.graph.vertices_number, "edges": entry.graph.csr.edges_number,
+                       "bytes": entry.graph.memory_size(), "busy": not entry.idle}
+                for name, entry in self.entries.items()}
+
+
+class LatencyMetrics:
+    """Latencies of the requests of every command, percentiles are computed over the last LATENCY_WINDOW of them"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.commands = {}
+
+    def add(self, command, seconds, failed=False) -> None:
+        metrics = self.commands.setdefault(command, {"count": 0, "errors": 0, "seconds": 0.0, "max": 0.0,
+                                                     "latest": deque(maxlen=self.window)})
+        metrics["count"] += 1
+        metrics["errors"] += failed
+        metrics["seconds"] += seconds
+        metrics["max"] = max(metrics["max"], seconds)
+        metrics["latest"].append(seconds)
+
+    def summary(self) -> dict:
+        """Return the number of requests and errors and the mean, median, 95th and 99th percentile and highest
+        latency in seconds of every command"""
+        summary = {}
+        for command, metrics in self.commands.items():
+            p50, p95, p99 = np.percentile(metrics["latest"], [50, 95, 99])
+            summary[command] = {"count": metrics["count"], "errors": metrics["errors"],
+                                "mean": metrics["seconds"] / metrics["count"], "p50": p50, "p95": p95, "p99": p99,
+                                "max": metrics["max"]}
+        return summary
+
+
+def field(request, name):
+    try:
+        return request[name]
+    except KeyError:
+        raise ValueError("missing field " + name)
+
+
+def representation_of(request) -> GraphRepresentation:
+    name = field(request, "representation")
+    if name not in REPRESENTATIONS:
+        raise ValueError("unknown representation " + str(name) + ", choose from: " + ", ".join(REPRESENTATIONS))
+    return REPRESENTATIONS[name]
+
+
+def data_file(request, name) -> str:
+    """File name of the request relative to the data folder, names resolving outside of it are rejected"""
+    filename = field(request, name)
+    folder = os.path.realpath(DATA_FOLDER)
+    # resolved as the graph opens it, with links followed
+    if os.path.commonpath((folder, os.path.realpath(DATA_FOLDER + str(filename)))) != folder:
+        raise ValueError(name + " should be inside the data folder: " + str(filename))
+    return filename
+
+
+def output_of(request) -> str:
+    """Output file name relative to the data folder, its folder is created if needed"""
+    output = data_file(request, "output")
+    os.makedirs(os.path.join(DATA_FOLDER, os.path.dirname(output)), exist_ok=True)
+    return output
+
+
+def load_graph(request) -> Graph:
+    graph = Graph()
+    graph.read_data(representation_of(request), data_file(request, "file"))
+    return graph
+
+
+def generate_graph(request) -> Graph:
+    graph = Graph()
+    if request.get("edges") is not None:
+        graph.set_graph(random_graph_edges(field(request, "vertices"), request["edges"], seed=request.get("seed"),
+                                           sparse=True, workers=request.get("workers", 1)))
+    else:
+        graph.set_graph(random_graph_probability(field(request, "vertices"), field(request, "probability"),
+                                                 request.get("method", "geometric"), request.get("seed"),
+                                                 request.get("workers", 1)))
+    return graph
+
+
+def convert_graph(graph, request) -> dict:
+    output = output_of(request)
+    graph.save_to_file(representation_of(request), output, binary=request.get("binary", False),
+                       compression=request.get("compression"))
+    return {"output": output, "bytes": os.path.getsize(DATA_FOLDER + output)}
+
+
+def render_graph(graph, request) -> dict:
+    output = output_of(request)
+    CommandLine.render_graph(graph, output, request.get("raster", False), request.get("size", DEFAULT_IMAGE_SIZE),
+                             request.get("tone", "log"))
+    return {"output": output}
+
+
+class GraphService:
+    """Serves requests on named graphs kept in a GraphRegistry. Reading, generating, converting and drawing run
+    in a pool of threads, so the event loop keeps accepting requests; numpy releases the GIL in the heavy parts.
+    Requests on one graph run one at a time, requests on different graphs run in parallel"""
+
+    # commands creating a graph, run in the pool with the request
+    CREATE = {"load": load_graph, "generate": generate_graph}
+    # commands using a graph, run in the pool with the graph and the request
+    USE = {"stats": lambda graph, request: CommandLine.graph_statistics(graph), "convert": convert_graph,
+           "render": render_graph}
+
+    def __init__(self, memory_cap=DEFAULT_MEMORY_CAP, workers=None):
+        """:param memory_cap: memory in bytes for the graphs and their cached representations
+        :param workers: number of threads of the pool, all CPUs if None"""
+        self.registry = GraphRegistry(memory_cap)
+        self.metrics = LatencyMetrics()
+        self.executor = ThreadPoolExecutor(workers or os.cpu_count())
+        self.server = None
+        self.stopped = None
+        # requests being run, answered before the service stops
+        self.requests = set()
+        # tasks reading the connections, closed when the service stops
+        self.connections = {}
+
+    async def handle(self, request) -> dict:
+        """Run one request and return its response"""
+        start = time.perf_counter()
+        command = request.get("command")
+        response = {"id": request.get("id")}
+        try:
+            response["result"] = await self.run(command, request)
+            response["ok"] = True
+        except Exception as e:
+            # reported to the client, the service keeps running
+            response.update(ok=False, error=str(e).replace("\n", " "))
+        seconds = time.perf_counter() - start
+        response["seconds"] = seconds
+        self.metrics.add(command, seconds, not response["ok"])
+        return response
+
+    async def run(self, command, request):
+        loop = asyncio.get_running_loop()
+        if command in self.CREATE:
+            graph = await loop.run_in_executor(self.executor, self.CREATE[command], request)
+            self.registry.put(field(request, "name"), graph)
+            return {"vertices": graph.vertices_number, "edges": graph.csr.edges_number,
+                    "evicted": self.registry.evict()}
+        if command in self.USE:
+            async with self.registry.using(field(request, "name")) as graph:
+                result = await loop.run_in_executor(self.executor, self.USE[command], graph, request)
+            result["evicted"] = self.registry.evict()
+            return result
+        if command == "unload":
+            self.registry.remove(field(request, "name"))
+            return {}
+        if command == "list":
+            return {"graphs": self.registry.describe(), "bytes": self.registry.memory(),
+                    "memory_cap": self.registry.memory_cap}
+        if command == "metrics":
+            return {"latency": self.metrics.summary(), "evicted": self.registry.evicted}
+        if command == "shutdown":
+            self.close()
+            return {}
+        raise ValueError("unknown command " + str(command))
+
+    async def serve_connection(self, reader, writer) -> None:
+        """Read requests of one client until it disconnects, answering every one as soon as it is done"""
+        lock = asyncio.Lock()
+        tasks = set()
+        self.connections[asyncio.current_task()] = writer
+
+        async def answer(line):
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request should be a JSON object")
+            except ValueError as e:
+                response = {"id": None, "ok": False, "error": "bad request: " + str(e)}
+            else:
+                response = await self.handle(request)
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(answer(line))
+                    for running in tasks, self.requests:
+                        running.add(task)
+                        task.add_done_callback(running.discard)
+            await asyncio.gather(*tasks)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            del self.connections[asyncio.current_task()]
+            writer.close()
+
+    async def start(self, socket_path=None, host="127.0.0.1", port=0) -> None:
+        """Start listening on the Unix socket if a path is given, otherwise on the TCP port of the host"""
+        self.stopped = asyncio.Event()
+        if socket_path is not None:
+            self.server = await asyncio.start_unix_server(self.serve_connection, socket_path, limit=REQUEST_LIMIT)
+        else:
+            self.server = await asyncio.start_server(self.serve_connection, host, port, limit=REQUEST_LIMIT)
+
+    @property
+    def address(self):
+        """Path of the Unix socket or (host, port) of the TCP socket"""
+        return self.server.sockets[0].getsockname()
+
+    async def serve(self, socket_path=None, host="127.0.0.1", port=0) -> None:
+        """Serve requests until the shutdown command"""
+        await self.start(socket_path, host, port)
+        try:
+            await self.stopped.wait()
+            self.server.close()
+            await asyncio.gather(*self.requests, return_exceptions=True)
+            # the readers of closed connections get the end of input
+            for writer in self.connections.values():
+                writer.close()
+            await asyncio.gather(*self.connections, return_exceptions=True)
+        finally:
+            self.server.close()
+            self.executor.shutdown(wait=True)
+            if socket_path is not None and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+    def close(self) -> None:
+        """Stop serving, requests already received are still answered"""
+        if self.stopped is not None:
+            self.stopped.set()
+
+
+class ServiceClient:
+    """Blocking client sending one request at a time"""
+
+    def __init__(self, socket_path=None, host="127.0.0.1", port=None):
+        if socket_path is not None:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(socket_path)
+        else:
+            self.socket = socket.create_connection((host, port))
+        self.file = self.socket.makefile("rwb")
+        self.next_id = 0
+
+    def request(self, command, **arguments) -> dict:
+        """Send a request and return its response"""
+        self.next_id += 1
+        self.file.write(json.dumps(dict(arguments, id=self.next_id, command=command)).encode() + b"\n")
+        self.file.flush()
+        return json.loads(self.file.readline())
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self) -> "ServiceClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
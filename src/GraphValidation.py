@@ -0,0 +1,103 @@
+import numpy as np
+
+from Instrumentation import instrumented
+
+# number of matrix cells compared at once by is_symmetrical
+VALIDATION_BLOCK_CELLS = 1 << 22
+
+
+def is_square(matrix) -> bool:
+    """Check if a matrix is square"""
+    if matrix.ndim == 0:
+        return True
+    elif matrix.ndim == 2:
+        return matrix.shape[0] == matrix.shape[1]
+    return False
+
+
+@instrumented
+def is_symmetrical(matrix) -> bool:
+    """Check if the matrix is symmetrical, comparing blocks of rows with the matching blocks of columns"""
+    if matrix.ndim == 0:
+        return True
+    if not is_square(matrix):
+        return False
+    size = len(matrix)
+    block_rows = max(1, VALIDATION_BLOCK_CELLS // max(size, 1))
+    for start in range(0, size, block_rows):
+        stop = min(start + block_rows, size)
+        if not np.array_equal(matrix[start:stop, start:], matrix[start:, start:stop].transpose()):
+            return False
+    return True
+
+
+@instrumented
+def has_zeros_on_diagonal(matrix) -> bool:
+    """Check if the matrix has zeros on diagonal"""
+    if matrix.ndim == 0:
+        return matrix == 0
+    elif matrix.ndim == 2:
+        return not np.any(np.diagonal(matrix))
+    return False
+
+
+@instrumented
+def is_binary(matrix) -> bool:
+    """Check if the matrix holds only zeros and ones"""
+    return matrix.size == 0 or (matrix.min() >= 0 and matrix.max() <= 1)
+
+
+def are_indices_in_bounds(indices, low, high) -> bool:
+    """Check if all indices are in the closed range [low, high]"""
+    return len(indices) == 0 or (indices.min() >= low and indices.max() <= high)
+
+
+@instrumented
+def are_entries_symmetrical(vertices_number, rows, cols, values=None) -> bool:
+    """Check if the matrix with given non zero cells is symmetrical"""
+    forward = rows * vertices_number + cols
+    backward = cols * vertices_number + rows
+    if values is None:
+        return np.array_equal(np.sort(forward), np.sort(backward))
+    forward_order = np.lexsort((values, forward))
+    backward_order = np.lexsort((values, backward))
+    return (np.array_equal(forward[forward_order], backward[backward_order])
+            and np.array_equal(values[forward_order], values[backward_order]))
+
+
+@instrumented
+def are_sorted_entries_symmetrical(vertices_number, keys, rows, cols) -> bool:
+    """Check if the matrix with given distinct non zero cells is symmetrical, the cells are given as sorted
+    keys row * vertices_number + column with their rows and columns, so only the transposed keys are sorted"""
+    transposed = cols * vertices_number
+    transposed += rows
+    transposed.sort()
+    return np.array_equal(keys, transposed)
+
+
+@instrumented
+def are_entries_off_diagonal(rows, cols) -> bool:
+    """Check if no non zero cell with given rows and columns lies on the diagonal"""
+    return not np.any(rows == cols)
+
+
+@instrumented
+def are_edges_valid(edges, vertices_number) -> bool:
+    """Check if an (m x 2) array of zero-based edges has no loops and no vertex out of bounds"""
+    return are_indices_in_bounds(edges.reshape(-1), 0, vertices_number - 1) and \
+        are_entries_off_diagonal(edges[:, 0], edges[:, 1])
+
+
+@instrumented
+def is_csr_valid(indptr, indices, vertices_number) -> bool:
+    """Check if CSR arrays hold an undirected graph as CSRAdjacency stores it: row offsets start at 0, do not
+    decrease and end at the number of indices, rows are sorted without repeated vertices, all indices are vertices
+    of the graph, no vertex is its own neighbor and every entry has its transposed entry"""
+    if not (len(indptr) == vertices_number + 1 and indptr[0] == 0 and indptr[-1] == len(indices)
+            and not np.any(indptr[1:] < indptr[:-1]) and are_indices_in_bounds(indices, 0, vertices_number - 1)):
+        return False
+    rows = np.repeat(np.arange(vertices_number, dtype=np.int64), np.diff(indptr))
+    cols = indices.astype(np.int64)
+    keys = rows * vertices_number + cols
+    return (not np.any(keys[1:] <= keys[:-1]) and are_entries_off_diagonal(rows, cols)
+            and are_sorted_entries_symmetrical(vertices_number, keys, rows, cols))
@@ -0,0 +1,165 @@
+import importlib
+import itertools
+import os
+
+import numpy as np
+
+from Instrumentation import instrumented
+
+# approximate number of bytes formatted at once
+DEFAULT_BLOCK_SIZE = 1 << 24
+
+# modules of the stream compressors of the standard library, chosen by name or by the extension of the file;
+# they are imported when a file is compressed
+COMPRESSORS = {
+    "gzip": "gzip",
+    "bz2": "bz2",
+    "xz": "lzma",
+}
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+}
+
+SPACE = ord(" ")
+NEWLINE = ord("\n")
+MINUS = ord("-")
+ZERO = ord("0")
+
+# the longest int64 has 19 digits
+MAX_DIGITS = 19
+POWERS_OF_TEN = 10 ** np.arange(MAX_DIGITS, dtype=np.int64)
+
+
+def compression_of(filename) -> str:
+    """Name of the compressor chosen by the extension of the file, None for plain files"""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(filename)[1])
+
+
+def open_output(filename, compression=None):
+    """Open a file for writing bytes, compressed by the named compressor if it is not None"""
+    if compression is None:
+        return open(filename, "wb")
+    return importlib.import_module(COMPRESSORS[compression]).open(filename, "wb")
+
+
+def format_binary_rows(block) -> bytes:
+    """Format rows of a matrix of zeros and ones as np.savetxt(fmt="%i") does, one byte per cell"""
+    rows_number, columns_number = block.shape
+    text = np.full((rows_number, max(2 * columns_number, 1)), SPACE, dtype=np.uint8)
+    np.add(block, ZERO, out=text[:, :2 * columns_number:2], casting="unsafe")
+    text[:, -1] = NEWLINE
+    return text.tobytes()
+
+
+def format_rows(values, indptr) -> bytes:
+    """Format integers in rows separated by spaces, row i holds values[indptr[i]:indptr[i + 1]]
+    and every row ends with a newline, also the empty ones"""
+    values = np.asarray(values, dtype=np.int64)
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indptr = indptr - indptr[0]
+    magnitudes = np.abs(values)
+    negative = values < 0
+    digits = np.ones(len(values), dtype=np.int64)
+    for power in POWERS_OF_TEN[1:]:
+        larger = magnitudes >= power
+        if not larger.any():
+            break
+        digits += larger
+    # every value is followed by a space or a newline, an empty row is a single newline
+    sizes = digits + negative + 1
+    empty_rows = np.diff(indptr) == 0
+    empty_before = np.cumsum(empty_rows) - empty_rows
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    value_rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    starts = offsets[:-1] + empty_before[value_rows]
+    ends = starts + sizes - 1
+
+    text = np.full(offsets[-1] + empty_rows.sum(), SPACE, dtype=np.uint8)
+    text[starts[negative]] = MINUS
+    for position, power in enumerate(POWERS_OF_TEN[:digits.max(initial=0)]):
+        written = digits > position
+        text[ends[written] - 1 - position] = ZERO + magnitudes[written] // power % 10
+    text[ends[indptr[1:][~empty_rows] - 1]] = NEWLINE
+    text[offsets[indptr[:-1][empty_rows]] + empty_before[empty_rows]] = NEWLINE
+    return text.tobytes()
+
+
+class GraphWriter:
+    """Writes graphs in the text format of np.savetxt(fmt="%i"), formatting blocks of rows
+    to bytes at once instead of value by value"""
+
+    def __init__(self, block_size=DEFAULT_BLOCK_SIZE):
+        """:param block_size: approximate number of bytes formatted at once"""
+        self.block_size = block_size
+
+    @instrumented
+    def write(self, filename, graph, compression=None) -> bool:
+        """Write a list of rows or a matrix, which is either an array or has dense_rows like
+        SparseIncidenceMatrix, so that a CSRAdjacency is written as its adjacency matrix
+        :param compression: name of a compressor from COMPRESSORS, by default it is chosen by the extension
+        :return: False if the type of the graph is not supported"""
+        if isinstance(graph, list):
+            return self.write_blocks(filename, self.list_blocks(graph), compression)
+        if isinstance(graph, np.ndarray) or hasattr(graph, "dense_rows"):
+            return self.write_blocks(filename, self.matrix_blocks(graph), compression)
+        return False
+
+    @instrumented
+    def write_adjacency_list(self, filename, csr, compression=None) -> bool:
+        """Write the adjacency list of a CSRAdjacency without building it as Python lists"""
+        return self.write_blocks(filename, self.row_blocks(csr.indices, csr.indptr, 1), compression)
+
+    @instrumented
+    def write_edge_list(self, filename, vertices_number, edge_list, compression=None) -> bool:
+        """Write an edge list after a first line with the number of vertices, so that isolated vertices and graphs
+        without edges are read back"""
+        return self.write_blocks(filename, itertools.chain([b"%d\n" % vertices_number], self.matrix_blocks(edge_list)),
+                                 compression)
+
+    @staticmethod
+    def write_blocks(filename, blocks, compression=None) -> bool:
+        if compression is None:
+            compression = compression_of(filename)
+        with open_output(filename, compression) as f:
+            f.writelines(blocks)
+        return True
+
+    def list_blocks(self, rows):
+        """Yield blocks of formatted rows of a list of lists of integers"""
+        lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        values = np.fromiter((item for row in rows for item in row), dtype=np.int64, count=indptr[-1])
+        yield from self.row_blocks(values, indptr)
+
+    def matrix_blocks(self, matrix):
+        """Yield blocks of formatted rows of a dense matrix or of a matrix that builds dense rows on demand"""
+        if isinstance(matrix, np.ndarray):
+            matrix = np.atleast_2d(matrix)
+        rows_number, columns_number = matrix.shape
+        # a cell of a binary matrix takes two bytes
+        block_rows = max(1, self.block_size // max(2 * columns_number, 1))
+        for start in range(0, rows_number, block_rows):
+            stop = min(start + block_rows, rows_number)
+            block = matrix[start:stop] if isinstance(matrix, np.ndarray) else matrix.dense_rows(start, stop)
+            if block.dtype == bool or ((block == 0) | (block == 1)).all():
+                yield format_binary_rows(block)
+            else:
+                yield from self.row_blocks(block.reshape(-1), np.arange(0, block.size + 1, max(columns_number, 1)))
+
+    def row_blocks(self, values, indptr, shift=0):
+        """Yield blocks of formatted rows of values given in the CSR layout
+        :param shift: added to every value, 1 turns vertex indices into vertex numbers"""
+        # a formatted value takes a few bytes, so a block holds about block_size / 4 values
+        block_values = max(1, self.block_size // 4)
+        rows_number = len(indptr) - 1
+        start = 0
+        while start < rows_number:
+            stop = int(np.searchsorted(indptr, indptr[start] + block_values, side="right")) - 1
+            stop = min(max(stop, start + 1), rows_number)
+            yield format_rows(np.asarray(values[indptr[start]:indptr[stop]], dtype=np.int64) + shift,
+                              indptr[start:stop + 1])
+            start = stop
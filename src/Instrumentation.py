@@ -0,0 +1,195 @@
+import contextvars
+import functools
+import json
+import time
+import tracemalloc
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from CSRAdjacency import CSRAdjacency
+from PackedAdjacencyMatrix import PackedAdjacencyMatrix
+from RepresentationCache import estimate_size
+from SparseIncidenceMatrix import SparseIncidenceMatrix
+
+# instrumentation collecting the stages run in the current context, None when nothing is recorded
+current = contextvars.ContextVar("instrumentation", default=None)
+
+
+class StageRecord(NamedTuple):
+    """Measurements of one run of a stage"""
+    stage: str
+    depth: int
+    seconds: float
+    peak_bytes: Optional[int]
+    input_size: Optional[int]
+    output_size: Optional[int]
+    error: Optional[str] = None
+
+
+def data_size(value) -> Optional[int]:
+    """Estimate the size of graph data in bytes, None for other values"""
+    if isinstance(value, CSRAdjacency):
+        return value.indptr.nbytes + value.indices.nbytes
+    if isinstance(value, tuple):
+        sizes = [size for size in map(data_size, value) if size is not None]
+        return sum(sizes) if sizes else None
+    if isinstance(value, (np.ndarray, PackedAdjacencyMatrix, SparseIncidenceMatrix, list)):
+        return estimate_size(value)
+    return None
+
+
+class NullStage:
+    """Stage used when instrumentation is disabled, it does nothing"""
+    active = False
+    input_size = None
+    output_size = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NULL_STAGE = NullStage()
+
+
+class Stage:
+    """One run of a stage, sizes in bytes may be set while it runs"""
+    active = True
+
+    def __init__(self, instrumentation, name, input_size=None):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.input_size = input_size
+        self.output_size = None
+        self.token = None
+        self.start = None
+        self.memory_start = None
+        # highest traced memory seen in this stage
+        self.memory_peak = None
+
+    def __enter__(self):
+        self.token = current.set(self.instrumentation)
+        stack = self.instrumentation.stack
+        if self.instrumentation.memory and tracemalloc.is_tracing():
+            traced, peak = tracemalloc.get_traced_memory()
+            if stack and stack[-1].memory_peak is not None:
+                stack[-1].memory_peak = max(stack[-1].memory_peak, peak)
+            tracemalloc.reset_peak()
+            self.memory_start = self.memory_peak = traced
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        seconds = time.perf_counter() - self.start
+        stack = self.instrumentation.stack
+        stack.pop()
+        peak_bytes = None
+        if self.memory_start is not None and tracemalloc.is_tracing():
+            self.memory_peak = max(self.memory_peak, tracemalloc.get_traced_memory()[1])
+            peak_bytes = self.memory_peak - self.memory_start
+            if stack and stack[-1].memory_peak is not None:
+                stack[-1].memory_peak = max(stack[-1].memory_peak, self.memory_peak)
+        current.reset(self.token)
+        self.instrumentation.add(StageRecord(self.name, len(stack), seconds, peak_bytes, self.input_size,
+                                             self.output_size, None if exc_type is None else exc_type.__name__))
+
+
+class Instrumentation:
+    """Opt-in records of wall time, peak memory and input and output sizes of the stages of reading, validating,
+    converting and writing graphs. Stages run inside an enabled stage are recorded too, as deeper records.
+    Disabled instrumentation records nothing and costs one context variable lookup per stage"""
+
+    def __init__(self, enabled=False, memory=False):
+        """:param memory: if True, peak memory is traced with tracemalloc, which slows down
+                          code making many Python objects"""
+        self.enabled = False
+        self.memory = False
+        self.started_tracing = False
+        self.records = []
+        self.callbacks = []
+        self.stack = []
+        if enabled:
+            self.enable(memory)
+
+    def enable(self, memory=False) -> None:
+        self.enabled = True
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def stage(self, name, input_size=None):
+        """Return a context manager recording a stage if the instrumentation is enabled"""
+        if not self.enabled:
+            return NULL_STAGE
+        return Stage(self, name, input_size)
+
+    def add_callback(self, callback) -> None:
+        """Call the callback with every new StageRecord"""
+        self.callbacks.append(callback)
+
+    def add(self, record) -> None:
+        self.records.append(record)
+        for callback in self.callbacks:
+            callback(record)
+
+    def clear(self) -> None:
+        self.records = []
+
+    def summary(self) -> dict:
+        """Return the number of runs, total time and highest peak memory of every stage"""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record.stage, {"calls": 0, "seconds": 0.0, "peak_bytes": None})
+            total["calls"] += 1
+            total["seconds"] += record.seconds
+            if record.peak_bytes is not None:
+                total["peak_bytes"] = max(total["peak_bytes"] or 0, record.peak_bytes)
+        return totals
+
+    def to_json(self, filename=None) -> str:
+        """Return the records and their summary as JSON, also written to the file if a name is given"""
+        text = json.dumps({"records": [record._asdict() for record in self.records], "summary": self.summary()},
+                          indent=1)
+        if filename is not None:
+            with open(filename, "w") as f:
+                f.write(text)
+        return text
+
+
+def stage(name, input_size=None):
+    """Return a context manager recording a stage in the instrumentation of the enclosing stage, if there is one"""
+    instrumentation = current.get()
+    if instrumentation is None:
+        return NULL_STAGE
+    return instrumentation.stage(name, input_size)
+
+
+def instrumented(function):
+    """Record every call of the function run inside an enabled stage, with the sizes of its graph arguments
+    and of its result"""
+    name = function.__qualname__
+    if "." not in name:
+        name = function.__module__ + "." + name
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        instrumentation = current.get()
+        if instrumentation is None:
+            return function(*args, **kwargs)
+        with instrumentation.stage(name, data_size(args)) as record:
+            result = function(*args, **kwargs)
+            record.output_size = data_size(result)
+        return result
+
+    return wrapper
@@ -0,0 +1,71 @@
+import numpy as np
+
+from StoragePolicy import matrix_dtype
+
+# number of matrix cells unpacked at once
+UNPACK_BLOCK_CELLS = 1 << 22
+
+
+class PackedAdjacencyMatrix:
+    """Adjacency matrix with every row packed to bits by np.packbits, so that a cell takes one bit.
+
+    Bit j of row i (the most significant bit of byte j // 8 first) is 1 if vertices i and j are adjacent."""
+
+    def __init__(self, vertices_number, bits):
+        self.vertices_number = vertices_number
+        self.bits = np.asarray(bits, dtype=np.uint8).reshape(vertices_number, (vertices_number + 7) // 8)
+
+    @classmethod
+    def from_edges(cls, vertices_number, first, second) -> "PackedAdjacencyMatrix":
+        """Build the matrix from endpoint arrays of undirected edges"""
+        rows = np.concatenate((first, second)).astype(np.int64)
+        cols = np.concatenate((second, first)).astype(np.int64)
+        bits = np.zeros((vertices_number, (vertices_number + 7) // 8), dtype=np.uint8)
+        np.bitwise_or.at(bits, (rows, cols >> 3), (0x80 >> (cols & 7)).astype(np.uint8))
+        return cls(vertices_number, bits)
+
+    @classmethod
+    def from_dense(cls, matrix) -> "PackedAdjacencyMatrix":
+        """Pack a dense adjacency matrix, only cells equal to 1 are edges"""
+        matrix = np.atleast_2d(matrix)
+        return cls(len(matrix), np.packbits(matrix == 1, axis=1))
+
+    @property
+    def shape(self) -> (int, int):
+        return self.vertices_number, self.vertices_number
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    def block_rows(self) -> int:
+        """Number of rows unpacked at once"""
+        return max(1, UNPACK_BLOCK_CELLS // max(self.vertices_number, 1))
+
+    def dense_rows(self, start, stop) -> np.ndarray:
+        """Unpack rows start..stop-1 of the matrix"""
+        rows = np.unpackbits(self.bits[start:stop], axis=1, count=self.vertices_number)
+        return rows.astype(matrix_dtype(), copy=False)
+
+    def to_dense(self) -> np.ndarray:
+        """Unpack the whole matrix"""
+        return self.dense_rows(0, self.vertices_number)
+
+    def nonzero(self, upper=False) -> (np.ndarray, np.ndarray):
+        """Return rows and columns of all ones in row-major order, unpacking blocks of rows
+        :param upper: if True, only ones above the diagonal are returned"""
+        rows, cols = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+        for start in range(0, self.vertices_number, self.block_rows()):
+            stop = min(start + self.block_rows(), self.vertices_number)
+            block = np.unpackbits(self.bits[start:stop], axis=1, count=self.vertices_number).view(bool)
+            if upper:
+                block &= np.arange(self.vertices_number) > np.arange(start, stop)[:, np.newaxis]
+            block_rows, block_cols = np.nonzero(block)
+            rows.append(block_rows + start)
+            cols.append(block_cols)
+        return np.concatenate(rows), np.concatenate(cols)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PackedAdjacencyMatrix):
+            return NotImplemented
+        return np.array_equal(self.bits, other.bits)
@@ -0,0 +1,137 @@
+import hashlib
+import os
+
+from CSRAdjacency import CSRAdjacency
+from GraphBinaryFormat import load_binary
+from GraphBinaryFormat import save_binary
+from GraphConverter import IncorrectInputException
+from Instrumentation import instrumented
+
+DEFAULT_CACHE_SIZE = 4 << 30
+# number of bytes hashed at once
+HASH_BLOCK_SIZE = 1 << 24
+
+
+@instrumented
+def content_digest(filename) -> str:
+    """Hash the content of a file"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filename, "rb") as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Persistent cache of parsed graph files stored in the binary format.
+    Entries are named after the content hash of the input file and its representation, so copies of a file share
+    one entry. An index named after the path, size and modification time of the file points to its entry,
+    so unchanged files are not hashed again. When the entries and index files take more than max_size bytes,
+    least recently used ones are removed, and so are the index files of removed entries"""
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.index_directory = os.path.join(directory, "index")
+        self.max_size = max_size
+        os.makedirs(self.index_directory, exist_ok=True)
+
+    def index_path(self, filename, representation) -> str:
+        status = os.stat(filename)
+        key = "{}\0{}\0{}\0{}".format(os.path.abspath(filename), status.st_size, status.st_mtime_ns,
+                                      representation.value)
+        # named after the representation too, so the entry of an index file is known without the input file
+        return os.path.join(self.index_directory, "{}_{}".format(
+            hashlib.blake2b(key.encode(), digest_size=20).hexdigest(), representation.value))
+
+    def entry_path(self, digest, representation) -> str:
+        return os.path.join(self.directory, "{}_{}.bin".format(digest, representation.value))
+
+    def indexed_entry_path(self, index) -> str:
+        """Return the path of the entry an index file points to"""
+        with open(index) as f:
+            digest = f.read()
+        return os.path.join(self.directory, "{}_{}.bin".format(digest, index.rsplit("_", 1)[-1]))
+
+    def digest(self, filename, representation) -> str:
+        """Return the content hash of the file, from the index if the file has not changed since it was hashed"""
+        index = self.index_path(filename, representation)
+        try:
+            with open(index) as f:
+                digest = f.read()
+            # mark the index file as recently used
+            os.utime(index)
+            return digest
+        except OSError:
+            pass
+        digest = content_digest(filename)
+        try:
+            self.write_atomically(index, lambda name: self.write_text(name, digest))
+        except OSError:
+            pass
+        return digest
+
+    @instrumented
+    def load(self, filename, representation) -> CSRAdjacency:
+        """Return the cached graph read from the file, or None if it is not cached"""
+        entry = self.entry_path(self.digest(filename, representation), representation)
+        try:
+            csr = load_binary(entry)
+            # mark the entry as recently used
+            os.utime(entry)
+        except (IncorrectInputException, OSError):
+            return None
+        return csr
+
+    @instrumented
+    def store(self, filename, representation, csr) -> None:
+        """Store a graph read from the file and evict old entries if the cache is too big"""
+        entry = self.entry_path(self.digest(filename, representation), representation)
+        try:
+            self.write_atomically(entry, lambda name: save_binary(name, csr))
+            self.evict()
+        except OSError:
+            # the cache only speeds up reading, a failed write is not an error
+            pass
+
+    def evict(self) -> None:
+        """Remove least recently used entries and index files until the cache fits in max_size bytes,
+        then the index files pointing to removed entries"""
+        files = []
+        for folder, suffix in ((self.directory, ".bin"), (self.index_directory, "")):
+            for entry in os.scandir(folder):
+                if entry.is_file() and entry.name.endswith(suffix) and not entry.name.endswith(".tmp"):
+                    status = entry.stat()
+                    files.append((status.st_mtime_ns, status.st_size, entry.path))
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self.max_size:
+                break
+            os.remove(path)
+            size -= file_size
+        for entry in os.scandir(self.index_directory):
+            if entry.is_file() and not entry.name.endswith(".tmp") and \
+                    not os.path.exists(self.indexed_entry_path(entry.path)):
+                os.remove(entry.path)
+
+    def clear(self) -> None:
+        """Remove all entries and index files"""
+        for folder in (self.directory, self.index_directory):
+            for entry in os.scandir(folder):
+                if entry.is_file():
+                    os.remove(entry.path)
+
+    @staticmethod
+    def write_text(filename, text) -> None:
+        with open(filename, "w") as f:
+            f.write(text)
+
+    @staticmethod
+    def write_atomically(filename, write) -> None:
+        """Write a file under a temporary name and rename it, so concurrent readers never see a partial file"""
+        temporary = "{}.{}.tmp".format(filename, os.getpid())
+        try:
+            write(temporary)
+            os.replace(temporary, filename)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
@@ -1,6 +1,19 @@
+import os
+from typing import Union
+
 import numpy as np
-import random
+
 from GraphRepresentation import GraphRepresentation
+from PackedAdjacencyMatrix import PackedAdjacencyMatrix
+from SparseIncidenceMatrix import SparseIncidenceMatrix
+from StoragePolicy import get_policy
+from StoragePolicy import index_dtype
+from StoragePolicy import matrix_dtype
+
+# number of vertex pairs in a block drawn by one worker from its own random stream, or of expected chosen pairs
+# when the gaps between them are drawn; blocks do not depend on the number of workers, so a seed gives the same
+# graph for any number of them
+PAIR_BLOCK_SIZE = 1 << 22
 
 
 class BadNumberOfEdges(Exception):
@@ -24,41 +37,142 @@ class BadProbability(Exception):
         return "The value of probability is less than 0 or more than 1"
 
 
-def random_graph_edges(vertices: int, edges: int) -> (np.ndarray, GraphRepresentation):
-    """Generate random incidence matrix for given number of vertices and edges"""
+def pairs_from_indices(indices) -> (np.ndarray, np.ndarray):
+    """Map linear indices of the lower triangle (0 -> (1, 0), 1 -> (2, 0), 2 -> (2, 1), ...) to vertex pairs"""
+    indices = np.asarray(indices, dtype=np.int64)
+    first = ((1 + np.sqrt(1 + 8 * indices.astype(float))) // 2).astype(np.int64)
+    # correct rounding errors of the square root for large indices
+    first -= first * (first - 1) // 2 > indices
+    first += (first + 1) * first // 2 <= indices
+    second = indices - first * (first - 1) // 2
+    return first, second
+
+
+def random_graph_edges(vertices: int, edges: int, representation=GraphRepresentation.INCIDENCE_MATRIX, seed=None,
+                       sparse=False, workers=1) -> (Union[np.ndarray, SparseIncidenceMatrix], GraphRepresentation):
+    """Generate random incidence matrix or edge list for given number of vertices and edges
+    :param representation: INCIDENCE_MATRIX or EDGE_LIST
+    :param seed: seed of the random generator, for reproducible graphs
+    :param sparse: if True, an incidence matrix is returned as a SparseIncidenceMatrix, which unlike
+                   the edge list keeps the number of vertices when the last ones are isolated
+    :param workers: number of threads drawing blocks of vertex pairs, all CPUs if None"""
     if vertices < 2:
         raise BadNumberOfVertices
     if edges > vertices * (vertices - 1) / 2 or edges <= 0:
         raise BadNumberOfEdges
-    matrix = np.zeros((vertices, edges), dtype=int)
-    i = 0
-    while i < edges:
-        first_rand = random.randint(0, vertices - 1)
-        second_rand = random.randint(0, vertices - 1)
-        while first_rand == second_rand:
-            second_rand = random.randint(0, vertices - 1)
-        is_duplicated = False
-        for j in range(i):
-            if matrix[first_rand][j] == 1 and matrix[second_rand][j] == 1:
-                is_duplicated = True
-                break
-        if not is_duplicated:
-            matrix[first_rand][i] = 1
-            matrix[second_rand][i] = 1
-            i += 1
+    first, second = random_pairs_number(vertices * (vertices - 1) // 2, edges, np.random.SeedSequence(seed), workers)
+    if representation == GraphRepresentation.EDGE_LIST:
+        edge_list = np.empty((edges, 2), dtype=index_dtype(vertices))
+        edge_list[:, 0], edge_list[:, 1] = second + 1, first + 1
+        return edge_list, GraphRepresentation.EDGE_LIST
+    if sparse:
+        return SparseIncidenceMatrix(vertices, first, second), GraphRepresentation.INCIDENCE_MATRIX
+    matrix = np.zeros((vertices, edges), dtype=matrix_dtype())
+    columns = np.arange(edges)
+    matrix[first, columns] = 1
+    matrix[second, columns] = 1
     return matrix, GraphRepresentation.INCIDENCE_MATRIX
 
 
-def random_graph_probability(vertices: int, probability: float) -> (np.ndarray, GraphRepresentation):
-    """Generate random adjacency matrix for given number of vertices and probability"""
+def random_graph_probability(vertices: int, probability: float, method="dense", seed=None,
+                             workers=1) -> (Union[np.ndarray, SparseIncidenceMatrix, PackedAdjacencyMatrix],
+                                            GraphRepresentation):
+    """Generate random graph for given number of vertices and probability
+    :param method: "dense" draws every vertex pair and returns an adjacency matrix, packed if the storage policy
+                   says so, "geometric" skips between edges (Batagelj-Brandes) in O(n + m) and returns
+                   a sparse incidence matrix
+    :param seed: seed of the random generator, for reproducible graphs
+    :param workers: number of threads drawing blocks of vertex pairs, all CPUs if None"""
     if vertices < 2:
         raise BadNumberOfVertices
     if probability > 1 or probability < 0:
         raise BadProbability
-    matrix = np.zeros((vertices, vertices), dtype=int)
-    for i in range(vertices):
-        for j in range(i + 1, vertices):
-            r = random.random()
-            if r < probability:
-                matrix[i][j] = matrix[j][i] = 1
+    first, second = random_pairs(vertices * (vertices - 1) // 2, probability, np.random.SeedSequence(seed), method,
+                                 workers)
+    if method == "geometric":
+        return SparseIncidenceMatrix(vertices, first, second), GraphRepresentation.INCIDENCE_MATRIX
+    if get_policy().packed_adjacency:
+        return PackedAdjacencyMatrix.from_edges(vertices, first, second), GraphRepresentation.ADJACENCY_MATRIX
+    matrix = np.zeros((vertices, vertices), dtype=matrix_dtype())
+    matrix[first, second] = 1
+    matrix[second, first] = 1
     return matrix, GraphRepresentation.ADJACENCY_MATRIX
+
+
+def random_pairs(pairs_number, probability, seed_sequence, method="geometric", workers=1) -> (np.ndarray, np.ndarray):
+    """Choose every vertex pair independently with the given probability and return the pairs ordered by
+    their indices. The pairs are split into blocks, each drawn from its own stream spawned from the seed sequence:
+    blocks of PAIR_BLOCK_SIZE pairs for "dense" and blocks of about PAIR_BLOCK_SIZE chosen pairs for "geometric"
+    :param method: "dense" draws every pair, "geometric" draws the gaps between the chosen pairs"""
+    block_size = PAIR_BLOCK_SIZE
+    if method == "geometric":
+        # the work of a block grows with its chosen pairs, so sparse graphs of many vertices take a few blocks
+        block_size = pairs_number if probability == 0 else max(PAIR_BLOCK_SIZE, int(PAIR_BLOCK_SIZE / probability))
+    starts = range(0, pairs_number, max(block_size, 1))
+    tasks = [(start, min(start + block_size, pairs_number), probability, method, block_seed)
+             for start, block_seed in zip(starts, seed_sequence.spawn(len(starts)))]
+    blocks = map_blocks(random_block_pairs, tasks, workers)
+    return (np.concatenate([np.empty(0, dtype=np.int64)] + [first for first, _ in blocks]),
+            np.concatenate([np.empty(0, dtype=np.int64)] + [second for _, second in blocks]))
+
+
+def random_block_pairs(task) -> (np.ndarray, np.ndarray):
+    """Draw the pairs of one block, run in a worker thread"""
+    start, stop, probability, method, seed_sequence = task
+    rng = np.random.default_rng(seed_sequence)
+    if method == "geometric":
+        indices = geometric_skip_indices(stop - start, probability, rng)
+    else:
+        indices = np.flatnonzero(rng.random(stop - start) < probability)
+    return pairs_from_indices(indices + start)
+
+
+def random_pairs_number(pairs_number, edges, seed_sequence, workers=1) -> (np.ndarray, np.ndarray):
+    """Choose the given number of distinct vertex pairs uniformly and return them ordered by their indices.
+    Pairs are drawn in parallel with a probability giving a few more pairs than needed, as many times as it takes
+    to get enough of them, and the surplus is removed at random; every set of pairs of the given size is
+    equally likely, because it is as likely as any other to be a subset of the drawn pairs.
+    At most PAIR_BLOCK_SIZE pairs are drawn at once in O(edges) in the calling thread"""
+    if edges <= PAIR_BLOCK_SIZE:
+        rng = np.random.default_rng(seed_sequence)
+        return pairs_from_indices(np.sort(rng.choice(pairs_number, size=edges, replace=False)))
+    probability = min(1.0, (edges + 4 * np.sqrt(edges) + 16) / pairs_number)
+    while True:
+        first, second = random_pairs(pairs_number, probability, seed_sequence.spawn(1)[0], "geometric", workers)
+        if len(first) >= edges:
+            break
+    rng = np.random.default_rng(seed_sequence.spawn(1)[0])
+    kept = np.ones(len(first), dtype=bool)
+    kept[rng.choice(len(first), size=len(first) - edges, replace=False)] = False
+    return first[kept], second[kept]
+
+
+def map_blocks(function, tasks, workers) -> list:
+    """Apply the function to every task and return the results in the order of the tasks. numpy releases the GIL
+    while drawing random numbers and scanning arrays, so a pool of threads runs the blocks in parallel
+    without copying them between processes
+    :param workers: number of threads, all CPUs if None; 1 runs the tasks in the calling thread"""
+    if workers == 1 or len(tasks) <= 1:
+        return list(map(function, tasks))
+    # loaded only for a pool, like multiprocessing in BatchConverter
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(workers or os.cpu_count()) as executor:
+        return list(executor.map(function, tasks))
+
+
+def geometric_skip_indices(pairs_number, probability, rng) -> np.ndarray:
+    """Return sorted indices of the pairs chosen with the given probability, drawing the gaps between them"""
+    if probability == 0:
+        return np.empty(0, dtype=np.int64)
+    chunks = [np.empty(0, dtype=np.int64)]
+    position = -1
+    while position < pairs_number - 1:
+        remaining = pairs_number - position - 1
+        expected = remaining * probability
+        size = int(min(expected + 4 * np.sqrt(expected) + 16, remaining))
+        indices = position + np.cumsum(rng.geometric(probability, size=size))
+        chunks.append(indices[indices < pairs_number])
+        if len(chunks[-1]) < size:
+            break
+        position = indices[-1]
+    return np.concatenate(chunks)
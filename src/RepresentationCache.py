@@ -0,0 +1,81 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from PackedAdjacencyMatrix import PackedAdjacencyMatrix
+from SparseIncidenceMatrix import SparseIncidenceMatrix
+
+DEFAULT_CACHE_BUDGET = 256 << 20
+
+
+def estimate_size(value) -> int:
+    """Estimate the memory taken by a representation in bytes"""
+    if isinstance(value, (np.ndarray, PackedAdjacencyMatrix)):
+        return value.nbytes
+    if isinstance(value, SparseIncidenceMatrix):
+        return value.first.nbytes + value.second.nbytes
+    if isinstance(value, list):
+        # list objects with pointers to small ints
+        return sum(56 + 36 * len(row) for row in value)
+    return 0
+
+
+def freeze(value) -> None:
+    """Make the arrays of a value shared by all callers read-only"""
+    if isinstance(value, np.ndarray):
+        arrays = [value]
+    elif isinstance(value, PackedAdjacencyMatrix):
+        arrays = [value.bits]
+    elif isinstance(value, SparseIncidenceMatrix):
+        arrays = [value.first, value.second]
+    else:
+        arrays = []
+    for array in arrays:
+        array.setflags(write=False)
+
+
+def unshared(value):
+    """Return a cached value for one caller, lists of rows are copied because they can not be made read-only"""
+    if isinstance(value, list):
+        return [list(row) for row in value]
+    return value
+
+
+class RepresentationCache:
+    """Memoizes representations derived from one graph within a memory budget in bytes.
+    When the budget is exceeded, the largest representations are evicted first, the least recently used of equal
+    size before the others. Cached arrays, also those of packed and sparse matrices, are read-only, cached lists
+    are copied for every caller."""
+
+    def __init__(self, budget=DEFAULT_CACHE_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self.entries = OrderedDict()
+
+    def get(self, key, build):
+        """Return the cached value for the key, building and storing it on a miss"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return unshared(self.entries[key][0])
+        value = build()
+        size = estimate_size(value)
+        if size <= self.budget:
+            freeze(value)
+            while self.size + size > self.budget:
+                # entries are in least recently used order, max picks the first of the largest
+                largest = max(self.entries, key=lambda cached: self.entries[cached][1])
+                self.size -= self.entries.pop(largest)[1]
+            self.entries[key] = (value, size)
+            self.size += size
+            return unshared(value)
+        return value
+
+    def peek(self, key, default=None):
+        """Return the cached value for the key without building it or changing the eviction order"""
+        if key in self.entries:
+            return unshared(self.entries[key][0])
+        return default
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size = 0
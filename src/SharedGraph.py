@@ -0,0 +1,144 @@
+"""Graphs published in shared memory, so worker processes use one copy instead of a pickled copy each.
+
+The publishing process owns the segment: SharedGraph copies the sparse form of a graph, and optionally its adjacency
+matrix, into one shared memory block and unlinks it when closed. Workers receive the small picklable handle and
+attach a read-only Graph viewing the block without copying it. Handles are meant for processes started by
+multiprocessing from the publishing process, which share its resource tracker."""
+import weakref
+from multiprocessing import shared_memory
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from CSRAdjacency import CSRAdjacency
+from Graph import Graph
+from GraphRepresentation import GraphRepresentation
+from PackedAdjacencyMatrix import PackedAdjacencyMatrix
+from RepresentationCache import DEFAULT_CACHE_BUDGET
+
+# arrays in the segment start at multiples of this number of bytes
+ALIGNMENT = 64
+
+
+class SharedArray(NamedTuple):
+    """Place of an array in a shared memory segment"""
+    offset: int
+    shape: tuple
+    dtype: str
+
+    def view(self, buffer) -> np.ndarray:
+        """Return the read-only array in the buffer of the segment"""
+        array = np.ndarray(self.shape, dtype=self.dtype, buffer=buffer, offset=self.offset)
+        array.setflags(write=False)
+        return array
+
+
+class SharedGraphHandle(NamedTuple):
+    """Picklable description of a published graph, sent to the worker processes instead of the graph"""
+    name: str
+    vertices_number: int
+    indptr: SharedArray
+    indices: SharedArray
+    # dense adjacency matrix, or the bits of a packed one
+    matrix: Optional[SharedArray] = None
+    packed: bool = False
+
+    def attach(self) -> "SharedGraphView":
+        """Attach the segment and return a read-only view of the graph"""
+        return SharedGraphView(self)
+
+
+def attach_memory(name) -> shared_memory.SharedMemory:
+    """Attach an existing segment without handing it to the resource tracker when Python allows it,
+    only the publishing process removes the segment"""
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # before Python 3.13 attached segments are tracked; processes started by multiprocessing share the
+        # tracker of the publishing process, which forgets the segment when it is unlinked
+        return shared_memory.SharedMemory(name)
+
+
+class SharedGraphView:
+    """Read-only Graph over a segment of another process. Modifying the graph with add_edge and the like
+    works on a private copy; the segment is not written.
+    Close the view when done with the graph; the segment stays attached until the graph and the arrays taken
+    from it are no longer referenced"""
+
+    def __init__(self, handle: SharedGraphHandle):
+        memory = attach_memory(handle.name)
+        # every array of the view is based on this one, the segment is detached when the last of them is freed;
+        # detaching it earlier would leave them pointing to unmapped memory
+        buffer = np.ndarray((memory.size,), dtype=np.uint8, buffer=memory.buf)
+        self.detached = weakref.finalize(buffer, memory.close)
+        csr = CSRAdjacency.from_arrays(handle.indptr.view(buffer), handle.indices.view(buffer))
+        matrix = None
+        if handle.matrix is not None:
+            matrix = handle.matrix.view(buffer)
+            if handle.packed:
+                matrix = PackedAdjacencyMatrix(handle.vertices_number, matrix)
+        # the shared matrix is cached whatever its size, it does not take memory of this process
+        self.graph = Graph(cache_budget=max(DEFAULT_CACHE_BUDGET, 0 if matrix is None else matrix.nbytes))
+        self.graph.csr = csr
+        if matrix is not None:
+            self.graph.cache.get((GraphRepresentation.ADJACENCY_MATRIX, False), lambda: matrix)
+
+    def close(self) -> None:
+        """Release the graph of the view, the segment is detached as soon as no array of it is used elsewhere"""
+        self.graph = None
+
+    def __enter__(self) -> Graph:
+        return self.graph
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class SharedGraph:
+    """Copy of a graph in a shared memory segment owned by this object. Call unlink, or use it as a context
+    manager, to remove the segment; it stays until then even if every process detached it"""
+
+    def __init__(self, graph: Graph, matrix=None):
+        """:param matrix: if True, the adjacency matrix is published too, built by the storage policy if needed;
+                          if None, it is published only if the graph has it cached"""
+        key = (GraphRepresentation.ADJACENCY_MATRIX, False)
+        if matrix:
+            matrix = graph.get_graph(GraphRepresentation.ADJACENCY_MATRIX)
+        else:
+            matrix = graph.cache.peek(key) if matrix is None else None
+        csr = graph.current_csr()
+        packed = isinstance(matrix, PackedAdjacencyMatrix)
+        arrays = [csr.indptr, csr.indices] + ([] if matrix is None else [matrix.bits if packed else matrix])
+        places, size = [], 0
+        for array in arrays:
+            places.append(SharedArray(size, array.shape, array.dtype.str))
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        # segments can not be empty
+        self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for array, place in zip(arrays, places):
+            np.ndarray(place.shape, dtype=place.dtype, buffer=self.memory.buf, offset=place.offset)[...] = array
+        self.handle = SharedGraphHandle(self.memory.name, csr.vertices_number, places[0], places[1],
+                                        places[2] if matrix is not None else None, packed)
+        self.unlinked = False
+
+    @property
+    def size(self) -> int:
+        """Size of the segment in bytes"""
+        return self.memory.size
+
+    def attach(self) -> SharedGraphView:
+        """Return a read-only view of the published graph in this process"""
+        return self.handle.attach()
+
+    def unlink(self) -> None:
+        """Detach and remove the segment; views attached before keep working until they are closed"""
+        if not self.unlinked:
+            self.memory.close()
+            self.memory.unlink()
+            self.unlinked = True
+
+    def __enter__(self) -> "SharedGraph":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.unlink()
@@ -0,0 +1,49 @@
+import numpy as np
+
+from StoragePolicy import matrix_dtype
+
+
+class SparseIncidenceMatrix:
+    """Incidence matrix stored as the two endpoints of every column.
+
+    Column j has ones in rows first[j] and second[j] and zeros elsewhere,
+    so the structure takes O(m) memory instead of O(n * m)."""
+
+    def __init__(self, vertices_number, first, second):
+        self.vertices_number = vertices_number
+        self.first = np.asarray(first)
+        self.second = np.asarray(second)
+        self._row_indptr = None
+        self._row_columns = None
+
+    @property
+    def shape(self) -> (int, int):
+        return self.vertices_number, len(self.first)
+
+    def coo(self) -> (np.ndarray, np.ndarray, np.ndarray):
+        """Return row, column and value arrays of all ones in the matrix"""
+        columns = np.arange(len(self.first))
+        rows = np.concatenate((self.first, self.second))
+        return rows, np.concatenate((columns, columns)), np.ones(len(rows), dtype=matrix_dtype())
+
+    def _index_rows(self) -> None:
+        """Group the columns by vertex so that single rows can be built without scanning all columns"""
+        rows, columns, _ = self.coo()
+        order = np.argsort(rows, kind="stable")
+        self._row_columns = columns[order]
+        self._row_indptr = np.zeros(self.vertices_number + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.vertices_number), out=self._row_indptr[1:])
+
+    def dense_rows(self, start, stop) -> np.ndarray:
+        """Build rows start..stop-1 of the dense incidence matrix"""
+        if self._row_indptr is None:
+            self._index_rows()
+        begin, end = self._row_indptr[start], self._row_indptr[stop]
+        counts = np.diff(self._row_indptr[start:stop + 1])
+        block = np.zeros((stop - start, len(self.first)), dtype=matrix_dtype())
+        block[np.repeat(np.arange(stop - start), counts), self._row_columns[begin:end]] = 1
+        return block
+
+    def to_dense(self) -> np.ndarray:
+        """Build the full dense incidence matrix"""
+        return self.dense_rows(0, self.vertices_number)
@@ -0,0 +1,58 @@
+import contextlib
+import contextvars
+from typing import NamedTuple
+
+import numpy as np
+
+
+class StoragePolicy(NamedTuple):
+    """How graph arrays are stored.
+    matrix_dtype: type of the cells of dense adjacency and incidence matrices, np.uint8 or bool
+    packed_adjacency: if True, adjacency matrices are built as PackedAdjacencyMatrix, 8 cells per byte
+    compact_indices: if True, arrays of vertex numbers use the smallest signed integer type holding them,
+                     otherwise int64"""
+    matrix_dtype: type = np.uint8
+    packed_adjacency: bool = False
+    compact_indices: bool = True
+
+
+# int64 everywhere, as before the policy existed
+WIDE = StoragePolicy(np.int64, False, False)
+# bit-packed adjacency matrices for very large dense graphs
+PACKED = StoragePolicy(np.uint8, True, True)
+
+current_policy = contextvars.ContextVar("storage_policy", default=StoragePolicy())
+
+
+def get_policy() -> StoragePolicy:
+    return current_policy.get()
+
+
+def set_policy(policy) -> None:
+    """Use the policy for all graphs built from now on in the current context"""
+    current_policy.set(policy)
+
+
+@contextlib.contextmanager
+def using_policy(policy):
+    """Use the policy for graphs built inside the with block"""
+    token = current_policy.set(policy)
+    try:
+        yield policy
+    finally:
+        current_policy.reset(token)
+
+
+def matrix_dtype() -> np.dtype:
+    """Return the type of the cells of dense matrices"""
+    return np.dtype(current_policy.get().matrix_dtype)
+
+
+def index_dtype(max_value) -> np.dtype:
+    """Return the type of arrays holding vertex numbers up to max_value. One more than max_value fits as well,
+    so vertex numbers can be shifted to start from 1"""
+    if current_policy.get().compact_indices:
+        for dtype in (np.int8, np.int16, np.int32):
+            if max_value < np.iinfo(dtype).max:
+                return np.dtype(dtype)
+    return np.dtype(np.int64)
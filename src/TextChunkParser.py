@@ -0,0 +1,80 @@
+import numpy as np
+
+from GraphConverter import IncorrectInputException
+
+# the temporary arrays of a chunk take a few times its size
+DEFAULT_CHUNK_SIZE = 1 << 23
+
+# the longest token whose value still fits in int64
+MAX_TOKEN_LENGTH = 18
+
+NEWLINE = ord("\n")
+MINUS = ord("-")
+
+# byte classes used by the parser
+INVALID, WHITESPACE, DIGIT, SIGN = range(4)
+BYTE_CLASSES = np.full(256, INVALID, dtype=np.uint8)
+BYTE_CLASSES[[ord(" "), ord("\t"), ord("\r"), NEWLINE]] = WHITESPACE
+BYTE_CLASSES[ord("0"):ord("9") + 1] = DIGIT
+BYTE_CLASSES[MINUS] = SIGN
+
+ZERO = ord("0")
+
+
+def read_chunks(filename, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield consecutive pieces of a file of about chunk_size bytes, each ending at a line boundary"""
+    with open(filename, "rb") as f:
+        rest = b""
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            data = rest + data
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                rest = data
+                continue
+            rest = data[end:]
+            yield data[:end]
+        if rest:
+            yield rest
+
+
+def parse_integers(chunk) -> (np.ndarray, np.ndarray, int):
+    """Parse whitespace separated integers of a chunk with array operations over its bytes and tokens.
+    :return: values, line of every value counted from the start of the chunk and number of lines in the chunk"""
+    data = np.frombuffer(chunk, dtype=np.uint8)
+    classes = BYTE_CLASSES[data]
+    if np.any(classes == INVALID):
+        raise IncorrectInputException("an error occurred while reading the file:\nfile contains non integer values")
+
+    is_token = classes != WHITESPACE
+    boundaries = np.flatnonzero(np.diff(is_token, prepend=False, append=False))
+    starts, ends = boundaries[0::2], boundaries[1::2]
+    lengths = ends - starts
+    if np.any(lengths > MAX_TOKEN_LENGTH):
+        raise IncorrectInputException("an error occurred while reading the file:\nvalue is too large")
+    negative = classes[starts] == SIGN
+    # a sign may only start a token that has digits after it
+    if np.count_nonzero(classes == SIGN) != np.count_nonzero(negative) or np.any(negative & (lengths == 1)):
+        raise IncorrectInputException("an error occurred while reading the file:\nfile contains non integer values")
+
+    # digits are read from the end of every token, one position of all tokens at a time, so every pass works on
+    # arrays with one item per token and no array with one item per character is built
+    digits = data - np.uint8(ZERO)
+    digit_lengths = lengths - negative
+    last_digits = ends - 1
+    values = np.zeros(len(starts), dtype=np.int64)
+    for position in range(int(digit_lengths.max(initial=0))):
+        # indices before a short token point into the previous token or wrap around, their digits are masked
+        position_digits = digits[last_digits - position] * (digit_lengths > position)
+        values += position_digits.astype(np.int64) * 10 ** position
+    values[negative] *= -1
+
+    # the line of a token is the number of newlines before it, found from the token following every newline
+    newlines = np.flatnonzero(data == NEWLINE)
+    lines = np.cumsum(np.bincount(np.searchsorted(starts, newlines), minlength=len(starts) + 1)[:len(starts)])
+    lines_number = len(newlines)
+    if len(data) and data[-1] != NEWLINE:
+        lines_number += 1
+    return values, lines, lines_number
@@ -1,119 +1,118 @@
 import sys
 
+import CommandLine
 from Graph import Graph
-from RandomGraphGenerator import *
+from GraphRepresentation import GraphRepresentation
+from RandomGraphGenerator import random_graph_edges
+from RandomGraphGenerator import random_graph_probability
 
 
-def save_graph() -> None:
-    representation = input("Select an output representation:\n"
+def save_graph(graph) -> None:
+    while True:
+        representation = input("Select an output representation:\n"
                                "1 - Adjacency matrix\n"
                                "2 - Adjacency list\n"
                                "3 - Incidence matrix\n"
+                               "4 - Edge list\n"
                                )
-    if representation in ["1", "2", "3"]:
-        filename = input("Insert an output filename:\n")
-        if graph.save_to_file(GraphRepresentation(int(representation)), filename):
-            print("Completed. Check folder data")
-        else:
-            print("An error occurred while saving the graph")
-    else:
+        if representation in ["1", "2", "3", "4"]:
+            filename = input("Insert an output filename:\n")
+            if graph.save_to_file(GraphRepresentation(int(representation)), filename):
+                print("Completed. Check folder data")
+            else:
+                print("An error occurred while saving the graph")
+            return
         print("Wrong representation selected, try again")
-        save_graph()
 
 
-def draw_graph() -> None:
-    save_to_file = input("Do you want to save image to a file? Select an option:\n"
+def draw_graph(graph) -> None:
+    while True:
+        save_to_file = input("Do you want to save image to a file? Select an option:\n"
                              "0 - No\n"
                              "1 - Yes\n"
                              )
-    if save_to_file in ["0", "1"]:
-        file_name = ""
-        if save_to_file == "1":
-            try:
+        if save_to_file in ["0", "1"]:
+            file_name = ""
+            if save_to_file == "1":
                 file_name = input("Specify file name for the graph:\n")
-            except Exception as e:
-                print("Error: " + str(e) + "\nPlease try again\n")
-        graph.visualise_graph_on_circle(bool(int(save_to_file)), file_name)
-    else:
+            graph.visualise_graph_on_circle(bool(int(save_to_file)), file_name)
+            return
         print("Wrong input, try again")
-        draw_graph()
 
 
-def generate_graph() -> None:
-    graph_type = input("Select type of the graph:\n"
+def generate_graph(graph) -> bool:
+    """Generate a graph, return False if the user went back to the main menu"""
+    while True:
+        graph_type = input("Select type of the graph:\n"
                            "1 - G(n,l)\n"
                            "2 - G(n,p)\n"
                            "Press any other key to return to the main menu\n"
                            )
-    if graph_type in ["1", "2"]:
+        if graph_type not in ["1", "2"]:
+            return False
         n = input("Enter the number of graph vertices:\n")
-        if graph_type == "1":
-            l = input("Enter the number of graph edges:\n")
-            try:
+        try:
+            if graph_type == "1":
+                l = input("Enter the number of graph edges:\n")
                 graph.set_graph(random_graph_edges(int(n), int(l)))
-            except Exception as e:
-                print("Error: " + str(e) + "\nPlease try again\n")
-                generate_graph()
-        if graph_type == "2":
-            p = input("Enter the probability in range [0,1]:\n")
-            try:
+            else:
+                p = input("Enter the probability in range [0,1]:\n")
                 graph.set_graph(random_graph_probability(int(n), float(p)))
-            except Exception as e:
-                print("Error: " + str(e) + "\nPlease try again\n")
-                generate_graph()
-    else:
-        main()
+            return True
+        except Exception as e:
+            print("Error: " + str(e) + "\nPlease try again\n")
 
 
-def read_graph() -> None:
-    representation = input("Enter a representation of the input:\n"
+def read_graph(graph) -> bool:
+    """Read a graph, return False if the user went back to the main menu"""
+    while True:
+        representation = input("Enter a representation of the input:\n"
                                "1 - Adjacency matrix\n"
                                "2 - Adjacency list\n"
                                "3 - Incidence matrix\n"
+                               "4 - Edge list\n"
                                "Press any other key to return to the main menu\n"
                                )
-    if representation in ["1", "2", "3"]:
+        if representation not in ["1", "2", "3", "4"]:
+            return False
         filename = input("Enter the name of the input file (stored in folder data):\n")
         try:
-            graph.read_data(GraphRepresentation(int(representation)), filename)
+            return graph.read_data(GraphRepresentation(int(representation)), filename)
         except Exception as e:
             print("Error: " + str(e) + "\nPlease try again\n")
-            read_graph()
-    else:
-        main()
 
 
 def main() -> None:
-    job = input("Select an option:\n"
+    graph = Graph()
+    while True:
+        job = input("Select an option:\n"
                     "1 - Read the graph from file \n"
                     "2 - Generate a random graph \n"
                     )
-
-    if job in ["1", "2"]:
         if job == "1":
-            read_graph()
-        if job == "2":
-            generate_graph()
-        while True:
+            loaded = read_graph(graph)
+        elif job == "2":
+            loaded = generate_graph(graph)
+        else:
+            print("Wrong option selected, try again")
+            continue
+        while loaded:
             job = input("Choose what you want to do with the graph:\n"
-                            "1 - Save the graph to the file\n"
-                            "2 - Draw the graph\n"
-                            "3 - Exit the program\n"
-                            "Press any other key to return to the main menu\n")
-            if job in ["1", "2", "3"]:
-                if job == "1":
-                    save_graph()
-                if job == "2":
-                    draw_graph()
-                if job == "3":
-                    sys.exit(1)
+                        "1 - Save the graph to the file\n"
+                        "2 - Draw the graph\n"
+                        "3 - Exit the program\n"
+                        "Press any other key to return to the main menu\n")
+            if job == "1":
+                save_graph(graph)
+            elif job == "2":
+                draw_graph(graph)
+            elif job == "3":
+                sys.exit(1)
             else:
-                main()
-    else:
-        print("Wrong option selected, try again")
-        main()
+                loaded = False
 
 
 if __name__ == "__main__":
-    graph = Graph()
+    if len(sys.argv) > 1:
+        sys.exit(CommandLine.run(sys.argv[1:]))
     main()
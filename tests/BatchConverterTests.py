@@ -0,0 +1,42 @@
+import os
+import unittest
+from unittest import mock
+
+from BatchConverter import *
+from GraphReader import GraphReader
+from GraphRepresentation import GraphRepresentation
+
+
+class BatchConverterTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.filenames = ["test_data/generated.txt", "test_data/one.txt"]
+        self.outputs = ["test_data/batch_generated.txt", "test_data/batch_one.txt"]
+
+    def tearDown(self) -> None:
+        for output in self.outputs:
+            if os.path.exists("data/" + output):
+                os.remove("data/" + output)
+
+    def test_failures_are_reported(self):
+        for workers in (1, 2):
+            report = BatchReport()
+            for result in convert_files(self.filenames, GraphRepresentation.ADJACENCY_MATRIX, self.outputs,
+                                        GraphRepresentation.ADJACENCY_LIST, workers=workers):
+                report.add(result)
+            self.assertEqual([result.filename for result in report.converted], ["test_data/generated.txt"])
+            self.assertEqual([result.filename for result in report.failures], ["test_data/one.txt"])
+
+            reader = GraphReader()
+            self.assertEqual(reader.read_csr(GraphRepresentation.ADJACENCY_MATRIX, self.filenames[0]),
+                             reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.outputs[0]))
+
+    def test_unexpected_errors_are_reported(self):
+        with mock.patch.object(Graph, "save_to_file", side_effect=ValueError("no space")):
+            results = list(convert_files(self.filenames[:1], GraphRepresentation.ADJACENCY_MATRIX, self.outputs[:1],
+                                         GraphRepresentation.ADJACENCY_LIST, workers=1))
+        self.assertEqual(["ValueError: no space"], [result.error for result in results])
+
+
+if __name__ == '__main__':
+    unittest.main()
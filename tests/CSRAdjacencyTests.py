@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+from CSRAdjacency import CSRAdjacency
+from GraphConverter import *
+
+
+class CSRAdjacencyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.matrix = np.array([[0, 1, 1, 0],
+                                [1, 0, 0, 0],
+                                [1, 0, 0, 1],
+                                [0, 0, 1, 0]], dtype=int)
+        self.adjacency_list = [[2, 3], [1], [1, 4], [3]]
+
+    def test_from_dense(self):
+        csr = CSRAdjacency.from_dense(self.matrix)
+        self.assertEqual(csr.vertices_number, 4)
+        self.assertEqual(csr.edges_number, 3)
+        self.assertTrue(np.array_equal(csr.to_dense(), self.matrix))
+
+    def test_from_edges_merges_duplicates(self):
+        csr = CSRAdjacency.from_edges(4, [0, 2, 0, 1], [1, 3, 2, 0])
+        self.assertEqual(csr, CSRAdjacency.from_dense(self.matrix))
+
+    def test_edges(self):
+        first, second = CSRAdjacency.from_dense(self.matrix).edges()
+        self.assertEqual(first.tolist(), [0, 0, 2])
+        self.assertEqual(second.tolist(), [1, 2, 3])
+
+    def test_edge_blocks(self):
+        csr = CSRAdjacency.from_dense(self.matrix)
+        for entries in (1, 2, 3, 6, 100):
+            blocks = list(csr.edge_blocks(entries))
+            self.assertEqual([[0, 0, 2], [1, 2, 3]], np.concatenate(blocks, axis=1).tolist())
+        self.assertEqual(3, len(list(csr.edge_blocks(2))))
+
+    def test_to_adjacency_list(self):
+        csr = CSRAdjacency.from_dense(self.matrix)
+        self.assertEqual(csr.to_adjacency_list(), self.adjacency_list)
+
+    def test_adj_list_round_trip(self):
+        csr = convert_to_csr(self.adjacency_list, GraphRepresentation.ADJACENCY_LIST)
+        self.assertTrue(np.array_equal(csr.to_dense(), self.matrix))
+
+    def test_inc_mat_matches_dense_converter(self):
+        csr = CSRAdjacency.from_dense(self.matrix)
+        expected = convert_adj_mat_to_inc_mat(self.matrix)
+        self.assertTrue(np.array_equal(convert_from_csr(csr, GraphRepresentation.INCIDENCE_MATRIX), expected))
+
+    def test_sparse_inc_mat(self):
+        csr = CSRAdjacency.from_dense(self.matrix)
+        sparse = convert_from_csr(csr, GraphRepresentation.INCIDENCE_MATRIX, sparse=True)
+        self.assertEqual(sparse.shape, (4, 3))
+        self.assertTrue(np.array_equal(sparse.to_dense(), convert_adj_mat_to_inc_mat(self.matrix)))
+        self.assertEqual(convert_to_csr(sparse, GraphRepresentation.INCIDENCE_MATRIX), csr)
+
+    def test_adj_list_not_symmetrical(self):
+        expected = "Incorrect input - Matrix built from adjacency list is not symmetrical"
+
+        with self.assertRaises(IncorrectInputException) as ctx:
+            convert_to_csr([[2], []], GraphRepresentation.ADJACENCY_LIST)
+        self.assertEqual(expected, str(ctx.exception), "Messages are not equal")
+
+    def test_adj_list_out_of_bounds(self):
+        expected = "Incorrect input - Index of list is out of matrix bounds"
+
+        with self.assertRaises(IncorrectInputException) as ctx:
+            convert_to_csr([[3], [1]], GraphRepresentation.ADJACENCY_LIST)
+        self.assertEqual(expected, str(ctx.exception), "Messages are not equal")
+
+
+if __name__ == '__main__':
+    unittest.main()
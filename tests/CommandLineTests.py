@@ -0,0 +1,119 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from CommandLine import *
+from GraphReader import GraphReader
+from GraphService import ServiceClient
+
+
+class CommandLineTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.output_dir = "test_data/command_line"
+
+    def tearDown(self) -> None:
+        shutil.rmtree(DATA_FOLDER + self.output_dir, ignore_errors=True)
+
+    def run_command(self, *argv) -> (int, str):
+        """Run the command line and return its exit code and output"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            code = run(list(argv))
+        return code, output.getvalue()
+
+    def test_read(self):
+        code, output = self.run_command("read", "test_data/generated.txt", "-r", "adjacency-matrix")
+        self.assertEqual(0, code)
+        self.assertTrue(output.startswith("test_data/generated.txt: 15 vertices, 20 edges ("))
+
+    def test_read_incorrect_file(self):
+        code, output = self.run_command("read", "test_data/generated.txt", "test_data/non_zero_on_diag.txt",
+                                        "-r", "adjacency-matrix")
+        self.assertEqual(1, code)
+        self.assertIn("test_data/generated.txt: 15 vertices", output)
+        self.assertIn("test_data/non_zero_on_diag.txt: error: Incorrect input - Adjacency matrix built from input "
+                      "has non zero value on diagonal", output)
+
+    def test_no_matching_files(self):
+        code, output = self.run_command("read", "test_data/missing*.txt", "-r", "adjacency-matrix")
+        self.assertEqual(1, code)
+        self.assertEqual("test_data/missing*.txt: no matching files in folder data\n", output)
+
+    def test_unknown_representation(self):
+        with contextlib.redirect_stderr(io.StringIO()) as errors, self.assertRaises(SystemExit) as ctx:
+            run(["read", "test_data/generated.txt", "-r", "adjacency"])
+        self.assertEqual(2, ctx.exception.code)
+        self.assertIn("unknown representation adjacency", errors.getvalue())
+
+    def test_stats(self):
+        code, output = self.run_command("stats", "test_data/generated.txt", "-r", "adjacency-matrix")
+        self.assertEqual(0, code)
+        self.assertIn("15 vertices, 20 edges, degree min 0 max 4 mean 2.667, 1 isolated vertices, 2 components, "
+                      "largest component 14 vertices", output)
+
+    def test_convert(self):
+        code, output = self.run_command("convert", "test_data/generated.txt", "-r", "adjacency-matrix",
+                                        "-o", "adjacency-list", "--output-dir", self.output_dir)
+        self.assertEqual(0, code)
+        output_file = os.path.join(self.output_dir, "generated_adj_list.txt")
+        self.assertIn("saved to " + output_file, output)
+        self.assertIn("converted 1 of 1 files", output)
+        reader = GraphReader()
+        self.assertEqual(reader.read_csr(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt"),
+                         reader.read_csr(GraphRepresentation.ADJACENCY_LIST, output_file))
+
+    def test_convert_incorrect_file(self):
+        code, output = self.run_command("convert", "test_data/one.txt", "-r", "adjacency-matrix",
+                                        "-o", "edge-list", "--output-dir", self.output_dir)
+        self.assertEqual(1, code)
+        self.assertIn("converted 0 of 1 files", output)
+
+    def test_render(self):
+        for arguments in ((), ("--raster", "--size", "64")):
+            code, output = self.run_command("render", "test_data/generated.txt", "-r", "adjacency-matrix",
+                                            "--output-dir", self.output_dir, *arguments)
+            self.assertEqual(0, code)
+            self.assertIn("saved to " + os.path.join(self.output_dir, "generated.png"), output)
+            with open(DATA_FOLDER + self.output_dir + "/generated.png", "rb") as f:
+                self.assertEqual(b"\x89PNG", f.read(4))
+            os.remove(DATA_FOLDER + self.output_dir + "/generated.png")
+
+    def test_generate(self):
+        output_file = self.output_dir + "/generated.txt"
+        code, output = self.run_command("generate", output_file, "-n", "10", "-l", "5", "--seed", "1",
+                                        "-o", "edge-list")
+        self.assertEqual(0, code)
+        self.assertTrue(output.startswith(output_file + ": 10 vertices, 5 edges ("))
+        self.assertEqual(5, GraphReader().read_csr(GraphRepresentation.EDGE_LIST, output_file).edges_number)
+
+    def test_generate_incorrect_arguments(self):
+        code, output = self.run_command("generate", self.output_dir + "/generated.txt", "-n", "1", "-l", "5",
+                                        "-o", "edge-list")
+        self.assertEqual(1, code)
+        self.assertEqual("Error: The number of vertices is smaller than 2\n", output)
+
+    def test_serve(self):
+        with tempfile.TemporaryDirectory() as directory:
+            socket_path = os.path.join(directory, "graphs.sock")
+            results = []
+            server = threading.Thread(target=lambda: results.append(self.run_command("serve", "--socket",
+                                                                                      socket_path, "-j", "1")))
+            server.start()
+            while not os.path.exists(socket_path):
+                time.sleep(0.01)
+            with ServiceClient(socket_path) as client:
+                self.assertTrue(client.request("load", name="g", file="test_data/generated.txt",
+                                               representation="adjacency-matrix")["ok"])
+                self.assertTrue(client.request("shutdown")["ok"])
+            server.join()
+        self.assertEqual([(0, "serving on " + socket_path + "\n")], results)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from unittest import mock
+
+import numpy as np
+
+import DensityRenderer
+from CSRAdjacency import CSRAdjacency
+from DensityRenderer import *
+
+
+def read_png(filename) -> np.ndarray:
+    """Read an RGB image written by write_png"""
+    with open(filename, "rb") as f:
+        data = f.read()
+    chunks, position = {}, len(PNG_SIGNATURE)
+    while position < len(data):
+        length, kind = struct.unpack(">I4s", data[position:position + 8])
+        chunks[kind] = chunks.get(kind, b"") + data[position + 8:position + 8 + length]
+        position += 12 + length
+    width, height = struct.unpack(">II", chunks[b"IHDR"][:8])
+    rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, 1 + 3 * width)
+    return rows[:, 1:].reshape(height, width, 3)
+
+
+class DensityRendererTestCase(unittest.TestCase):
+
+    def test_horizontal_chord(self):
+        density = accumulate_chords(np.array([[1.0, 2.0], [6.0, 2.0]]), np.array([0]), np.array([1]), 8)
+        self.assertEqual([0, 1, 1, 1, 1, 1, 1, 0], density[2].tolist())
+        self.assertEqual(6, density.sum())
+
+    # chunks of a few chords, so that the chords are split between many chunks
+    @mock.patch.object(DensityRenderer, "SAMPLE_CHUNK", 200)
+    def test_chords_match_sampling_one_by_one(self):
+        rng = np.random.default_rng(1)
+        first, second = rng.random((300, 2)) * 49, rng.random((300, 2)) * 49
+        expected = np.zeros((50, 50), dtype=np.int64)
+        for start, end in zip(first, second):
+            samples = int(np.ceil(np.abs(end - start).max())) + 1
+            points = start + (end - start) * (np.arange(samples) / max(samples - 1, 1))[:, np.newaxis]
+            pixels = np.floor(points + 0.5).astype(int)
+            np.add.at(expected, (pixels[:, 1], pixels[:, 0]), 1)
+        nodes = np.concatenate((first, second))
+        np.testing.assert_array_equal(expected, accumulate_chords(nodes, np.arange(300), np.arange(300, 600), 50))
+
+    # blocks of 3 chords, a vertex of degree 29 still makes a block of its own
+    @mock.patch.object(DensityRenderer, "SAMPLE_CHUNK", 41 * 3)
+    def test_render_in_blocks_of_edges(self):
+        csr = CSRAdjacency.from_edges(30, *np.triu_indices(30, 1))
+        with mock.patch.object(DensityRenderer, "accumulate_chords", wraps=accumulate_chords) as accumulate:
+            render_density(csr, 40)
+        blocks = [call.args[1:3] for call in accumulate.call_args_list]
+        self.assertLessEqual(max(len(first) for first, _ in blocks), 29)
+        self.assertGreater(len(blocks), 10)
+        self.assertEqual([vertices.tolist() for vertices in csr.edges()],
+                         np.concatenate(blocks, axis=1).tolist())
+
+    def test_tone_map(self):
+        density = np.array([0.0, 1.0, 3.0])
+        np.testing.assert_allclose([0, 0.5, 1], tone_map(density))
+        np.testing.assert_allclose([0, 0.5, 0.875], tone_map(density, "alpha", 0.5))
+        np.testing.assert_array_equal([0, 0], tone_map(np.zeros(2)))
+
+    def test_render_and_write_png(self):
+        csr = CSRAdjacency.from_edges(4, np.array([0, 1]), np.array([2, 3]))
+        image = render_density(csr, 64)
+        self.assertEqual((64, 64, 3), image.shape)
+        self.assertEqual(list(BACKGROUND), image[0, 0].tolist())
+        # both chords cross the center
+        self.assertEqual(list(EDGE_COLOR), image[32, 32].tolist())
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "graph.png")
+            write_png(filename, image)
+            np.testing.assert_array_equal(image, read_png(filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from collections import deque
+
+import numpy as np
+
+from CSRAdjacency import CSRAdjacency
+from GraphAlgorithms import *
+from RandomGraphGenerator import random_graph_edges
+from GraphRepresentation import GraphRepresentation
+
+
+def loop_bfs(adjacency_list, source):
+    distances = [-1] * len(adjacency_list)
+    distances[source] = 0
+    queue = deque([source])
+    while queue:
+        vertex = queue.popleft()
+        for neighbor in adjacency_list[vertex]:
+            if distances[neighbor - 1] == -1:
+                distances[neighbor - 1] = distances[vertex] + 1
+                queue.append(neighbor - 1)
+    return distances
+
+
+class GraphAlgorithmsTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # path 0-1-2, triangle 3-4-5 and isolated vertex 6
+        self.csr = CSRAdjacency.from_edges(7, [0, 1, 3, 4, 3], [1, 2, 4, 5, 5])
+        edges = random_graph_edges(300, 400, GraphRepresentation.EDGE_LIST, seed=3)[0] - 1
+        self.random_csr = CSRAdjacency.from_edges(300, edges[:, 0], edges[:, 1])
+
+    def test_degree_sequence(self):
+        self.assertEqual([2, 2, 2, 2, 1, 1, 0], degree_sequence(self.csr).tolist())
+
+    def test_bfs_distances(self):
+        self.assertEqual([0, 1, 2, -1, -1, -1, -1], bfs_distances(self.csr, 0).tolist())
+        self.assertEqual([-1, -1, -1, -1, -1, -1, 0], bfs_distances(self.csr, 6).tolist())
+
+    def test_bfs_distances_match_loop(self):
+        adjacency_list = self.random_csr.to_adjacency_list()
+        for source in (0, 17, 299):
+            self.assertEqual(loop_bfs(adjacency_list, source), bfs_distances(self.random_csr, source).tolist())
+
+    def test_bfs_source_out_of_bounds(self):
+        with self.assertRaises(IndexError):
+            bfs_distances(self.csr, 7)
+
+    def test_connected_components(self):
+        self.assertEqual([0, 0, 0, 1, 1, 1, 2], connected_components(self.csr).tolist())
+
+    def test_components_match_bfs(self):
+        components = connected_components(self.random_csr)
+        for source in (0, 17, 299):
+            reachable = bfs_distances(self.random_csr, source) >= 0
+            self.assertTrue(np.array_equal(reachable, components == components[source]))
+
+    def test_largest_component(self):
+        self.assertEqual([0, 1, 2], largest_component(self.csr).tolist())
+        self.assertEqual(0, len(largest_component(CSRAdjacency.from_edges(0, [], []))))
+
+    def test_induced_subgraph(self):
+        subgraph = induced_subgraph(self.csr, np.array([3, 4, 5]))
+        self.assertEqual(CSRAdjacency.from_edges(3, [0, 1, 0], [1, 2, 2]), subgraph)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from Graph import Graph
+from GraphConverter import *
+from RandomGraphGenerator import random_graph_probability
+
+
+def loop_adj_mat_to_adj_list(graph) -> list:
+    """Conversion of the loops used before the vectorized converter"""
+    return [[j + 1 for j, item in enumerate(row) if item == 1] for row in graph]
+
+
+def loop_adj_mat_to_inc_mat(graph) -> np.ndarray:
+    """Conversion of the loops used before the vectorized converter, with n rows for a graph without edges"""
+    columns = []
+    for i, row in enumerate(graph):
+        for j in range(i):
+            if row[j] == 1:
+                column = [0] * len(graph)
+                column[i] = column[j] = 1
+                columns.append(column)
+    return np.array(columns, dtype=int).reshape(-1, len(graph)).transpose()
+
+
+def loop_adj_list_to_adj_mat(adjacency_list) -> np.ndarray:
+    """Conversion of the loops used before the vectorized converter"""
+    matrix = np.zeros((len(adjacency_list), len(adjacency_list)), dtype=int)
+    for i, row in enumerate(adjacency_list):
+        for item in row:
+            matrix[i][item - 1] = 1
+    return matrix
+
+
+def loop_inc_mat_to_adj_mat(incidence_matrix) -> np.ndarray:
+    """Conversion of the loops used before the vectorized converter"""
+    matrix = np.zeros((len(incidence_matrix), len(incidence_matrix)), dtype=int)
+    for column in np.asarray(incidence_matrix).transpose():
+        i, j = [k for k, item in enumerate(column) if item == 1]
+        matrix[i][j] = matrix[j][i] = 1
+    return matrix
+
+
+class GraphConverterTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # edges 1-2, 1-3, 3-4 and 2-4, vertex 5 is isolated
+        self.adjacency_matrix = np.array([[0, 1, 1, 0, 0],
+                                          [1, 0, 0, 1, 0],
+                                          [1, 0, 0, 1, 0],
+                                          [0, 1, 1, 0, 0],
+                                          [0, 0, 0, 0, 0]])
+        self.adjacency_list = [[2, 3], [1, 4], [1, 4], [2, 3], []]
+        # columns are ordered by the higher and then by the lower vertex
+        self.incidence_matrix = np.array([[1, 1, 0, 0],
+                                          [1, 0, 1, 0],
+                                          [0, 1, 0, 1],
+                                          [0, 0, 1, 1],
+                                          [0, 0, 0, 0]])
+        self.edge_list = np.array([[1, 2], [1, 3], [2, 4], [3, 4]])
+
+    def assert_all_conversions(self, adjacency_matrix, adjacency_list, incidence_matrix):
+        self.assertEqual(adjacency_list, convert_adj_mat_to_adj_list(adjacency_matrix))
+        self.assertEqual(adjacency_list, convert_inc_mat_to_adj_list(incidence_matrix))
+        np.testing.assert_array_equal(adjacency_matrix, convert_adj_list_to_adj_mat(adjacency_list))
+        np.testing.assert_array_equal(adjacency_matrix, convert_inc_mat_to_adj_mat(incidence_matrix))
+        np.testing.assert_array_equal(incidence_matrix, convert_adj_mat_to_inc_mat(adjacency_matrix))
+        np.testing.assert_array_equal(incidence_matrix, convert_adj_list_to_inc_mat(adjacency_list))
+
+    def test_hand_written_graph(self):
+        self.assert_all_conversions(self.adjacency_matrix, self.adjacency_list, self.incidence_matrix)
+        vertices_number, edges = convert_to_edges(self.edge_list, GraphRepresentation.EDGE_LIST, 5)
+        self.assertEqual(5, vertices_number)
+        np.testing.assert_array_equal(self.edge_list - 1, edges)
+        np.testing.assert_array_equal(self.adjacency_matrix, convert_graph(
+            self.edge_list, GraphRepresentation.EDGE_LIST, GraphRepresentation.ADJACENCY_MATRIX, 5))
+
+    def test_loops_on_random_graphs(self):
+        for seed in range(5):
+            matrix, _ = random_graph_probability(30, 0.2, seed=seed)
+            adjacency_list = loop_adj_mat_to_adj_list(matrix)
+            self.assertEqual(adjacency_list, convert_adj_mat_to_adj_list(matrix))
+            np.testing.assert_array_equal(loop_adj_mat_to_inc_mat(matrix), convert_adj_mat_to_inc_mat(matrix))
+            np.testing.assert_array_equal(loop_adj_list_to_adj_mat(adjacency_list),
+                                          convert_adj_list_to_adj_mat(adjacency_list))
+            incidence_matrix = loop_adj_mat_to_inc_mat(matrix)
+            np.testing.assert_array_equal(loop_inc_mat_to_adj_mat(incidence_matrix),
+                                          convert_inc_mat_to_adj_mat(incidence_matrix))
+
+    def test_graph_without_edges(self):
+        self.assert_all_conversions(np.zeros((3, 3), dtype=int), [[], [], []], np.zeros((3, 0), dtype=int))
+        vertices_number, edges = convert_to_edges(np.zeros((3, 0)), GraphRepresentation.INCIDENCE_MATRIX)
+        self.assertEqual(3, vertices_number)
+        self.assertEqual((0, 2), edges.shape)
+        self.assertEqual((3, 0), convert_adj_mat_to_inc_mat(np.zeros((3, 3), dtype=int)).shape)
+
+    def test_isolated_last_vertices(self):
+        adjacency_list = [[2], [1], [], []]
+        adjacency_matrix = loop_adj_list_to_adj_mat(adjacency_list)
+        incidence_matrix = np.array([[1], [1], [0], [0]])
+        self.assert_all_conversions(adjacency_matrix, adjacency_list, incidence_matrix)
+        np.testing.assert_array_equal(adjacency_matrix, convert_graph(
+            np.array([[1, 2]]), GraphRepresentation.EDGE_LIST, GraphRepresentation.ADJACENCY_MATRIX, 4))
+        # without the number of vertices an edge list only knows the highest numbered vertex
+        self.assertEqual(2, convert_to_edges(np.array([[1, 2]]), GraphRepresentation.EDGE_LIST)[0])
+
+    def test_incorrect_incidence_matrix(self):
+        with self.assertRaises(IncorrectInputException):
+            convert_inc_mat_to_adj_mat(np.array([[1], [0], [0]]))
+        with self.assertRaises(IncorrectInputException):
+            convert_inc_mat_to_adj_mat(np.array([[1], [1], [1]]))
+
+    def test_write_incidence_matrix_without_edges(self):
+        graph = Graph()
+        graph.set_graph((np.zeros((2, 2), dtype=int), GraphRepresentation.ADJACENCY_MATRIX))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "graph.txt")
+            self.assertTrue(graph.write_file(GraphRepresentation.INCIDENCE_MATRIX, filename, False))
+            with open(filename, "rb") as f:
+                self.assertEqual(b"\n\n", f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import unittest
+from unittest import mock
+
+from matplotlib.axes import Axes
+
+from Graph import Graph
+from GraphRepresentation import GraphRepresentation
+from RandomGraphGenerator import random_graph_edges
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class GraphDrawingTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.filename = "test_data/drawing.png"
+
+    def tearDown(self) -> None:
+        if os.path.exists("data/" + self.filename):
+            os.remove("data/" + self.filename)
+
+    def draw(self, graph) -> int:
+        """Save the drawing of the graph and return the number of labels drawn"""
+        with mock.patch.object(Axes, "annotate", autospec=True, side_effect=Axes.annotate) as annotate:
+            graph.draw_on_circle(True, self.filename)
+        with open("data/" + self.filename, "rb") as f:
+            self.assertEqual(PNG_SIGNATURE, f.read(len(PNG_SIGNATURE)))
+        return annotate.call_count
+
+    def test_small_graph_is_saved_with_labels(self):
+        graph = Graph()
+        graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+        self.assertEqual(15, self.draw(graph))
+
+    def test_graph_above_labels_limit_is_saved_without_labels(self):
+        graph = Graph()
+        graph.set_graph(random_graph_edges(Graph.LABELS_LIMIT + 1, 300, seed=1, sparse=True))
+        self.assertEqual(0, self.draw(graph))
+
+
+if __name__ == '__main__':
+    unittest.main()
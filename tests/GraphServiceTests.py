@@ -0,0 +1,137 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from CommandLine import graph_statistics
+from Graph import Graph
+from GraphRepresentation import GraphRepresentation
+from GraphService import *
+
+
+class GraphRegistryTestCase(unittest.IsolatedAsyncioTestCase):
+
+    def graph(self) -> Graph:
+        graph = Graph()
+        graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+        return graph
+
+    async def test_least_recently_used_idle_graph_is_evicted(self):
+        registry = GraphRegistry()
+        for name in "abc":
+            registry.put(name, self.graph())
+        registry.memory_cap = registry.memory() - 1
+        async with registry.using("a"):
+            pass
+        self.assertEqual(["b"], registry.evict())
+        self.assertEqual(["c", "a"], list(registry.entries))
+
+    async def test_busy_graph_is_not_evicted(self):
+        registry = GraphRegistry(0)
+        registry.put("a", self.graph())
+        registry.put("b", self.graph())
+        async with registry.using("a"):
+            self.assertEqual([], registry.evict())
+        # "a" became the most recently used graph
+        self.assertEqual(["b"], registry.evict())
+        self.assertEqual(1, registry.evicted)
+
+    def test_unknown_graph(self):
+        with self.assertRaises(ValueError):
+            GraphRegistry().entry("a")
+
+
+class LatencyMetricsTestCase(unittest.TestCase):
+
+    def test_summary(self):
+        metrics = LatencyMetrics(window=3)
+        for seconds in (10.0, 1.0, 2.0, 3.0):
+            metrics.add("stats", seconds)
+        metrics.add("stats", 2.0, failed=True)
+        summary = metrics.summary()["stats"]
+        self.assertEqual((5, 1, 10.0), (summary["count"], summary["errors"], summary["max"]))
+        self.assertAlmostEqual(3.6, summary["mean"])
+        # the percentiles are computed over the last 3 requests
+        self.assertEqual(2.0, summary["p50"])
+
+
+class GraphServiceTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, "graphs.sock")
+        self.service = GraphService(workers=2)
+        self.serving = asyncio.create_task(self.service.serve(self.socket_path))
+        while not os.path.exists(self.socket_path):
+            await asyncio.sleep(0.01)
+        self.reader, self.writer = await asyncio.open_unix_connection(self.socket_path)
+        self.output = "test_data/service_adj_list.txt"
+
+    async def asyncTearDown(self) -> None:
+        await self.request("shutdown")
+        await self.serving
+        self.writer.close()
+        self.directory.cleanup()
+        if os.path.exists("data/" + self.output):
+            os.remove("data/" + self.output)
+
+    async def request(self, command, **arguments) -> dict:
+        self.writer.write(json.dumps(dict(arguments, command=command)).encode() + b"\n")
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def test_load_stats_and_convert(self):
+        loaded = await self.request("load", name="g", file="test_data/generated.txt",
+                                    representation="adjacency-matrix")
+        self.assertTrue(loaded["ok"])
+        stats = await self.request("stats", name="g")
+        graph = Graph()
+        graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+        self.assertEqual(dict(graph_statistics(graph), evicted=[]), stats["result"])
+        converted = await self.request("convert", name="g", output=self.output, representation="adjacency-list")
+        self.assertTrue(converted["ok"])
+        with open("data/" + self.output) as f, open("data/test_data/generated_adj_list.txt") as expected:
+            self.assertEqual(expected.read().split(), f.read().split())
+
+    async def test_pipelined_requests_are_answered(self):
+        for i in range(3):
+            self.writer.write(json.dumps({"id": i, "command": "generate", "name": str(i), "vertices": 50,
+                                          "edges": 100, "seed": i}).encode() + b"\n")
+        responses = [json.loads(await self.reader.readline()) for _ in range(3)]
+        self.assertEqual([0, 1, 2], sorted(response["id"] for response in responses))
+        self.assertTrue(all(response["result"]["edges"] == 100 for response in responses))
+        listed = await self.request("list")
+        self.assertEqual({"0", "1", "2"}, set(listed["result"]["graphs"]))
+
+    async def test_errors_are_reported(self):
+        self.assertIn("unknown graph", (await self.request("stats", name="missing"))["error"])
+        self.assertIn("missing field", (await self.request("load", name="g"))["error"])
+        self.assertFalse((await self.request("load", name="g", file="test_data/one.txt",
+                                             representation="adjacency-matrix"))["ok"])
+        self.writer.write(b"not json\n")
+        self.assertIn("bad request", json.loads(await self.reader.readline())["error"])
+        metrics = (await self.request("metrics"))["result"]["latency"]
+        self.assertEqual(2, metrics["load"]["errors"])
+
+    async def test_files_outside_data_folder_are_rejected(self):
+        loaded = await self.request("load", name="g", file="../README.md", representation="adjacency-list")
+        self.assertIn("file should be inside the data folder", loaded["error"])
+        await self.request("generate", name="g", vertices=5, edges=4, seed=1)
+        for output in ("../service_graph.txt", "test_data/../../service_graph.txt"):
+            converted = await self.request("convert", name="g", output=output, representation="edge-list")
+            self.assertIn("output should be inside the data folder", converted["error"])
+            rendered = await self.request("render", name="g", output=output)
+            self.assertFalse(rendered["ok"])
+        self.assertFalse(os.path.exists("service_graph.txt"))
+
+    async def test_memory_cap_evicts_idle_graphs(self):
+        self.service.registry.memory_cap = 1
+        await self.request("generate", name="a", vertices=50, edges=100, seed=1)
+        generated = await self.request("generate", name="b", vertices=50, edges=100, seed=2)
+        self.assertEqual(["a"], generated["result"]["evicted"])
+        self.assertEqual(1, (await self.request("metrics"))["result"]["evicted"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from CSRAdjacency import CSRAdjacency
+from Graph import Graph
+from GraphConverter import IncorrectInputException
+from GraphRepresentation import GraphRepresentation
+from RepresentationCache import estimate_size
+from StoragePolicy import PACKED
+from StoragePolicy import using_policy
+
+
+class GraphCacheTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.graph = Graph()
+        self.graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+
+    def test_representation_is_cached(self):
+        incidence_matrix = self.graph.get_graph(GraphRepresentation.INCIDENCE_MATRIX)
+        self.assertIs(incidence_matrix, self.graph.get_graph(GraphRepresentation.INCIDENCE_MATRIX))
+
+    def test_cached_adjacency_list_is_copied(self):
+        adjacency_list = self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST)
+        adjacency_list[1].append(99)
+        adjacency_list.clear()
+        self.assertEqual([[], [9, 10, 14, 15]], self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST)[:2])
+
+    def test_cached_matrix_is_read_only(self):
+        with self.assertRaises(ValueError):
+            self.graph.get_graph(GraphRepresentation.INCIDENCE_MATRIX)[0, 0] = 1
+
+    def test_cached_packed_and_sparse_matrices_are_read_only(self):
+        incidence_matrix = self.graph.get_graph(GraphRepresentation.INCIDENCE_MATRIX, sparse=True)
+        for array in (incidence_matrix.first, incidence_matrix.second):
+            with self.assertRaises(ValueError):
+                array[0] = 1
+        with using_policy(PACKED):
+            self.graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+            with self.assertRaises(ValueError):
+                self.graph.get_graph(GraphRepresentation.ADJACENCY_MATRIX).bits[0, 0] = 1
+
+    def test_sparse_is_cached_only_for_incidence_matrix(self):
+        adjacency_list = self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST, sparse=True)
+        self.assertEqual(adjacency_list, self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST))
+        self.graph.get_graph(GraphRepresentation.INCIDENCE_MATRIX, sparse=True)
+        self.graph.get_graph(GraphRepresentation.INCIDENCE_MATRIX)
+        self.assertEqual(list(self.graph.cache.entries), [(GraphRepresentation.ADJACENCY_LIST, False),
+                                                          (GraphRepresentation.INCIDENCE_MATRIX, True),
+                                                          (GraphRepresentation.INCIDENCE_MATRIX, False)])
+
+    def test_set_graph_invalidates_cache(self):
+        self.graph.get_graph(GraphRepresentation.ADJACENCY_MATRIX)
+        self.graph.set_graph((np.array([[0, 1], [1, 0]]), GraphRepresentation.ADJACENCY_MATRIX))
+        self.assertEqual(self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST), [[2], [1]])
+
+    def test_budget_evicts_least_recently_used(self):
+        matrix_size = estimate_size(self.graph.get_graph(GraphRepresentation.ADJACENCY_MATRIX))
+        edge_list_size = estimate_size(self.graph.get_graph(GraphRepresentation.EDGE_LIST))
+        graph = Graph(cache_budget=matrix_size + edge_list_size - 1)
+        graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+        graph.get_graph(GraphRepresentation.EDGE_LIST)
+        graph.get_graph(GraphRepresentation.ADJACENCY_MATRIX)
+        self.assertEqual(list(graph.cache.entries), [(GraphRepresentation.ADJACENCY_MATRIX, False)])
+        self.assertEqual(matrix_size, graph.cache.size)
+
+    def test_budget_evicts_largest(self):
+        sizes = [estimate_size(self.graph.get_graph(representation)) for representation in
+                 (GraphRepresentation.EDGE_LIST, GraphRepresentation.INCIDENCE_MATRIX,
+                  GraphRepresentation.ADJACENCY_MATRIX)]
+        graph = Graph(cache_budget=sum(sizes) - 1)
+        graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+        graph.get_graph(GraphRepresentation.EDGE_LIST)
+        graph.get_graph(GraphRepresentation.INCIDENCE_MATRIX)
+        graph.get_graph(GraphRepresentation.ADJACENCY_MATRIX)
+        # the incidence matrix is the largest, the edge list is least recently used but stays
+        self.assertEqual(list(graph.cache.entries), [(GraphRepresentation.EDGE_LIST, False),
+                                                     (GraphRepresentation.ADJACENCY_MATRIX, False)])
+
+
+class GraphMutationTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.graph = Graph()
+        self.graph.set_graph((np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]]), GraphRepresentation.ADJACENCY_MATRIX))
+
+    def test_add_and_remove_edge(self):
+        self.assertTrue(self.graph.add_edge(0, 2))
+        self.assertFalse(self.graph.add_edge(2, 0))
+        self.assertEqual([[2, 3], [1, 3], [1, 2]], self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST))
+        self.assertTrue(self.graph.remove_edge(1, 0))
+        self.assertFalse(self.graph.remove_edge(1, 0))
+        self.assertEqual([[3], [3], [1, 2]], self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST))
+
+    def test_adjacency_matrix_is_changed_through_updates(self):
+        with self.assertRaises(ValueError):
+            self.graph.adjacency_matrix[0][2] = 1
+        self.graph.add_edge(0, 2)
+        self.assertEqual(1, self.graph.adjacency_matrix[0][2])
+        self.graph.adjacency_matrix = np.zeros((2, 2), dtype=int)
+        self.assertEqual(0, self.graph.csr.edges_number)
+
+    def test_incorrect_edge(self):
+        with self.assertRaises(IncorrectInputException):
+            self.graph.add_edge(1, 1)
+        with self.assertRaises(IncorrectInputException):
+            self.graph.add_edges([[0, 3]])
+
+    def test_add_vertex(self):
+        self.assertEqual(3, self.graph.add_vertex())
+        self.graph.add_edge(3, 0)
+        self.assertEqual(4, self.graph.vertices_number)
+        self.assertEqual([[2, 4], [1, 3], [2], [1]], self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST))
+
+    def test_remove_vertex_renumbers(self):
+        self.graph.add_edge(0, 2)
+        self.graph.remove_vertex(1)
+        self.assertEqual([[2], [1]], self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST))
+
+    def test_batch_updates(self):
+        self.graph.add_vertices(2)
+        self.graph.add_edges([[3, 4], [0, 4], [1, 0]])
+        self.graph.remove_edges([[2, 1], [3, 2]])
+        self.assertEqual([[2, 5], [1], [], [5], [1, 4]], self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST))
+
+    def test_batch_after_single_updates(self):
+        self.graph.add_edge(0, 2)
+        self.graph.remove_edges([[0, 1]])
+        self.graph.add_edges([[1, 0]])
+        self.assertEqual(self.graph.csr, CSRAdjacency.from_edges(3, [0, 0, 1], [1, 2, 2]))
+
+    def test_set_edge_list_with_vertex_count(self):
+        self.graph.set_graph((np.array([[1, 2]]), GraphRepresentation.EDGE_LIST, 3))
+        self.assertEqual([[0, 1, 0], [1, 0, 0], [0, 0, 0]], self.graph.adjacency_matrix.tolist())
+
+    def test_empty_graph(self):
+        graph = Graph()
+        graph.add_vertices(2)
+        graph.add_edge(0, 1)
+        self.assertEqual("0 1\n1 0", str(graph))
+
+
+class GraphStartupTestCase(unittest.TestCase):
+
+    def run_python(self, code, **env) -> str:
+        environment = {name: value for name, value in os.environ.items() if name not in ("DISPLAY", "MPLBACKEND")}
+        environment.update(env, PYTHONPATH=os.pathsep.join(sys.path))
+        return subprocess.run([sys.executable, "-c", code], env=environment, capture_output=True, text=True,
+                              check=True).stdout.strip()
+
+    def test_matplotlib_is_loaded_lazily(self):
+        self.assertEqual("False", self.run_python("import sys, CommandLine; print('matplotlib' in sys.modules)"))
+
+    def test_headless_backend(self):
+        self.assertEqual("agg", self.run_python(
+            "import GraphDrawing; print(GraphDrawing.pyplot().get_backend().lower())"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from Graph import Graph
+from GraphRepresentation import GraphRepresentation
+from GraphWriter import *
+from RandomGraphGenerator import random_graph_probability
+
+
+def savetxt_output(graph) -> bytes:
+    """Output of the writer used before GraphWriter"""
+    if isinstance(graph, list):
+        return "".join(" ".join(str(item) for item in row) + "\n" for row in graph).encode()
+    output = io.BytesIO()
+    np.savetxt(output, graph, fmt="%i")
+    return output.getvalue()
+
+
+class GraphWriterTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.graph = Graph()
+        self.graph.set_graph(random_graph_probability(60, 0.1, seed=3))
+        # blocks of a few rows, so that every graph is written in many blocks
+        self.writer = GraphWriter(block_size=64)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_format_rows(self):
+        self.assertEqual(b"5 -3\n\n0 123\n", format_rows([5, -3, 0, 123], [0, 2, 2, 4]))
+        self.assertEqual(b"", format_rows([], [0]))
+
+    def test_format_binary_rows(self):
+        self.assertEqual(b"1 0\n0 1\n", format_binary_rows(np.eye(2, dtype=np.uint8)))
+        self.assertEqual(b"\n\n", format_binary_rows(np.zeros((2, 0), dtype=bool)))
+
+    def test_output_matches_savetxt(self):
+        for representation in GraphRepresentation:
+            graph = self.graph.get_graph(representation)
+            blocks = self.writer.list_blocks(graph) if isinstance(graph, list) else self.writer.matrix_blocks(graph)
+            self.assertEqual(savetxt_output(graph), b"".join(blocks), representation)
+
+    def test_matrix_with_other_values(self):
+        matrix = np.array([[0, 12, -7], [100000, 1, 0]])
+        self.assertEqual(savetxt_output(matrix), b"".join(self.writer.matrix_blocks(matrix)))
+
+    def test_sparse_forms(self):
+        csr = self.graph.csr
+        self.assertEqual(savetxt_output(csr.to_adjacency_list()),
+                         b"".join(self.writer.row_blocks(csr.indices, csr.indptr, 1)))
+        self.assertEqual(savetxt_output(csr.to_dense()), b"".join(self.writer.matrix_blocks(csr)))
+
+    def test_compression(self):
+        # the edge list starts with the number of vertices
+        expected = b"%d\n" % self.graph.vertices_number + savetxt_output(
+            self.graph.get_graph(GraphRepresentation.EDGE_LIST))
+        for name, module in (("graph.txt.gz", gzip), ("graph.txt.bz2", bz2)):
+            filename = os.path.join(self.directory.name, name)
+            self.graph.write_file(GraphRepresentation.EDGE_LIST, filename, False)
+            with module.open(filename) as f:
+                self.assertEqual(expected, f.read())
+        filename = os.path.join(self.directory.name, "graph.txt")
+        self.graph.write_file(GraphRepresentation.EDGE_LIST, filename, False, compression="xz")
+        with lzma.open(filename) as f:
+            self.assertEqual(expected, f.read())
+
+    def test_unsupported_graph(self):
+        self.assertFalse(self.writer.write(os.path.join(self.directory.name, "graph.txt"), None))
+
+
+if __name__ == '__main__':
+    unittest.main()
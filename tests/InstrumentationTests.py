@@ -0,0 +1,67 @@
+import json
+import unittest
+
+import numpy as np
+
+from Graph import Graph
+from GraphConverter import IncorrectInputException
+from GraphRepresentation import GraphRepresentation
+from Instrumentation import *
+
+
+class InstrumentationTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.graph = Graph()
+
+    def test_disabled_records_nothing(self):
+        self.graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+        self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST)
+        self.assertEqual([], self.graph.instrumentation.records)
+
+    def test_nested_stages(self):
+        self.graph.instrumentation.enable()
+        self.graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+        records = {record.stage: record for record in self.graph.instrumentation.records}
+        self.assertEqual(0, records["Graph.read_data"].depth)
+        self.assertEqual(1, records["GraphReader.read_csr"].depth)
+        self.assertIn("GraphValidation.are_entries_symmetrical", records)
+        self.assertEqual(450, records["Graph.read_data"].input_size)
+        self.assertIsNone(records["Graph.read_data"].peak_bytes)
+
+    def test_peak_memory(self):
+        self.graph.instrumentation.enable(memory=True)
+        try:
+            self.graph.set_graph((np.ones((100, 100), dtype=int) - np.eye(100, dtype=int),
+                                  GraphRepresentation.ADJACENCY_MATRIX))
+            self.graph.get_graph(GraphRepresentation.INCIDENCE_MATRIX)
+        finally:
+            self.graph.instrumentation.disable()
+        summary = self.graph.instrumentation.summary()
+        self.assertEqual(1, summary["Graph.get_graph"]["calls"])
+        # the dense incidence matrix has 100 x 4950 cells
+        self.assertGreaterEqual(summary["Graph.get_graph"]["peak_bytes"], 100 * 4950)
+
+    def test_error_is_recorded(self):
+        self.graph.instrumentation.enable()
+        with self.assertRaises(IncorrectInputException):
+            self.graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/non_zero_on_diag.txt")
+        self.assertEqual("IncorrectInputException", self.graph.instrumentation.records[-1].error)
+
+    def test_callback_and_json(self):
+        stages = []
+        instrumentation = Instrumentation(enabled=True)
+        instrumentation.add_callback(lambda record: stages.append(record.stage))
+        with instrumentation.stage("outer", 10) as record:
+            with stage("inner"):
+                pass
+            record.output_size = 20
+        self.assertEqual(["inner", "outer"], stages)
+        exported = json.loads(instrumentation.to_json())
+        self.assertEqual({"stage": "outer", "depth": 0, "input_size": 10, "output_size": 20},
+                         {key: exported["records"][1][key] for key in ("stage", "depth", "input_size", "output_size")})
+        self.assertEqual(1, exported["summary"]["inner"]["calls"])
+
+
+if __name__ == '__main__':
+    unittest.main()
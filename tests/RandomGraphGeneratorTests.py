@@ -1,4 +1,7 @@
 import unittest
+from unittest import mock
+
+import RandomGraphGenerator
 from RandomGraphGenerator import *
 
 
@@ -16,6 +19,16 @@ class TestRandomGraphGenerator(unittest.TestCase):
         self.assertEqual(result.sum(), 6)
         self.assertEqual(result.shape, (4, 3))
 
+    def test_random_graph_edges_edge_list(self):
+        result, representation = random_graph_edges(6, 15, GraphRepresentation.EDGE_LIST)
+        self.assertEqual(representation, GraphRepresentation.EDGE_LIST)
+        self.assertEqual(result.shape, (15, 2))
+        self.assertTrue((result[:, 0] < result[:, 1]).all())
+        self.assertEqual(len({tuple(edge) for edge in result.tolist()}), 15)
+
+    def test_random_graph_edges_seed(self):
+        self.assertTrue((random_graph_edges(30, 40, seed=7)[0] == random_graph_edges(30, 40, seed=7)[0]).all())
+
     def test_random_graph_probability(self):
         n = 4
         p = 0.5
@@ -24,6 +37,16 @@ class TestRandomGraphGenerator(unittest.TestCase):
         self.assertEqual(result.diagonal().sum(), 0)
         self.assertEqual(result.shape, (n, n))
 
+    def test_random_graph_probability_geometric(self):
+        result, representation = random_graph_probability(6, 1, "geometric")
+        self.assertEqual(representation, GraphRepresentation.INCIDENCE_MATRIX)
+        self.assertEqual(result.shape, (6, 15))
+        self.assertEqual(random_graph_probability(6, 0, "geometric")[0].shape, (6, 0))
+
+    def test_random_graph_probability_seed(self):
+        self.assertTrue((random_graph_probability(30, 0.3, seed=7)[0] ==
+                         random_graph_probability(30, 0.3, seed=7)[0]).all())
+
     def test_random_graph_probability_bad_vertices(self):
         with self.assertRaises(BadNumberOfVertices):
             random_graph_probability(0, 4)
@@ -34,6 +57,50 @@ class TestRandomGraphGenerator(unittest.TestCase):
         with self.assertRaises(BadProbability):
             random_graph_probability(3, -7)
 
+    def test_pairs_from_indices(self):
+        first, second = pairs_from_indices(np.arange(6))
+        self.assertEqual([1, 2, 2, 3, 3, 3], first.tolist())
+        self.assertEqual([0, 0, 1, 0, 1, 2], second.tolist())
+
+    # blocks of 64 pairs, so that small graphs are drawn in many blocks
+    @mock.patch.object(RandomGraphGenerator, "PAIR_BLOCK_SIZE", 64)
+    def test_same_graph_for_any_number_of_workers(self):
+        dense = random_graph_probability(60, 0.2, "dense", seed=5)[0]
+        geometric = random_graph_probability(60, 0.2, "geometric", seed=5)[0]
+        edge_list = random_graph_edges(60, 300, GraphRepresentation.EDGE_LIST, seed=5)[0]
+        for workers in (2, 3, None):
+            np.testing.assert_array_equal(dense, random_graph_probability(60, 0.2, "dense", 5, workers)[0])
+            np.testing.assert_array_equal(geometric.to_dense(),
+                                          random_graph_probability(60, 0.2, "geometric", 5, workers)[0].to_dense())
+            np.testing.assert_array_equal(edge_list, random_graph_edges(60, 300, GraphRepresentation.EDGE_LIST, 5,
+                                                                        workers=workers)[0])
+
+    @mock.patch.object(RandomGraphGenerator, "PAIR_BLOCK_SIZE", 64)
+    def test_random_graph_edges_blocks(self):
+        for edges in (1, 300, 1770):
+            result = random_graph_edges(60, edges, GraphRepresentation.EDGE_LIST, seed=edges, workers=2)[0]
+            self.assertEqual(edges, len({tuple(edge) for edge in result.tolist()}))
+            self.assertTrue((result[:, 0] < result[:, 1]).all())
+
+    def test_few_edges_among_many_vertices(self):
+        results = []
+        for workers in (1, 2):
+            with mock.patch.object(RandomGraphGenerator, "map_blocks") as map_blocks:
+                results.append(random_graph_edges(10 ** 7, 1000, GraphRepresentation.EDGE_LIST, seed=1,
+                                                  workers=workers)[0])
+            map_blocks.assert_not_called()
+        np.testing.assert_array_equal(results[0], results[1])
+        self.assertEqual(1000, len({tuple(edge) for edge in results[0].tolist()}))
+        self.assertTrue((results[0][:, 0] < results[0][:, 1]).all() and results[0].max() <= 10 ** 7)
+
+    # blocks of about 1000 chosen pairs among 5 * 10^13 pairs
+    @mock.patch.object(RandomGraphGenerator, "PAIR_BLOCK_SIZE", 1000)
+    def test_blocks_are_sized_by_chosen_pairs(self):
+        with mock.patch.object(RandomGraphGenerator, "map_blocks", wraps=map_blocks) as blocks:
+            result = random_graph_edges(10 ** 7, 5000, GraphRepresentation.EDGE_LIST, seed=1, workers=2)[0]
+        self.assertLess(len(blocks.call_args.args[1]), 10)
+        self.assertEqual(5000, len({tuple(edge) for edge in result.tolist()}))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,16 @@
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
+from Graph import Graph
+from GraphBinaryFormat import HEADER
+from GraphBinaryFormat import HEADER_SIZE
+from GraphBinaryFormat import save_binary
 from GraphReader import *
 from GraphRepresentation import GraphRepresentation
+from TextChunkParser import parse_integers
 
 
 class ReadAdjacencyMatrixTestCase(unittest.TestCase):
@@ -46,6 +55,13 @@ class ReadAdjacencyMatrixTestCase(unittest.TestCase):
             self.reader.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/non_zero_on_diag.txt")
         self.assertEqual(expected, str(ctx.exception), "Messages are not equal")
 
+    def test_not_binary_mat(self):
+        expected = "Incorrect input - Adjacency matrix built from input has values other than 0 and 1"
+
+        with self.assertRaises(IncorrectInputException) as ctx:
+            self.reader.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/not_binary_adj_mat.txt")
+        self.assertEqual(expected, str(ctx.exception), "Messages are not equal")
+
     def test_one_val_in_file(self):
         expected = "Incorrect input - Adjacency matrix built from input has non zero value on diagonal"
 
@@ -91,6 +107,13 @@ class ReadIncidenceMatrixTestCase(unittest.TestCase):
             self.reader.read_data(GraphRepresentation.INCIDENCE_MATRIX, "test_data/three_vals_in_col_inc_mat.txt")
         self.assertEqual(expected, str(ctx.exception), "Messages are not equal")
 
+    def test_not_binary_inc_mat(self):
+        expected = "Incorrect input - Incidence matrix built from input has values other than 0 and 1"
+
+        with self.assertRaises(IncorrectInputException) as ctx:
+            self.reader.read_data(GraphRepresentation.INCIDENCE_MATRIX, "test_data/not_binary_inc_mat.txt")
+        self.assertEqual(expected, str(ctx.exception), "Messages are not equal")
+
     def test_read_correct_input_mat(self):
         self.assertTrue(np.array_equal(self.graph, self.reader.read_data(GraphRepresentation.INCIDENCE_MATRIX,
                                                                          "test_data/generated_inc_mat.txt")))
@@ -124,6 +147,182 @@ class ReadAdjacencyListTestCase(unittest.TestCase):
         self.assertTrue(np.array_equal(self.graph, self.reader.read_data(GraphRepresentation.ADJACENCY_LIST,
                                                                          "test_data/generated_adj_list.txt")))
 
+    def test_read_in_small_chunks(self):
+        reader = GraphReader(chunk_size=5)
+        self.assertTrue(np.array_equal(self.graph, reader.read_data(GraphRepresentation.ADJACENCY_LIST,
+                                                                    "test_data/generated_adj_list.txt")))
+        self.assertTrue(np.array_equal(self.graph, reader.read_data(GraphRepresentation.INCIDENCE_MATRIX,
+                                                                    "test_data/generated_inc_mat.txt")))
+
+
+    def test_parse_integers(self):
+        values, lines, lines_number = parse_integers(b"12 -3\n\n7 1234567\n -40")
+        self.assertEqual([12, -3, 7, 1234567, -40], values.tolist())
+        self.assertEqual([0, 0, 2, 2, 3], lines.tolist())
+        self.assertEqual(4, lines_number)
+        for chunk in (b"1-2\n", b"- 1\n", b"--1\n", b"1 a\n"):
+            with self.assertRaises(IncorrectInputException):
+                parse_integers(chunk)
+
+
+class ReadEdgeListTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.reader = GraphReader()
+
+    def test_empty_file(self):
+        with self.assertRaises(IncorrectInputException):
+            self.reader.read_data(GraphRepresentation.EDGE_LIST, "test_data/emptyfile.txt")
+
+    def test_loop_in_edge_list(self):
+        expected = "Incorrect input - Matrix built from edge list has non zero value on diagonal"
+
+        with self.assertRaises(IncorrectInputException) as ctx:
+            self.reader.read_data(GraphRepresentation.EDGE_LIST, "test_data/loop_edge_list.txt")
+        self.assertEqual(expected, str(ctx.exception), "Messages are not equal")
+
+    def test_read_correct_edge_list(self):
+        expected = self.reader.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+        self.assertTrue(np.array_equal(expected, self.reader.read_data(GraphRepresentation.EDGE_LIST,
+                                                                       "test_data/generated_edge_list.txt")))
+
+
+class EdgeListRoundTripTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.filename = "test_data/round_trip_edge_list.txt"
+
+    def tearDown(self) -> None:
+        os.remove("data/" + self.filename)
+
+    def round_trip(self, csr) -> CSRAdjacency:
+        graph = Graph()
+        graph.csr = csr
+        graph.save_to_file(GraphRepresentation.EDGE_LIST, self.filename)
+        return GraphReader().read_csr(GraphRepresentation.EDGE_LIST, self.filename)
+
+    def test_isolated_last_vertex(self):
+        csr = CSRAdjacency.from_edges(3, [0], [1])
+        self.assertEqual(csr, self.round_trip(csr))
+
+    def test_graph_without_edges(self):
+        for vertices_number in (0, 4):
+            csr = CSRAdjacency.from_edges(vertices_number, [], [])
+            self.assertEqual(csr, self.round_trip(csr))
+
+    def test_vertex_above_the_vertex_count(self):
+        with open("data/" + self.filename, "w") as f:
+            f.write("2\n1 3\n")
+        with self.assertRaises(IncorrectInputException):
+            GraphReader().read_csr(GraphRepresentation.EDGE_LIST, self.filename)
+
+
+class ReadBinaryTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.reader = GraphReader()
+        self.filename = "test_data/binary_graph.bin"
+        self.csr = self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, "test_data/generated_adj_list.txt")
+
+    def tearDown(self) -> None:
+        os.remove("data/" + self.filename)
+
+    def test_read_csr_binary(self):
+        save_binary("data/" + self.filename, self.csr)
+        self.assertEqual(self.csr, self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename))
+
+    def corrupt(self, offset, value) -> None:
+        """Overwrite the integer of the given type at the offset of the payload"""
+        with open("data/" + self.filename, "r+b") as f:
+            f.seek(HEADER_SIZE + offset)
+            f.write(np.array([value], dtype=value.dtype).tobytes())
+
+    def test_corrupted_csr_binary(self):
+        reader = GraphReader(validate_binary=True)
+        indptr_size = self.csr.indptr.nbytes
+        # vertex 0 is isolated, indices start with the neighbors 8, 9, 13 and 14 of vertex 1
+        for offset, value in ((0, np.int64(1)), (16, np.int64(10 ** 6)),
+                              (indptr_size, self.csr.indices.dtype.type(15)),
+                              (indptr_size, self.csr.indices.dtype.type(-1)),
+                              (indptr_size, self.csr.indices.dtype.type(5)),
+                              (indptr_size, self.csr.indices.dtype.type(10)),
+                              (indptr_size, self.csr.indices.dtype.type(1))):
+            save_binary("data/" + self.filename, self.csr)
+            self.corrupt(offset, value)
+            with self.assertRaises(IncorrectInputException):
+                reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename)
+
+    def test_csr_binary_is_not_read_unless_validated(self):
+        save_binary("data/" + self.filename, self.csr)
+        with mock.patch("GraphBinaryFormat.is_csr_valid") as is_csr_valid:
+            csr = self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename)
+        is_csr_valid.assert_not_called()
+        self.assertIsInstance(csr.indices, np.memmap)
+
+    def test_unsupported_header_type(self):
+        for dtype in (b"<f8", b"<u8", b"xyz"):
+            save_binary("data/" + self.filename, self.csr)
+            with open("data/" + self.filename, "r+b") as f:
+                f.seek(HEADER.size - 8)
+                f.write(dtype.ljust(8, b"\0"))
+            with self.assertRaises(IncorrectInputException):
+                self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename)
+
+    def test_read_edge_list_binary(self):
+        save_binary("data/" + self.filename, self.csr, GraphRepresentation.EDGE_LIST)
+        self.assertEqual(self.csr, self.reader.read_csr(GraphRepresentation.EDGE_LIST, self.filename))
+
+
+class ParseCacheTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.reader = GraphReader(cache=ParseCache(self.directory))
+        self.filename = "test_data/cached_adj_list.txt"
+        shutil.copyfile("data/test_data/generated_adj_list.txt", "data/" + self.filename)
+
+    def tearDown(self) -> None:
+        os.remove("data/" + self.filename)
+        shutil.rmtree(self.directory)
+
+    def test_hit_skips_parsing(self):
+        expected = self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename)
+        with mock.patch.object(GraphReader, "parse_csr") as parse_csr:
+            self.assertEqual(expected, self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename))
+        parse_csr.assert_not_called()
+
+    def test_bypass(self):
+        self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename)
+        with mock.patch.object(GraphReader, "parse_csr") as parse_csr:
+            self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename, use_cache=False)
+        parse_csr.assert_called_once()
+
+    def test_changed_file_is_parsed_again(self):
+        self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename)
+        with open("data/" + self.filename, "w") as f:
+            f.write("2\n1\n")
+        self.assertEqual(1, self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename).edges_number)
+
+    def test_eviction(self):
+        self.reader.cache.max_size = 0
+        self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename)
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith(".bin")])
+        self.assertFalse(os.listdir(self.reader.cache.index_directory))
+
+    def test_index_of_removed_entry_is_evicted(self):
+        self.reader.read_csr(GraphRepresentation.ADJACENCY_LIST, self.filename)
+        self.reader.read_csr(GraphRepresentation.EDGE_LIST, "test_data/generated_edge_list.txt")
+        self.assertEqual(2, len(os.listdir(self.reader.cache.index_directory)))
+        os.remove(self.reader.cache.indexed_entry_path(self.reader.cache.index_path(
+            "data/" + self.filename, GraphRepresentation.ADJACENCY_LIST)))
+        self.reader.cache.evict()
+        self.assertEqual(1, len(os.listdir(self.reader.cache.index_directory)))
+
+    def test_incorrect_file_is_not_cached(self):
+        with self.assertRaises(IncorrectInputException):
+            self.reader.read_csr(GraphRepresentation.ADJACENCY_MATRIX, "test_data/non_zero_on_diag.txt")
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith(".bin")])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,88 @@
+import gc
+import multiprocessing
+import pickle
+import unittest
+
+import numpy as np
+
+import StoragePolicy
+from Graph import Graph
+from GraphRepresentation import GraphRepresentation
+from SharedGraph import *
+
+
+def edges_and_degree_sum(handle) -> (int, int):
+    """Run in a worker process"""
+    with handle.attach() as graph:
+        return graph.csr.edges_number, int(graph.adjacency_matrix.sum())
+
+
+class SharedGraphTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.graph = Graph()
+        self.graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+
+    def test_view_equals_graph(self):
+        with self.graph.share(matrix=True) as shared, shared.attach() as graph:
+            self.assertEqual(self.graph.csr, graph.csr)
+            np.testing.assert_array_equal(self.graph.adjacency_matrix, graph.adjacency_matrix)
+            self.assertEqual(self.graph.get_graph(GraphRepresentation.ADJACENCY_LIST),
+                             graph.get_graph(GraphRepresentation.ADJACENCY_LIST))
+
+    def test_views_share_arrays_and_are_read_only(self):
+        with self.graph.share(matrix=True) as shared, shared.attach() as first, shared.attach() as second:
+            # both views map the same pages, so a write through the segment is seen by both
+            self.assertEqual(0, first.adjacency_matrix[0, 0])
+            shared.memory.buf[shared.handle.matrix.offset] = 1
+            self.assertEqual(1, second.adjacency_matrix[0, 0])
+            with self.assertRaises(ValueError):
+                first.csr.indices[0] = 0
+
+    def test_matrix_is_published_only_if_asked_or_cached(self):
+        with self.graph.share() as shared:
+            self.assertIsNone(shared.handle.matrix)
+        self.graph.adjacency_matrix
+        with self.graph.share() as shared:
+            self.assertIsNotNone(shared.handle.matrix)
+        with self.graph.share(matrix=False) as shared:
+            self.assertIsNone(shared.handle.matrix)
+
+    def test_graph_is_usable_after_the_view_is_closed(self):
+        with self.graph.share(matrix=True) as shared:
+            view = shared.attach()
+            with view as graph:
+                pass
+            self.assertEqual(self.graph.csr, graph.csr)
+            np.testing.assert_array_equal(self.graph.adjacency_matrix, graph.adjacency_matrix)
+            self.assertTrue(view.detached.alive)
+            indices = graph.csr.indices[1:]
+            del graph
+            self.assertTrue(view.detached.alive)
+            del indices
+            gc.collect()
+            self.assertFalse(view.detached.alive)
+
+    def test_packed_matrix(self):
+        with StoragePolicy.using_policy(StoragePolicy.PACKED):
+            with self.graph.share(matrix=True) as shared, shared.attach() as graph:
+                self.assertTrue(shared.handle.packed)
+                self.assertIsInstance(graph.adjacency_matrix, PackedAdjacencyMatrix)
+                np.testing.assert_array_equal(self.graph.adjacency_matrix.to_dense(),
+                                              graph.adjacency_matrix.to_dense())
+
+    def test_unlinked_segment_can_not_be_attached(self):
+        shared = self.graph.share()
+        handle = pickle.loads(pickle.dumps(shared.handle))
+        shared.unlink()
+        with self.assertRaises(FileNotFoundError):
+            handle.attach()
+
+    def test_worker_processes(self):
+        with self.graph.share(matrix=True) as shared, multiprocessing.Pool(2) as pool:
+            results = pool.map(edges_and_degree_sum, [shared.handle] * 4)
+        self.assertEqual([(self.graph.csr.edges_number, 2 * self.graph.csr.edges_number)] * 4, results)
+
+
+if __name__ == '__main__':
+    unittest.main()
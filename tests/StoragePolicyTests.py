@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from CSRAdjacency import CSRAdjacency
+from Graph import Graph
+from GraphRepresentation import GraphRepresentation
+from PackedAdjacencyMatrix import PackedAdjacencyMatrix
+from RandomGraphGenerator import random_graph_probability
+from StoragePolicy import *
+
+
+class StoragePolicyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.graph = Graph()
+        self.graph.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def written(self, graph, representation) -> bytes:
+        filename = os.path.join(self.directory.name, "graph.txt")
+        graph.write_file(representation, filename, False)
+        with open(filename, "rb") as f:
+            return f.read()
+
+    def test_index_dtype(self):
+        self.assertEqual(np.int8, index_dtype(100))
+        self.assertEqual(np.int16, index_dtype(127))
+        self.assertEqual(np.int32, index_dtype(1 << 20))
+        self.assertEqual(np.int64, index_dtype(1 << 40))
+        with using_policy(WIDE):
+            self.assertEqual(np.int64, index_dtype(100))
+
+    def test_compact_dtypes(self):
+        self.assertEqual(np.int8, self.graph.csr.indices.dtype)
+        self.assertEqual(np.uint8, self.graph.get_graph(GraphRepresentation.ADJACENCY_MATRIX).dtype)
+        self.assertEqual(np.uint8, self.graph.get_graph(GraphRepresentation.INCIDENCE_MATRIX).dtype)
+        self.assertEqual(np.int8, self.graph.get_graph(GraphRepresentation.EDGE_LIST).dtype)
+
+    def test_policy_is_restored(self):
+        with using_policy(WIDE):
+            self.assertEqual(WIDE, get_policy())
+        self.assertEqual(StoragePolicy(), get_policy())
+
+    def test_packed_round_trip(self):
+        matrix = self.graph.get_graph(GraphRepresentation.ADJACENCY_MATRIX)
+        packed = PackedAdjacencyMatrix.from_dense(matrix)
+        self.assertEqual(15 * 2, packed.nbytes)
+        np.testing.assert_array_equal(matrix, packed.to_dense())
+        rows, cols = np.nonzero(matrix)
+        np.testing.assert_array_equal(np.stack((rows, cols)), np.stack(packed.nonzero()))
+        self.assertEqual(packed, PackedAdjacencyMatrix.from_edges(15, rows, cols))
+
+    def test_packed_policy(self):
+        with using_policy(PACKED):
+            packed = Graph()
+            packed.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+            matrix = packed.get_graph(GraphRepresentation.ADJACENCY_MATRIX)
+            self.assertIsInstance(matrix, PackedAdjacencyMatrix)
+            self.assertEqual(self.written(self.graph, GraphRepresentation.ADJACENCY_MATRIX),
+                             self.written(packed, GraphRepresentation.ADJACENCY_MATRIX))
+            packed.adjacency_matrix = matrix
+        self.assertEqual(self.graph.csr, packed.csr)
+
+    def test_output_matches_wide_policy(self):
+        with using_policy(WIDE):
+            wide = Graph()
+            wide.read_data(GraphRepresentation.ADJACENCY_MATRIX, "test_data/generated.txt")
+            self.assertEqual(np.int64, wide.get_graph(GraphRepresentation.ADJACENCY_MATRIX).dtype)
+        for representation in GraphRepresentation:
+            self.assertEqual(self.written(wide, representation), self.written(self.graph, representation))
+
+    def test_random_packed_matches_dense(self):
+        dense, _ = random_graph_probability(50, 0.3, seed=1)
+        with using_policy(PACKED):
+            packed, _ = random_graph_probability(50, 0.3, seed=1)
+        self.assertEqual(np.uint8, dense.dtype)
+        np.testing.assert_array_equal(dense, packed.to_dense())
+
+    def test_csr_from_entries(self):
+        csr = CSRAdjacency.from_entries(3, np.array([0, 1, 1, 2]), np.array([1, 0, 2, 1]))
+        self.assertEqual([[2], [1, 3], [2]], csr.to_adjacency_list())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import GraphValidation
+from GraphValidation import *
+
+
+class ValidationTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.matrix = np.array([[0, 1, 1, 0],
+                                [1, 0, 0, 0],
+                                [1, 0, 0, 1],
+                                [0, 0, 1, 0]], dtype=int)
+
+    @mock.patch.object(GraphValidation, "VALIDATION_BLOCK_CELLS", 4)
+    def test_symmetrical_in_blocks(self):
+        self.assertTrue(is_symmetrical(self.matrix))
+        self.matrix[3, 0] = 1
+        self.assertFalse(is_symmetrical(self.matrix))
+
+    def test_diagonal(self):
+        self.assertTrue(has_zeros_on_diagonal(self.matrix))
+        self.matrix[2, 2] = 1
+        self.assertFalse(has_zeros_on_diagonal(self.matrix))
+
+    def test_binary(self):
+        self.assertTrue(is_binary(self.matrix))
+        self.matrix[0, 1] = 2
+        self.assertFalse(is_binary(self.matrix))
+
+    def test_entries_symmetrical(self):
+        rows, cols = np.nonzero(self.matrix)
+        self.assertTrue(are_entries_symmetrical(4, rows, cols))
+        self.assertFalse(are_entries_symmetrical(4, rows[1:], cols[1:]))
+
+    def test_sorted_entries_symmetrical(self):
+        rows, cols = np.nonzero(self.matrix)
+        self.assertTrue(are_sorted_entries_symmetrical(4, rows * 4 + cols, rows, cols))
+        self.assertFalse(are_sorted_entries_symmetrical(4, rows[1:] * 4 + cols[1:], rows[1:], cols[1:]))
+
+    def test_csr_valid(self):
+        _, cols = np.nonzero(self.matrix)
+        indptr = np.concatenate(([0], np.cumsum(self.matrix.sum(axis=1))))
+        self.assertTrue(is_csr_valid(indptr, cols, 4))
+        self.assertFalse(is_csr_valid(indptr, cols[[1, 0, 2, 3, 4, 5]], 4))
+        self.assertFalse(is_csr_valid(indptr, np.array([1, 3, 0, 0, 3, 2]), 4))
+        self.assertFalse(is_csr_valid(indptr[:-1], cols, 4))
+
+    def test_edges_valid(self):
+        self.assertTrue(are_edges_valid(np.array([[0, 1], [2, 3]]), 4))
+        self.assertFalse(are_edges_valid(np.array([[0, 1], [2, 4]]), 4))
+        self.assertFalse(are_edges_valid(np.array([[0, 1], [2, 2]]), 4))
+
+
+if __name__ == '__main__':
+    unittest.main()